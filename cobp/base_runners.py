@@ -0,0 +1,226 @@
+"""Track base runners through a game's plays, attributing each run scored to its runner and RBIs to batters.
+
+Retrosheet plays encode runners by base, so the runner on each base is followed through the half-inning: batters
+reach base by their event or an explicit advance, runners move by explicit advances or by stolen bases, and are put
+out by caught stealings, pickoffs and fielded outs. Runners not explicitly moved stay on their base.
+"""
+import re
+from dataclasses import dataclass
+
+from pyretrosheet.models.base import Base
+from pyretrosheet.models.game import Game
+from pyretrosheet.models.play import Play
+from pyretrosheet.models.play.advance import Advance
+from pyretrosheet.models.play.description import BatterEvent
+from pyretrosheet.models.play.modifier import ModifierType
+from pyretrosheet.models.player import Player
+from pyretrosheet.models.team import TeamLocation
+
+# fielding position of a substitute entering the game as a pinch runner
+PINCH_RUNNER_POSITION = 12
+# since 2020, extra innings begin with a runner on second: the batter preceding the half-inning's leadoff batter
+PLACED_RUNNER_FIRST_YEAR = 2020
+_EXTRA_INNINGS_FIRST_INNING = 10
+_RUNNER_BASES = [Base.THIRD_BASE, Base.SECOND_BASE, Base.FIRST_BASE]
+_PREVIOUS_BASE = {
+    Base.SECOND_BASE: Base.FIRST_BASE,
+    Base.THIRD_BASE: Base.SECOND_BASE,
+    Base.HOME: Base.THIRD_BASE,
+}
+_BATTER_EVENT_TO_BASE = {
+    BatterEvent.SINGLE: Base.FIRST_BASE,
+    BatterEvent.DOUBLE: Base.SECOND_BASE,
+    BatterEvent.GROUND_RULE_DOUBLE: Base.SECOND_BASE,
+    BatterEvent.TRIPLE: Base.THIRD_BASE,
+    BatterEvent.HOME_RUN_LEAVING_PARK: Base.HOME,
+    BatterEvent.HOME_RUN_INSIDE_PARK: Base.HOME,
+    BatterEvent.WALK: Base.FIRST_BASE,
+    BatterEvent.INTENTIONAL_WALK: Base.FIRST_BASE,
+    BatterEvent.HIT_BY_PITCH: Base.FIRST_BASE,
+    BatterEvent.CATCHER_INTERFERENCE: Base.FIRST_BASE,
+    BatterEvent.FIELDERS_CHOICE: Base.FIRST_BASE,
+    BatterEvent.ERROR: Base.FIRST_BASE,
+}
+# batter events whose runs are credited as RBIs, unless an advance says otherwise
+_RBI_BATTER_EVENTS = {
+    *_BATTER_EVENT_TO_BASE.keys() - {BatterEvent.ERROR},
+    BatterEvent.UNASSISTED_FIELDED_OUT,
+    BatterEvent.ASSISTED_FIELDED_OUT,
+    BatterEvent.LINED_INTO_DOUBLE_PLAY,
+    BatterEvent.LINED_INTO_TRIPLE_PLAY,
+}
+# runs scoring as the batter grounds into a double play are not credited as RBIs
+_GROUNDED_INTO_DOUBLE_PLAY_MODIFIERS = {
+    ModifierType.GROUND_BALL_DOUBLE_PLAY,
+    ModifierType.BUNT_GROUNDED_INTO_DOUBLE_PLAY,
+}
+# batter events combined with a runner event, e.g. 'K+WP'
+_COMBINED_BATTER_EVENTS = {"K": BatterEvent.STRIKEOUT, "W": BatterEvent.WALK, "IW": BatterEvent.INTENTIONAL_WALK}
+# combined batter events forcing the runners ahead of the batter to advance
+_FORCING_COMBINED_BATTER_EVENTS = {BatterEvent.WALK, BatterEvent.INTENTIONAL_WALK}
+_STOLEN_BASE_RE = re.compile(r"SB([23H])")
+_CAUGHT_STEALING_RE = re.compile(r"(?:PO)?CS([23H])\(([^)]*)\)")
+_PICKED_OFF_RE = re.compile(r"PO([123])\(([^)]*)\)")
+_FIELDED_OUT_RUNNER_RE = re.compile(r"\(([B123])\)")
+
+# the runner (a player id) on each occupied base
+Bases = dict[Base, str]
+
+
+@dataclass
+class GameRuns:
+    """The runs scored by each runner in a game, and the RBIs credited to each play's batter.
+
+    Runs scored by a runner who cannot be identified (e.g. a runner missing from the data) are credited as RBIs but
+    not as a runner's run.
+    """
+
+    runner_to_runs: dict[str, int]
+    play_id_to_rbis: dict[int, int]
+
+    @classmethod
+    def from_game(cls, game: Game) -> "GameRuns":
+        runner_to_runs: dict[str, int] = {}
+        play_id_to_rbis = {}
+        # the player in each team's batting order position
+        lineup: dict[tuple[TeamLocation, int], str] = {}
+        half_inning = None
+        bases: Bases = {}
+        for event in game.chronological_events:
+            if isinstance(event, Player):
+                _substitute_player(event, lineup, bases)
+                continue
+
+            if (event.team_location, event.inning) != half_inning:
+                half_inning = (event.team_location, event.inning)
+                bases = _get_half_inning_start_bases(game, event, lineup)
+
+            is_bases_loaded = all(base in bases for base in _RUNNER_BASES)
+            rbis = 0
+            for runner_id, advance in _advance_runners(event, bases):
+                if runner_id is not None:
+                    runner_to_runs[runner_id] = runner_to_runs.get(runner_id, 0) + 1
+                rbis += _is_rbi(event, advance, is_bases_loaded)
+            if rbis:
+                play_id_to_rbis[id(event)] = rbis
+
+        return cls(runner_to_runs=runner_to_runs, play_id_to_rbis=play_id_to_rbis)
+
+
+def _substitute_player(player: Player, lineup: dict[tuple[TeamLocation, int], str], bases: Bases) -> None:
+    lineup_position = (player.team_location, player.batting_order_position)
+    if player.fielding_position == PINCH_RUNNER_POSITION:
+        replaced_runner_id = lineup.get(lineup_position)
+        for base, runner_id in bases.items():
+            if runner_id == replaced_runner_id:
+                bases[base] = player.id
+    lineup[lineup_position] = player.id
+
+
+def _get_half_inning_start_bases(game: Game, play: Play, lineup: dict[tuple[TeamLocation, int], str]) -> Bases:
+    if play.inning < _EXTRA_INNINGS_FIRST_INNING or game.id.date.year < PLACED_RUNNER_FIRST_YEAR:
+        return {}
+
+    # Retrosheet notes the placed runner in lines which are not parsed, so the runner is found from the lineup
+    leadoff_positions = [
+        batting_order_position
+        for (team_location, batting_order_position), player_id in lineup.items()
+        if team_location == play.team_location and player_id == play.batter_id and batting_order_position > 0
+    ]
+    if not leadoff_positions:
+        return {}
+
+    placed_runner_position = (leadoff_positions[0] - 2) % 9 + 1
+    placed_runner_id = lineup.get((play.team_location, placed_runner_position))
+    return {Base.SECOND_BASE: placed_runner_id} if placed_runner_id else {}
+
+
+def _advance_runners(play: Play, bases: Bases) -> list[tuple[str | None, Advance | None]]:
+    """Move the play's batter and runners between bases, returning each scoring runner and their advance, if any."""
+    from_base_to_advance = {advance.from_base: advance for advance in play.event.advances}
+    from_base_to_implied_base = _get_implied_to_bases(play)
+    scoring_runners = []
+    next_bases = {}
+    for from_base in [*_RUNNER_BASES, Base.BATTER_AT_HOME]:
+        runner_id = play.batter_id if from_base == Base.BATTER_AT_HOME else bases.get(from_base)
+        advance = from_base_to_advance.get(from_base)
+        if advance:
+            to_base = None if advance.is_out else advance.to_base
+        elif from_base in from_base_to_implied_base:
+            to_base = from_base_to_implied_base[from_base]
+        elif runner_id is not None and from_base != Base.BATTER_AT_HOME:
+            to_base = from_base
+        else:
+            continue
+
+        if to_base == Base.HOME:
+            scoring_runners.append((runner_id, advance))
+        elif to_base is not None and runner_id is not None:
+            next_bases[to_base] = runner_id
+
+    bases.clear()
+    bases.update(next_bases)
+    return scoring_runners
+
+
+def _get_implied_to_bases(play: Play) -> dict[Base, Base | None]:
+    """Get the bases runners move to (or None when put out) as implied by the play's description."""
+    description = play.event.description.raw
+    from_base_to_to_base: dict[Base, Base | None] = {}
+    batter_event = _get_batter_event(play)
+    if batter_event in _BATTER_EVENT_TO_BASE:
+        from_base_to_to_base[Base.BATTER_AT_HOME] = _BATTER_EVENT_TO_BASE[batter_event]
+    elif description[:1].isdigit():
+        # fielded outs note each runner put out, where the batter reaches first on a force out, e.g. '54(1)'
+        out_bases = [Base(base) for base in _FIELDED_OUT_RUNNER_RE.findall(description)]
+        for out_base in out_bases:
+            from_base_to_to_base[out_base] = None
+        if out_bases and Base.BATTER_AT_HOME not in out_bases and description.endswith(")"):
+            from_base_to_to_base[Base.BATTER_AT_HOME] = Base.FIRST_BASE
+
+    for to_base in _STOLEN_BASE_RE.findall(description):
+        from_base_to_to_base[_PREVIOUS_BASE[Base(to_base)]] = Base(to_base)
+    for to_base, fielders in _CAUGHT_STEALING_RE.findall(description):
+        # an error negates the out, so the runner reaches the base
+        from_base_to_to_base[_PREVIOUS_BASE[Base(to_base)]] = Base(to_base) if "E" in fielders else None
+    for base, fielders in _PICKED_OFF_RE.findall(description):
+        if "E" not in fielders:
+            from_base_to_to_base[Base(base)] = None
+
+    return from_base_to_to_base
+
+
+def _get_batter_event(play: Play) -> BatterEvent | None:
+    return _get_combined_batter_event(play) or play.event.description.batter_event
+
+
+def _get_combined_batter_event(play: Play) -> BatterEvent | None:
+    """Get the batter event of a batter event combined with a runner event, e.g. the strikeout of 'K+WP'."""
+    description = play.event.description
+    if description.batter_event is None and (match := re.match(r"(K|W|IW)\+", description.raw)):
+        return _COMBINED_BATTER_EVENTS[match.group(1)]
+
+    return None
+
+
+def _is_rbi(play: Play, advance: Advance | None, is_bases_loaded: bool) -> bool:
+    if advance and advance.is_rbi_credited_explicit:
+        return True
+    if advance and advance.is_rbi_not_credited_explicit:
+        return False
+    # runners scoring on an error, e.g. '3-H(E8)', are not credited as RBIs
+    if advance and advance.fielder_errors:
+        return False
+
+    if combined_batter_event := _get_combined_batter_event(play):
+        # runners are moved by the runner event (e.g. 'W+WP'), so only a runner forced home by a walk is credited
+        return (
+            combined_batter_event in _FORCING_COMBINED_BATTER_EVENTS
+            and is_bases_loaded
+            and advance is not None
+            and advance.from_base == Base.THIRD_BASE
+        )
+
+    return _get_batter_event(play) in _RBI_BATTER_EVENTS and not any(
+        modifier.type in _GROUNDED_INTO_DOUBLE_PLAY_MODIFIERS for modifier in play.event.modifiers
+    )
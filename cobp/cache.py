@@ -0,0 +1,132 @@
+"""Cache and coalesce results in memory, shared across the app's sessions.
+
+Streamlit re-runs the app on every widget interaction, and all sessions run in threads of a single process, so
+results cached at the module level are reused across reruns and sessions. Caches are bounded, evicting their least
+recently used entries. Concurrent computations of the same key are coalesced into a single in-flight computation.
+"""
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from threading import Lock
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _AbandonedError(Exception):
+    """The in-flight computation was abandoned (e.g. its session was re-run), so a waiter must compute the key."""
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesce concurrent computations of the same key into one in-flight computation, whose result they share."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._key_to_future: dict[K, Future[V]] = {}
+        self._lock = Lock()
+
+    def do(self, key: K, compute: Callable[[], V]) -> V:
+        """Compute the key's value, or wait on its in-flight computation and share its result (or error)."""
+        while True:
+            with self._lock:
+                future = self._key_to_future.get(key)
+                is_in_flight = future is not None
+                if future is None:
+                    future = self._key_to_future[key] = Future()
+
+            if not is_in_flight:
+                return self._compute(key, compute, future)
+
+            logger.info(f"{self.name} waiting on in-flight computation of {key}")
+            try:
+                return future.result()
+            except _AbandonedError:
+                continue
+
+    def _compute(self, key: K, compute: Callable[[], V], future: Future[V]) -> V:
+        try:
+            value = compute()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # control flow of the computing thread (e.g. streamlit re-running its script) is not shared with waiters
+            future.set_exception(_AbandonedError())
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._key_to_future[key]
+
+
+class LRUCache(Generic[K, V]):
+    """A thread-safe cache holding at most `max_entries` values, evicting the least recently used.
+
+    Concurrent misses of the same key are coalesced, so that the key's value is computed once.
+    """
+
+    def __init__(self, name: str, max_entries: int):
+        if max_entries < 1:
+            raise ValueError(f"The {name} cache must hold at least 1 entry, not {max_entries}")
+
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._key_to_value: OrderedDict[K, V] = OrderedDict()
+        self._lock = Lock()
+        self._single_flight: SingleFlight[K, V] = SingleFlight(name)
+
+    def __len__(self) -> int:
+        return len(self._key_to_value)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._key_to_value
+
+    def get_or_compute(self, key: K, compute: Callable[[], V]) -> V:
+        """Get the key's cached value, computing and caching it on a miss."""
+        with self._lock:
+            if key in self._key_to_value:
+                return self._get_hit(key)
+
+        return self._single_flight.do(key, lambda: self._get_or_compute(key, compute))
+
+    def _get_or_compute(self, key: K, compute: Callable[[], V]) -> V:
+        with self._lock:
+            # the key may have been cached since the miss, by a computation that just finished
+            if key in self._key_to_value:
+                return self._get_hit(key)
+
+            self.misses += 1
+            logger.info(f"{self.name} cache miss for {key} ({self._get_stats()})")
+
+        value = compute()
+        with self._lock:
+            self._key_to_value[key] = value
+            self._key_to_value.move_to_end(key)
+            while len(self._key_to_value) > self.max_entries:
+                evicted_key, _ = self._key_to_value.popitem(last=False)
+                logger.info(f"{self.name} cache evicted {evicted_key}")
+
+        return value
+
+    def _get_hit(self, key: K) -> V:
+        self._key_to_value.move_to_end(key)
+        self.hits += 1
+        logger.info(f"{self.name} cache hit for {key} ({self._get_stats()})")
+        return self._key_to_value[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key_to_value.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _get_stats(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {len(self._key_to_value)}/{self.max_entries} entries"
@@ -1,23 +1,58 @@
 import logging
-from dataclasses import dataclass
+import re
+import time
+import unicodedata
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from functools import lru_cache
 from pathlib import Path
+from threading import Lock
 
 import pandas as pd
+import pyarrow.parquet as pq
+import requests
+from bs4 import BeautifulSoup, Comment, Tag
 from fuzzywuzzy import fuzz, process
 from pyretrosheet.models.player import Player
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.support.wait import WebDriverWait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from cobp import paths
+from cobp import disk_cache, paths
+from cobp.data.retrosheet import FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR
 from cobp.models.team import Team
-from cobp.ui.selectors import FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR
 
 logger = logging.getLogger(__name__)
 
+BATTING_TABLE_ID = "players_standard_batting"
+# statuses of responses which are retried, e.g. when rate limited
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+# the batting table's 'data-stat' attributes of each column, in the current and prior layouts of the page
+COLUMN_TO_DATA_STATS = {
+    "player": ["name_display", "player"],
+    "team": ["team_name_abbr", "team_ID"],
+    "runs": ["b_r", "R"],
+    "rbis": ["b_rbi", "RBI"],
+}
+PLAYERS_STATS_INDEX = ["year", "baseball_reference_team_id", "player_id"]
+PLAYERS_STATS_COLUMNS = [*PLAYERS_STATS_INDEX, "player_name", "rbis", "runs"]
+# compact dtypes of the stored stats, where repeated strings are stored once as categories
+PLAYERS_STATS_DTYPES = {
+    "year": "int16",
+    "baseball_reference_team_id": "category",
+    "player_id": "category",
+    "player_name": "category",
+    "rbis": "int16",
+    "runs": "int16",
+}
+# data files, e.g. of players whose names differ between Retrosheet and Baseball Reference
+DATA_FILES_DIR = Path(__file__).parent
+PLAYER_ALIASES_PATH = DATA_FILES_DIR / "baseball_reference_player_aliases.csv"
+PLAYER_NAME_CORRECTIONS_PATH = DATA_FILES_DIR / "retrosheet_player_name_corrections.csv"
+NO_TEAM_AT_BATS_PATH = DATA_FILES_DIR / "baseball_reference_no_team_at_bats.csv"
+# set to 80 so minor differences can be matched (e.g. accent in a name since Retrosheet does not use accents)
+FUZZY_MATCH_THRESHOLD = 80
+
 
 @dataclass
 class PlayerSeasonalStats:
@@ -30,125 +65,435 @@ class PlayerSeasonalStats:
 
 @dataclass
 class BaseballReferenceClient:
+    """Fetch Baseball Reference pages over a pooled HTTP session, retrying failed requests with backoff.
+
+    Several years may be fetched concurrently, by at most `max_workers` requests at a time. Requests are started at
+    least `min_request_interval_seconds` apart, as Baseball Reference blocks clients making over 20 requests a minute.
+    """
+
     base_url: str = "https://www.baseball-reference.com"
+    max_workers: int = 4
+    min_request_interval_seconds: float = 3.0
+    retries: int = 5
+    # as urllib3's `Retry.backoff_factor`, where the backoff doubles on each consecutive retry
+    backoff_factor: float = 2.0
+    timeout_seconds: float = 30.0
+    session: requests.Session = field(init=False, repr=False)
+    _next_request_time: float = field(default=0.0, init=False, repr=False)
+    _request_lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> "BaseballReferenceClient":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.session.close()
 
     def get_players_seasonal_stats(self, year: int) -> list[PlayerSeasonalStats]:
         logger.info(f"Loading players' seasonal stats from Baseball Reference for {year=}")
-        driver = webdriver.Firefox()
-        driver.get(f"{self.base_url}/leagues/majors/{year}-standard-batting.shtml")
-        wait_seconds_until_table_loads = 10
-        batting_table = WebDriverWait(driver, wait_seconds_until_table_loads).until(
-            expected_conditions.presence_of_element_located((By.ID, "players_standard_batting"))
+        self._wait_for_request_slot()
+        response = self.session.get(
+            f"{self.base_url}/leagues/majors/{year}-standard-batting.shtml", timeout=self.timeout_seconds
         )
-        rows = batting_table.find_elements(By.TAG_NAME, "tr")
-        players_stats = []
-        for row in rows:
-            cells = row.find_elements(By.TAG_NAME, "td")
-            if not cells:
-                continue
-
-            player_name = cells[0].text
-            # remove metadata characters in the player's name if present
-            for char in ["*", "#", "?"]:
-                player_name = player_name.replace(char, "")
-
-            try:
-                # href example: 'https://www.baseball-reference.com/players/a/abramcj01.shtml'
-                player_href = cells[0].find_element(By.TAG_NAME, "a").get_attribute("href")
-                player_id = player_href.split("/")[5].replace(".shtml", "")
-            except NoSuchElementException:
-                # skip non-player rows
-                continue
-
-            baseball_reference_team_id = cells[2].text
-
-            # ignore TOT team (an aggregation for all teams played on for the year)
-            if baseball_reference_team_id == "TOT":
-                continue
-
-            player_stats = PlayerSeasonalStats(
+        response.raise_for_status()
+        players_stats = parse_players_seasonal_stats(response.text)
+        logger.info(f"Loaded {len(players_stats)} players' seasonal stats from Baseball Reference for {year=}")
+        return players_stats
+
+    def _wait_for_request_slot(self) -> None:
+        with self._request_lock:
+            request_time = max(time.monotonic(), self._next_request_time)
+            self._next_request_time = request_time + self.min_request_interval_seconds
+
+        time.sleep(max(request_time - time.monotonic(), 0))
+
+    def iter_years_players_seasonal_stats(self, years: list[int]) -> Iterator[tuple[int, list[PlayerSeasonalStats]]]:
+        """Fetch the years' players' seasonal stats concurrently, yielding each year's stats in the order of years."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from zip(years, executor.map(self.get_players_seasonal_stats, years))
+
+
+def parse_players_seasonal_stats(html: str) -> list[PlayerSeasonalStats]:
+    """Parse players' seasonal stats from a Baseball Reference standard batting page."""
+    soup = BeautifulSoup(html, "html.parser")
+    batting_table = soup.find("table", id=BATTING_TABLE_ID)
+    if batting_table is None:
+        # the table is rendered from an HTML comment by the page's javascript
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment) and BATTING_TABLE_ID in text):
+            batting_table = BeautifulSoup(comment, "html.parser").find("table", id=BATTING_TABLE_ID)
+            break
+    if batting_table is None:
+        raise ValueError(f"Unable to find the {BATTING_TABLE_ID} table in the Baseball Reference page")
+
+    players_stats = []
+    for row in batting_table.find("tbody").find_all("tr"):
+        player_cell = _find_cell(row, "player")
+        # skip non-player rows, e.g. repeated headers
+        player_link = player_cell.find("a") if player_cell else None
+        if not player_cell or not player_link:
+            continue
+
+        baseball_reference_team_id = _get_cell_text(row, "team")
+        # ignore aggregations of all teams played on for the year (e.g. 'TOT' or '2TM')
+        if re.fullmatch(r"TOT|\dTM", baseball_reference_team_id):
+            continue
+
+        # remove metadata characters in the player's name if present
+        player_name = player_cell.get_text(strip=True)
+        for char in ["*", "#", "?"]:
+            player_name = player_name.replace(char, "")
+
+        players_stats.append(
+            PlayerSeasonalStats(
                 player_name=player_name,
-                player_id=player_id,
+                # href example: '/players/a/abramcj01.shtml'
+                player_id=player_link["href"].split("/")[-1].replace(".shtml", ""),
                 baseball_reference_team_id=baseball_reference_team_id,
-                rbis=int(cells[12].text),
-                runs=int(cells[7].text),
+                rbis=int(_get_cell_text(row, "rbis") or 0),
+                runs=int(_get_cell_text(row, "runs") or 0),
             )
-            logger.info(f"Loaded player seasonal stats: {player_stats}")
-            players_stats.append(player_stats)
+        )
 
-        driver.close()
-        return players_stats
+    return players_stats
+
+
+def _find_cell(row: Tag, column: str) -> Tag | None:
+    for data_stat in COLUMN_TO_DATA_STATS[column]:
+        if cell := row.find(["th", "td"], attrs={"data-stat": data_stat}):
+            return cell
+
+    return None
+
+
+def _get_cell_text(row: Tag, column: str) -> str:
+    cell = _find_cell(row, column)
+    return str(cell.get_text(strip=True)) if cell else ""
+
+
+@dataclass
+class PlayersStatsStore:
+    """Every dumped season's players' seasonal stats, indexed by year, Baseball Reference team id and player id.
+
+    Rows are sorted by the index, so a season's players are a contiguous slice of the compact, categorical DataFrame.
+    """
+
+    df: pd.DataFrame
+
+    @classmethod
+    def read(cls) -> "PlayersStatsStore":
+        df = disk_cache.read(_get_players_stats_store_path(), _read_players_stats_df)
+        if df is None:
+            df = _get_compact_players_stats_df(pd.DataFrame(columns=PLAYERS_STATS_COLUMNS))
+
+        return cls(df=df)
+
+    @property
+    def years(self) -> set[int]:
+        return set(self.df.index.unique(level="year"))
+
+    def get_season(self, year: int) -> pd.DataFrame:
+        return self.df.loc[year].reset_index()
+
+
+@lru_cache(maxsize=1)
+def get_players_stats_store() -> PlayersStatsStore:
+    return PlayersStatsStore.read()
+
+
+def get_seasonal_players_stats(year: int) -> pd.DataFrame:
+    store = get_players_stats_store()
+    if year not in store.years:
+        # only one process fetches a missing season, while others wait on it and then read it from the store
+        with disk_cache.lock(paths.DATA_DIR / str(year) / "baseball_reference"):
+            get_players_stats_store.cache_clear()
+            store = get_players_stats_store()
+            if year not in store.years:
+                legacy_data_path = _get_legacy_players_seasonal_stats_data_path(year)
+                if legacy_data_path.exists():
+                    _write_seasons_players_stats_df(pd.read_csv(legacy_data_path).assign(year=year))
+                else:
+                    dump_players_seasonal_stats(year)
+                store = get_players_stats_store()
+
+    return store.get_season(year)
 
 
 def dump_players_seasonal_stats(year: int) -> None:
-    baseball_reference_client = BaseballReferenceClient()
-    players_seasonal_stats = baseball_reference_client.get_players_seasonal_stats(year)
-    lines = ["player_name,player_id,baseball_reference_team_id,rbis,runs"]
-    for player_stats in players_seasonal_stats:
-        lines.append(
-            ",".join(
-                [
-                    player_stats.player_name,
-                    player_stats.player_id,
-                    player_stats.baseball_reference_team_id,
-                    str(player_stats.rbis),
-                    str(player_stats.runs),
-                ]
-            )
+    with BaseballReferenceClient() as baseball_reference_client:
+        _write_seasons_players_stats({year: baseball_reference_client.get_players_seasonal_stats(year)})
+
+
+def dump_all_seasons(client: BaseballReferenceClient | None = None) -> None:
+    """Dump every available season's players' seasonal stats, fetching several seasons concurrently."""
+    years = list(range(FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR + 1))
+    with client or BaseballReferenceClient() as baseball_reference_client:
+        _write_seasons_players_stats(dict(baseball_reference_client.iter_years_players_seasonal_stats(years)))
+
+
+def _write_seasons_players_stats(year_to_players_seasonal_stats: dict[int, list[PlayerSeasonalStats]]) -> None:
+    _write_seasons_players_stats_df(
+        pd.DataFrame(
+            [
+                {"year": year, **asdict(player_stats)}
+                for year, players_seasonal_stats in year_to_players_seasonal_stats.items()
+                for player_stats in players_seasonal_stats
+            ],
+            columns=PLAYERS_STATS_COLUMNS,
         )
+    )
 
-    data_path = _get_players_seasonal_stats_data_path(year)
-    data_path.parent.mkdir(parents=True, exist_ok=True)
-    data_path.write_text("\n".join(lines))
-    logger.info(f"Wrote baseball reference seasonal players rbis to {data_path.as_posix()}")
 
+def _write_seasons_players_stats_df(seasons_df: pd.DataFrame) -> None:
+    """Write the seasons' players' stats to the store, replacing any stored stats of those seasons."""
+    store_path = _get_players_stats_store_path()
+    with disk_cache.lock(store_path):
+        # re-read the store, as other processes may have written seasons to it
+        get_players_stats_store.cache_clear()
+        store_df = get_players_stats_store().df.reset_index()
+        is_replaced = store_df["year"].isin(seasons_df["year"].unique())
+        df = _get_compact_players_stats_df(pd.concat([store_df.loc[~is_replaced].astype(object), seasons_df]))
+        disk_cache.write(store_path, lambda tmp_path: _write_players_stats_df(tmp_path, df))
+        get_players_stats_store.cache_clear()
 
-@lru_cache(maxsize=None)
-def get_seasonal_players_stats(year: int) -> pd.DataFrame:
-    data_path = _get_players_seasonal_stats_data_path(year)
-    if data_path.exists():
-        return pd.read_csv(data_path)
+    years = sorted(seasons_df["year"].unique())
+    logger.info(f"Wrote Baseball Reference players' seasonal stats of {years=} to {store_path.as_posix()}")
 
-    dump_players_seasonal_stats(year)
-    return pd.read_csv(data_path)
 
+def _read_players_stats_df(store_path: Path) -> pd.DataFrame:
+    return pq.read_table(store_path, memory_map=True).to_pandas().set_index(PLAYERS_STATS_INDEX)
 
-def lookup_player(df: pd.DataFrame, player: Player, team: Team) -> pd.Series | None:
-    team_id = team.baseball_reference_id or team.retrosheet_id
-    team_players_df = df.loc[df["baseball_reference_team_id"] == team_id]
-    team_players = team_players_df["player_name"].tolist()
-    player_name = _get_real_player_name(player)
-    if player_name in team_players:
-        player_name_match = player_name
-    else:
-        player_name_match = _fuzzy_lookup_player(player_name, team_players)
 
-    return team_players_df.loc[df["player_name"] == player_name_match]
+def _write_players_stats_df(store_path: Path, df: pd.DataFrame) -> None:
+    df.reset_index().to_parquet(store_path, index=False)
 
 
-def dump_all_seasons():
-    for year in range(FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR + 1):
-        dump_players_seasonal_stats(year)
+def _get_compact_players_stats_df(df: pd.DataFrame) -> pd.DataFrame:
+    return (
+        df[PLAYERS_STATS_COLUMNS]
+        .astype(PLAYERS_STATS_DTYPES)
+        .drop_duplicates(PLAYERS_STATS_INDEX)
+        .set_index(PLAYERS_STATS_INDEX)
+        .sort_index()
+    )
 
 
-def _get_players_seasonal_stats_data_path(year: int) -> Path:
+def _get_players_stats_store_path() -> Path:
+    return paths.DATA_DIR / "baseball_reference.parquet"
+
+
+def _get_legacy_players_seasonal_stats_data_path(year: int) -> Path:
+    """Get the path of a season's stats as dumped before the store, which are moved into the store when read."""
     return paths.DATA_DIR / str(year) / "baseball_reference.csv"
 
 
-def _get_real_player_name(player: Player) -> str:
-    # handle data error where either the player id or the name is incorrect (from 2013 New York Yankees retrosheet data)
-    if player.id == "almoz001" and player.name == "Drew Stubbs":
-        return "Zoilo Almonte"
+@dataclass
+class TeamPlayersIndex:
+    """A team's players for a season on Baseball Reference, indexed by their exact and normalized names."""
+
+    player_names: list[str]
+    name_to_player_id: dict[str, str]
+    normalized_name_to_player_id: dict[str, str]
+
+    @classmethod
+    def from_df(cls, team_players_df: pd.DataFrame) -> "TeamPlayersIndex":
+        name_to_player_id: dict[str, str] = {}
+        normalized_name_to_player_id: dict[str, str] = {}
+        for player_name, player_id in zip(team_players_df["player_name"], team_players_df["player_id"]):
+            name_to_player_id.setdefault(player_name, player_id)
+            normalized_name_to_player_id.setdefault(_normalize_player_name(player_name), player_id)
+
+        return cls(
+            player_names=list(name_to_player_id),
+            name_to_player_id=name_to_player_id,
+            normalized_name_to_player_id=normalized_name_to_player_id,
+        )
+
+    def match(self, player_name: str) -> str | None:
+        """Match the player's name exactly, by its normalized form or by a known alias, returning the player's id."""
+        if player_id := self.name_to_player_id.get(player_name):
+            return player_id
+        if player_id := self.normalized_name_to_player_id.get(_normalize_player_name(player_name)):
+            return player_id
+        if alias := get_player_aliases().get(player_name):
+            return self.name_to_player_id.get(alias)
+
+        return None
+
+    def fuzzy_match(self, player_name: str) -> str:
+        return self.name_to_player_id[_fuzzy_lookup_player(player_name, self.player_names)]
+
+
+@dataclass
+class SeasonPlayersMatcher:
+    """Match Retrosheet players to a season's Baseball Reference players.
+
+    Players are matched by name within their team's index, falling back to a fuzzy match. New matches are added to the
+    season's match table on disk by `write_new_matches` (once per batch of lookups), so players are only fuzzy matched
+    once.
+    """
+
+    year: int
+    # players' seasonal stats indexed by Baseball Reference team and player id
+    players_df: pd.DataFrame
+    team_id_to_index: dict[str, TeamPlayersIndex]
+    # Baseball Reference team id and Retrosheet player id -> Baseball Reference player id
+    matches: dict[tuple[str, str], str]
+    # matches not yet written to the season's match table
+    new_matches: dict[tuple[str, str], str] = field(default_factory=dict)
+
+    @classmethod
+    def from_year(cls, year: int) -> "SeasonPlayersMatcher":
+        df = get_seasonal_players_stats(year)
+        team_id_to_index = {
+            team_id: TeamPlayersIndex.from_df(team_players_df)
+            for team_id, team_players_df in df.groupby("baseball_reference_team_id", sort=False, observed=True)
+        }
+        players_df = df.set_index(["baseball_reference_team_id", "player_id"])
+        return cls(year=year, players_df=players_df, team_id_to_index=team_id_to_index, matches=_read_matches(year))
 
-    return player.name  # type: ignore
+    def lookup_player(self, player: Player, team: Team) -> pd.Series | None:
+        team_id = team.baseball_reference_id or team.retrosheet_id
+        player_id = self.match_player(player, team_id)
+        if player_id is None:
+            return None
+
+        return self.players_df.loc[(team_id, player_id)]
+
+    def match_player(self, player: Player, team_id: str) -> str | None:
+        """Get the player's Baseball Reference id, or None if their team has no players for the season."""
+        if player_id := self.matches.get((team_id, player.id)):
+            return player_id
+
+        team_players_index = self.team_id_to_index.get(team_id)
+        if team_players_index is None:
+            return None
+
+        player_name = _get_real_player_name(player)
+        player_id = team_players_index.match(player_name) or team_players_index.fuzzy_match(player_name)
+        self.matches[(team_id, player.id)] = player_id
+        self.new_matches[(team_id, player.id)] = player_id
+        return player_id
+
+    def write_new_matches(self) -> None:
+        if not self.new_matches:
+            return
+
+        new_matches, self.new_matches = self.new_matches, {}
+        _write_new_matches(self.year, new_matches)
+
+
+@lru_cache(maxsize=4)
+def get_season_players_matcher(year: int) -> SeasonPlayersMatcher:
+    return SeasonPlayersMatcher.from_year(year)
+
+
+def lookup_player(year: int, player: Player, team: Team) -> pd.Series | None:
+    """Lookup the player's seasonal stats for the team, or None if the team has no players for the season.
+
+    New matches of players are only written to the season's match table by `write_new_matches`.
+    """
+    return get_season_players_matcher(year).lookup_player(player, team)
+
+
+def write_new_matches(year: int) -> None:
+    """Write the matches of players looked up since the last write to the season's match table."""
+    get_season_players_matcher(year).write_new_matches()
+
+
+@lru_cache(maxsize=None)
+def get_player_aliases() -> dict[str, str]:
+    """Get the names of players playing under other names on Baseball Reference."""
+    df = _read_data_file(PLAYER_ALIASES_PATH)
+    return dict(zip(df["player_name"], df["baseball_reference_player_name"]))
+
+
+@lru_cache(maxsize=None)
+def get_player_name_corrections() -> dict[tuple[str, str], str]:
+    """Get the real names of Retrosheet players where either the player's id or name is incorrect in the data."""
+    df = _read_data_file(PLAYER_NAME_CORRECTIONS_PATH)
+    return {
+        (player_id, player_name): corrected_player_name
+        for player_id, player_name, corrected_player_name in zip(
+            df["player_id"], df["player_name"], df["corrected_player_name"]
+        )
+    }
+
+
+@lru_cache(maxsize=None)
+def get_no_team_at_bats_players() -> set[tuple[str, str, int]]:
+    """Get the players, Retrosheet team ids and years of players without stats for a team on Baseball Reference.
+
+    These players appear in the Baseball Reference data due to having at bats for the season, but they had all of
+    their at bats for another team, so they are not reported to have any hitting stats for the team.
+    """
+    df = _read_data_file(NO_TEAM_AT_BATS_PATH)
+    return set(zip(df["player_name"], df["team_id"], df["year"].astype(int)))
+
+
+def _read_data_file(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def _get_matches_data_path(year: int) -> Path:
+    return paths.DATA_DIR / str(year) / "baseball_reference_matches.csv"
+
+
+def _read_matches(year: int) -> dict[tuple[str, str], str]:
+    df: pd.DataFrame | None = disk_cache.read(_get_matches_data_path(year), _read_data_file)
+    if df is None:
+        return {}
+
+    return {
+        (team_id, retrosheet_player_id): player_id
+        for team_id, retrosheet_player_id, player_id in zip(
+            df["baseball_reference_team_id"], df["retrosheet_player_id"], df["player_id"]
+        )
+    }
+
+
+def _write_new_matches(year: int, new_matches: dict[tuple[str, str], str]) -> None:
+    """Add the matches to the season's match table, keeping any matches written by other processes."""
+    data_path = _get_matches_data_path(year)
+    with disk_cache.lock(data_path):
+        matches = _read_matches(year)
+        matches.update(new_matches)
+        disk_cache.write(data_path, lambda tmp_path: _write_matches(tmp_path, matches))
+
+
+def _write_matches(data_path: Path, matches: dict[tuple[str, str], str]) -> None:
+    lines = ["baseball_reference_team_id,retrosheet_player_id,player_id"]
+    for (team_id, retrosheet_player_id), player_id in matches.items():
+        lines.append(f"{team_id},{retrosheet_player_id},{player_id}")
+    data_path.write_text("\n".join(lines))
+
+
+def _normalize_player_name(player_name: str) -> str:
+    """Normalize the name for matching, e.g. stripping accents since Retrosheet does not use them."""
+    decomposed_name = unicodedata.normalize("NFKD", player_name)
+    name = "".join(char for char in decomposed_name if not unicodedata.combining(char))
+    return " ".join(name.replace(".", "").casefold().split())
+
+
+def _get_real_player_name(player: Player) -> str:
+    return get_player_name_corrections().get((player.id, player.name), player.name)
 
 
 def _fuzzy_lookup_player(player: str, team_players: list[str]) -> str:
     """Perform a fuzzy lookup to match a player's name to the names of players on a team."""
-    # set to 80 so minor differences can be matched (e.g. accent in a name since Retrosheet does not use accents)
-    threshold = 80
     matched_player, score = process.extractOne(player, team_players)
-    if score >= threshold:
+    if score >= FUZZY_MATCH_THRESHOLD:
         return matched_player  # type: ignore
 
     # if match does not reach the threshold, try matching on last name only
@@ -158,23 +503,10 @@ def _fuzzy_lookup_player(player: str, team_players: list[str]) -> str:
         return matched_player  # type: ignore
 
     # try fuzzy matching on last name only
-    player_last_name = player.split(" ")[-1]
     for team_player in team_players:
         team_player_last_name = team_player.split(" ")[-1]
         match_ratio = fuzz.ratio(player_last_name, team_player_last_name)
-        if match_ratio >= 80:
+        if match_ratio >= FUZZY_MATCH_THRESHOLD:
             return team_player
 
-    # special cases of players playing under other names
-    player_aliases = {
-        "Jose Garcia": "José Barrero",  # https://www.baseball-reference.com/players/g/garcijo02.shtml
-        "Felipe Rivero": "Felipe Vazquez",  # https://www.baseball-reference.com/players/r/riverfe01.shtml
-        "Manuel Pina": "Manny Piña",
-        "Fausto Carmona": "Roberto Hernández",  # https://www.baseball-reference.com/players/c/carmofa01.shtml
-        "Leo Nunez": "Juan Carlos Oviedo",  # https://www.baseball-reference.com/players/n/nunezle01.shtml
-        "Jose J. Leon": "José León",
-    }
-    if player in player_aliases:
-        return player_aliases[player]
-
     raise ValueError(f"Unable to perform a fuzzy lookup of {player=} | {matched_player=} | {score=} | {team_players=}")
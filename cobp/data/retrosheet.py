@@ -0,0 +1,155 @@
+"""Load Retrosheet games, caching parsed seasons on disk.
+
+Parsing a season of Retrosheet event files takes several seconds, so parsed games are pickled to
+'~/.cobp/data/<year>/'. Cache files are keyed by the pyretrosheet version and a checksum of the season's event
+files, so they are invalidated automatically when either changes.
+"""
+import hashlib
+import logging
+import pickle
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+
+from pyretrosheet import load, retrosheet
+from pyretrosheet.models.game import Game
+
+from cobp import disk_cache, paths
+from cobp.game_index import index_games
+from cobp.game_store import GamesSelection, GameStore
+from cobp.models.team import Team
+
+logger = logging.getLogger(__name__)
+
+PYRETROSHEET_VERSION = version("pyretrosheet")
+# seasons with Retrosheet play-by-play data which may be loaded
+FIRST_AVAILABLE_YEAR = 2000
+LAST_AVAILABLE_YEAR = 2022
+
+
+@dataclass
+class SeasonGames:
+    """A season's games, stored by date and indexed by the participating teams."""
+
+    year: int
+    store: GameStore
+    team_id_to_store: dict[str, GameStore]
+
+    @classmethod
+    def from_games(cls, year: int, games: list[Game]) -> "SeasonGames":
+        store = GameStore.from_games(games)
+        team_id_to_games = defaultdict(list)
+        for game in store.games:
+            team_id_to_games[game.home_team_id].append(game)
+            team_id_to_games[game.visiting_team_id].append(game)
+
+        team_id_to_store = {team_id: GameStore.from_games(games) for team_id, games in team_id_to_games.items()}
+        return cls(year=year, store=store, team_id_to_store=team_id_to_store)
+
+    @property
+    def games(self) -> list[Game]:
+        return self.store.games
+
+    def get_team_store(self, team_id: str) -> GameStore:
+        return self.team_id_to_store.get(team_id) or GameStore.from_games([])
+
+    def get_team_games(self, team_id: str) -> list[Game]:
+        return self.get_team_store(team_id).games
+
+
+@lru_cache(maxsize=4)
+def load_season(year: int, basic_info_only: bool = False) -> SeasonGames:
+    """Load a season's games once, so they may be partitioned by team without re-loading them.
+
+    Only the most recently used seasons are kept in memory so that iterating all seasons does not hold them all.
+    """
+    return SeasonGames.from_games(year, load_games(year, basic_info_only=basic_info_only))
+
+
+def load_team_games(
+    year: int,
+    team: Team,
+    basic_info_only: bool = False,
+    game_ids: list[str] | None = None,
+    games_selection: GamesSelection | None = None,
+) -> list[Game]:
+    """Load a team's games of a season in date order, indexing their plays for stats.
+
+    Only the games of `game_ids`, or the team's games selected by `games_selection`, are loaded if given.
+    """
+    if game_ids and games_selection:
+        raise ValueError("Load games by either game ids or a games selection, not both")
+
+    season_games = load_season(year, basic_info_only=basic_info_only)
+    logger.info(f"Loaded {len(season_games.games)} games for {year} ({basic_info_only=})")
+    if game_ids:
+        teams_games_for_year = season_games.store.get_games(game_ids)
+        logger.info(f"Loaded {len(teams_games_for_year)} games for {year}, matching {len(game_ids)} game ids")
+    elif games_selection:
+        teams_games_for_year = games_selection.select(season_games.get_team_store(team.retrosheet_id))
+        logger.info(f"Loaded {len(teams_games_for_year)} games for {year} {team.pretty_name}, {games_selection}")
+    else:
+        teams_games_for_year = season_games.get_team_games(team.retrosheet_id)
+        logger.info(f"Loaded {len(teams_games_for_year)} games for {year} {team.pretty_name}")
+
+    if not basic_info_only:
+        index_games(teams_games_for_year)
+
+    return teams_games_for_year
+
+
+def load_games(year: int, basic_info_only: bool = False) -> list[Game]:
+    """Load a season's games, from the on-disk cache if available."""
+    cache_path = _get_games_cache_path(year, basic_info_only)
+
+    def parse_games() -> list[Game]:
+        _remove_stale_games_caches(cache_path)
+        # bypass pyretrosheet's in-memory cache, which would otherwise hold every season ever loaded
+        games: list[Game] = load.load_games.__wrapped__(year=year, basic_info_only=basic_info_only)
+        return games
+
+    return disk_cache.get_or_create(
+        cache_path, read_entry=_read_games_cache, create_entry=parse_games, write_entry=_write_games_cache
+    )
+
+
+@lru_cache(maxsize=None)
+def get_season_checksum(year: int) -> str:
+    """Get a checksum of the season's Retrosheet event files, which is only calculated once per process."""
+    play_by_play_files = retrosheet.retrieve_years_play_by_play_files(year=year, data_dir=load.DEFAULT_DATA_DIR)
+    checksum = hashlib.blake2b(digest_size=8)
+    for file in sorted(play_by_play_files):
+        checksum.update(file.name.encode())
+        checksum.update(file.read_bytes())
+    return checksum.hexdigest()
+
+
+def _get_games_cache_path(year: int, basic_info_only: bool) -> Path:
+    prefix = "retrosheet_basic_games" if basic_info_only else "retrosheet_games"
+    return paths.DATA_DIR / str(year) / f"{prefix}_{PYRETROSHEET_VERSION}_{get_season_checksum(year)}.pickle"
+
+
+def _read_games_cache(cache_path: Path) -> list[Game] | None:
+    try:
+        with cache_path.open("rb") as f:
+            games: list[Game] = pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning(f"Ignoring unreadable games cache {cache_path.as_posix()}: {e!r}")
+        return None
+
+    logger.info(f"Loaded {len(games)} parsed games from {cache_path.as_posix()}")
+    return games
+
+
+def _remove_stale_games_caches(cache_path: Path) -> None:
+    """Remove caches for prior pyretrosheet versions or data."""
+    prefix = cache_path.name.split(f"_{PYRETROSHEET_VERSION}_")[0]
+    for stale_cache_path in cache_path.parent.glob(f"{prefix}_*.pickle"):
+        disk_cache.remove(stale_cache_path)
+
+
+def _write_games_cache(cache_path: Path, games: list[Game]) -> None:
+    with cache_path.open("wb") as f:
+        pickle.dump(games, f, protocol=pickle.HIGHEST_PROTOCOL)
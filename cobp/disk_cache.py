@@ -0,0 +1,131 @@
+"""Cache entries in files of `paths.DATA_DIR`, shared between the app's processes (e.g. server or export workers).
+
+An entry is written to a temporary file, which is moved into place once complete, and a checksum of its contents is
+written alongside it. An entry whose checksum is missing or does not match (e.g. one being replaced, or corrupted) is
+treated as missing. Populating a missing entry holds the entry's file lock, so that only one process populates it,
+while others wait and then read it.
+"""
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import TypeVar
+
+if sys.platform != "win32":
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+CHECKSUM_SUFFIX = ".checksum"
+_CHECKSUM_CHUNK_BYTES = 1 << 20
+# locks of entries within this process, on Windows where file locks are unavailable
+_lock_path_to_thread_lock: dict[Path, Lock] = {}
+_thread_locks_lock = Lock()
+
+
+def get_or_create(
+    path: Path,
+    read_entry: Callable[[Path], V | None],
+    create_entry: Callable[[], V],
+    write_entry: Callable[[Path, V], None],
+) -> V:
+    """Read the entry at `path`, or create and write it while holding its lock if it is missing.
+
+    `read_entry` may return None for an entry which is unreadable (e.g. of an incompatible version), to re-create it.
+    """
+    value = read(path, read_entry)
+    if value is not None:
+        return value
+
+    with lock(path):
+        # the entry may have been written by another process while waiting on the lock
+        value = read(path, read_entry)
+        if value is not None:
+            return value
+
+        created_value = create_entry()
+        write(path, lambda tmp_path: write_entry(tmp_path, created_value))
+        return created_value
+
+
+def read(path: Path, read_entry: Callable[[Path], V | None]) -> V | None:
+    """Read the entry at `path`, or return None if it is missing or does not match its checksum."""
+    try:
+        checksum = _get_checksum_path(path).read_text()
+        if _get_checksum(path) != checksum:
+            logger.warning(f"Ignoring cache entry not matching its checksum: {path.as_posix()}")
+            return None
+    except FileNotFoundError:
+        return None
+
+    return read_entry(path)
+
+
+def write(path: Path, write_entry: Callable[[Path], None]) -> None:
+    """Write the entry at `path` by writing it to a temporary file with `write_entry`, then moving it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _get_tmp_path(path)
+    checksum_tmp_path = _get_tmp_path(_get_checksum_path(path))
+    try:
+        write_entry(tmp_path)
+        checksum_tmp_path.write_text(_get_checksum(tmp_path))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        checksum_tmp_path.unlink(missing_ok=True)
+        raise
+
+    # the prior checksum is removed first, so that the entry is missing (and not mismatched) until it is complete
+    _get_checksum_path(path).unlink(missing_ok=True)
+    os.replace(tmp_path, path)
+    os.replace(checksum_tmp_path, _get_checksum_path(path))
+    logger.info(f"Wrote cache entry {path.as_posix()}")
+
+
+def remove(path: Path) -> None:
+    _get_checksum_path(path).unlink(missing_ok=True)
+    path.unlink(missing_ok=True)
+
+
+@contextmanager
+def lock(path: Path) -> Iterator[None]:
+    """Hold the exclusive lock of the entry at `path` (which need not exist), across processes."""
+    lock_path = path.parent / f".{path.name}.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sys.platform == "win32":
+        with _thread_locks_lock:
+            thread_lock = _lock_path_to_thread_lock.setdefault(lock_path, Lock())
+        with thread_lock:
+            yield
+        return
+
+    with lock_path.open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _get_checksum(path: Path) -> str:
+    checksum = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        while chunk := f.read(_CHECKSUM_CHUNK_BYTES):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def _get_checksum_path(path: Path) -> Path:
+    return path.with_name(path.name + CHECKSUM_SUFFIX)
+
+
+def _get_tmp_path(path: Path) -> Path:
+    fd, tmp_path_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    return Path(tmp_path_name)
@@ -22,6 +22,13 @@ class Env(BaseSettings):
     GAME_ID: str | None = Field(default=None)
     TEAM: str | None = Field(default=None)
     YEAR: int | None = Field(default=None)
+    # number of worker processes used to calculate multi-team/multi-year exports (1 runs them in-process)
+    EXPORT_WORKERS: int = Field(default=1)
+    # number of team games' results (loaded games and their stats) kept in memory across reruns and sessions
+    RESULTS_CACHE_ENTRIES: int = Field(default=16)
+    # compare runs and RBIs counted from plays with Baseball Reference's seasonal stats, logging any differences
+    # (only meaningful when calculating a team's entire season)
+    CROSS_CHECK_RUNS: bool = Field(default=False)
 
 
 ENV = Env()
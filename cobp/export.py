@@ -0,0 +1,344 @@
+"""Export players' stats for many team-seasons, optionally across a pool of worker processes.
+
+Exports may be run without the streamlit application, e.g. `python -m cobp.export --year 2019 --team ALL`, and may
+be limited to a date range of each team-season's games, e.g. `--last-days 30`.
+"""
+import argparse
+import csv
+import datetime as dt
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cobp import paths
+from cobp.data.retrosheet import FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR, load_team_games
+from cobp.env import ENV
+from cobp.game_store import GamesSelection
+from cobp.models.team import TEAM_RETROSHEET_ID_TO_TEAM, Team, get_team_for_year, get_teams_for_year
+from cobp.stats.aggregated import get_player_to_stats_df, get_players_and_player_to_stats
+
+logger = logging.getLogger(__name__)
+
+# quote non-numeric values so that numeric-looking strings (e.g. player ids) are not parsed as numbers
+CSV_QUOTING = csv.QUOTE_NONNUMERIC
+# CLI argument exporting all teams or all years
+ALL = "ALL"
+# stored as dictionary-encoded (categorical) columns in columnar exports
+CATEGORICAL_COLUMNS = ["Team", "Player", "ID"]
+# team-seasons submitted to the process pool per worker, ahead of those being consumed
+_MAX_PENDING_PER_WORKER = 2
+
+
+class ExportFormat(Enum):
+    CSV = "csv"
+    # columnar, typed and compressed, for analysis (e.g. `pd.read_parquet`)
+    PARQUET = "parquet"
+
+
+@dataclass(frozen=True)
+class TeamSeason:
+    """A team's season, or only its selected games of the season."""
+
+    team: Team
+    year: int
+    games_selection: GamesSelection | None = None
+
+    @property
+    def pretty_name(self) -> str:
+        return f"{self.year} {self.team.pretty_name}"
+
+
+def get_team_seasons(
+    team: Team | None, year: int | None, games_selection: GamesSelection | None = None
+) -> list[TeamSeason]:
+    """Get the team-seasons to export, where no team exports all teams and no year exports all available years.
+
+    Team-seasons are ordered by year, most recent first.
+    """
+    years = [year] if year else list(reversed(range(FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR + 1)))
+    return [
+        TeamSeason(team_, year_, games_selection)
+        for year_ in years
+        for team_ in ([team] if team else get_teams_for_year(year_))
+    ]
+
+
+def get_export_file_name(
+    team: Team | None,
+    year: int | None,
+    export_format: ExportFormat = ExportFormat.CSV,
+    games_selection: GamesSelection | None = None,
+) -> str:
+    teams_name = team.pretty_name if team else "all_teams"
+    years_name = str(year) if year else f"{FIRST_AVAILABLE_YEAR}_to_{LAST_AVAILABLE_YEAR}"
+    games_name = f"_{games_selection.name}" if games_selection else ""
+    return f"{years_name}_{teams_name}{games_name}.{export_format.value}"
+
+
+def get_team_season_stats_df(team_season: TeamSeason) -> pd.DataFrame:
+    team, year = team_season.team, team_season.year
+    # the stats are summed from the games' partials, so only the games' basic info is loaded
+    team_games = load_team_games(year, team, basic_info_only=True, games_selection=team_season.games_selection)
+    # explanations are only displayed for a single team's stats, never exported
+    players, player_to_stats = get_players_and_player_to_stats(
+        team_games, team, year, explain=False, is_full_season=team_season.games_selection is None
+    )
+    df = get_player_to_stats_df(players, player_to_stats, team=team, year=year)
+    # remove players without ABs as they are not currently useful
+    return df[df["AB"] > 0]
+
+
+def iter_team_season_stats_dfs(
+    team_seasons: list[TeamSeason], workers: int = ENV.EXPORT_WORKERS
+) -> Iterator[tuple[TeamSeason, pd.DataFrame]]:
+    """Yield each team-season's stats, in the order of the given team-seasons.
+
+    When more than one worker is requested, team-seasons are calculated concurrently in a process pool, with at most
+    two team-seasons per worker in flight so that calculated stats do not pile up ahead of the consumer.
+    Team-seasons should be ordered by year so that each worker process re-uses its loaded seasons.
+    """
+    if workers <= 1:
+        for team_season in team_seasons:
+            yield team_season, get_team_season_stats_df(team_season)
+        return
+
+    logger.info(f"Exporting {len(team_seasons)} team-seasons with {workers=}")
+    # spawn rather than fork, as forking a multi-threaded process (e.g. the streamlit server) is unsafe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending: deque[tuple[TeamSeason, Future[pd.DataFrame]]] = deque()
+        team_seasons_to_submit = iter(team_seasons)
+        for team_season in islice(team_seasons_to_submit, _MAX_PENDING_PER_WORKER * workers):
+            pending.append((team_season, executor.submit(get_team_season_stats_df, team_season)))
+        while pending:
+            team_season, future = pending.popleft()
+            df = future.result()
+            # submit the next team-season as each is consumed, keeping the workers busy
+            for next_team_season in islice(team_seasons_to_submit, 1):
+                pending.append((next_team_season, executor.submit(get_team_season_stats_df, next_team_season)))
+            yield team_season, df
+
+
+def write_team_seasons_stats(
+    team_seasons: list[TeamSeason],
+    export_paths: dict[ExportFormat, Path],
+    workers: int = ENV.EXPORT_WORKERS,
+) -> Iterator[TeamSeason]:
+    """Stream each team-season's stats to a file of each format, yielding each team-season once it is written.
+
+    Only a single team-season's stats are held in memory at a time.
+    """
+    with ExitStack() as stack:
+        writes = [stack.enter_context(open_stats_writer(path, fmt)) for fmt, path in export_paths.items()]
+        for team_season, team_season_df in iter_team_season_stats_dfs(team_seasons, workers):
+            for write in writes:
+                write(team_season_df)
+            yield team_season
+
+    logger.info(f"Wrote {len(team_seasons)} team-seasons' stats to {[p.as_posix() for p in export_paths.values()]}")
+
+
+@contextmanager
+def open_stats_writer(path: Path, export_format: ExportFormat) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """Open a writer of stats, which appends each written DataFrame to the file.
+
+    The file is written alongside `path` and moved into place once complete, so that a partially written export is
+    never read.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_path_name)
+    try:
+        if export_format == ExportFormat.CSV:
+            with tmp_path.open("w", newline="") as f:
+                yield lambda df: _write_csv_chunk(f, df)
+        else:
+            with _ParquetChunkWriter(tmp_path) as parquet_writer:
+                yield parquet_writer.write
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_path, path)
+
+
+def _write_csv_chunk(f: Any, df: pd.DataFrame) -> None:
+    df.to_csv(f, header=f.tell() == 0, index=False, quoting=CSV_QUOTING)
+
+
+class _ParquetChunkWriter:
+    """Write DataFrames as row groups of a Parquet file, with the schema of the first DataFrame."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._writer: pq.ParquetWriter | None = None
+
+    def __enter__(self) -> "_ParquetChunkWriter":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        if self._writer is None:
+            # write an empty file, so that an export of no rows is still readable
+            pq.write_table(pa.table({}), self.path)
+        else:
+            self._writer.close()
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, _get_parquet_schema(df))
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False))
+
+
+def _get_parquet_schema(df: pd.DataFrame) -> pa.Schema:
+    return pa.schema(
+        [
+            pa.field(column, pa.dictionary(pa.int32(), pa.string()))
+            if column in CATEGORICAL_COLUMNS
+            else pa.field(column, pa.from_numpy_dtype(df[column].dtype))
+            for column in df.columns
+        ]
+    )
+
+
+def read_stats(path: Path, export_format: ExportFormat) -> pd.DataFrame:
+    if export_format == ExportFormat.CSV:
+        return pd.read_csv(path)
+
+    return pd.read_parquet(path)
+
+
+def export_team_seasons_stats(
+    team_seasons: list[TeamSeason],
+    path: Path,
+    export_format: ExportFormat = ExportFormat.CSV,
+    workers: int = ENV.EXPORT_WORKERS,
+    resume: bool = False,
+) -> None:
+    """Export team-seasons' stats to a file, checkpointing each team-season so an interrupted export may resume.
+
+    Each team-season's stats are written to their own file in a directory alongside `path`, which are then
+    assembled, in order, into `path`. When resuming, team-seasons written by a prior export are not recalculated.
+    """
+    parts_dir = path.parent / f".{path.name}.parts"
+    if not resume:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    parts_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_part_path(team_season: TeamSeason) -> Path:
+        return parts_dir / f"{team_season.year}_{team_season.team.retrosheet_id}.{export_format.value}"
+
+    remaining_team_seasons = [ts for ts in team_seasons if not get_part_path(ts).exists()]
+    if len(remaining_team_seasons) < len(team_seasons):
+        logger.info(f"Resuming export, {len(team_seasons) - len(remaining_team_seasons)} team-seasons already written")
+
+    for i, (team_season, team_season_df) in enumerate(iter_team_season_stats_dfs(remaining_team_seasons, workers)):
+        with open_stats_writer(get_part_path(team_season), export_format) as write:
+            write(team_season_df)
+        logger.info(f"Exported {team_season.pretty_name} ({i + 1}/{len(remaining_team_seasons)})")
+
+    with open_stats_writer(path, export_format) as write:
+        for team_season in team_seasons:
+            write(read_stats(get_part_path(team_season), export_format))
+
+    shutil.rmtree(parts_dir)
+    logger.info(f"Wrote {len(team_seasons)} team-seasons' stats to {path.as_posix()}")
+
+
+def main(args: list[str] | None = None) -> None:
+    """Export stats from the command line."""
+    parser = argparse.ArgumentParser(prog="python -m cobp.export", description="Export players' stats to a file.")
+    parser.add_argument(
+        "--year",
+        required=True,
+        help=f"year to export ({FIRST_AVAILABLE_YEAR} - {LAST_AVAILABLE_YEAR}), or {ALL} for all years",
+    )
+    parser.add_argument("--team", required=True, help=f"Retrosheet id of the team to export, or {ALL} for all teams")
+    parser.add_argument(
+        "--format",
+        choices=[export_format.value for export_format in ExportFormat],
+        default=ExportFormat.CSV.value,
+        help="format of the exported file",
+    )
+    parser.add_argument("--start-date", type=_parse_date, help="export only games on or after the date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=_parse_date, help="export only games on or before the date (YYYY-MM-DD)")
+    last_group = parser.add_mutually_exclusive_group()
+    last_group.add_argument("--last-games", type=int, help="export only each team-season's last N games")
+    last_group.add_argument(
+        "--last-days", type=int, help="export only the games of each team-season's last N days, up to its last game"
+    )
+    parser.add_argument("--output", type=Path, help=f"path to write to (default: a file in {paths.EXPORTS_DIR})")
+    parser.add_argument("--workers", type=int, default=ENV.EXPORT_WORKERS, help="number of worker processes")
+    parser.add_argument("--resume", action="store_true", help="resume an interrupted export of the same output")
+    parsed_args = parser.parse_args(args)
+
+    year = _parse_year(parser, parsed_args.year)
+    team = _parse_team(parser, parsed_args.team, year)
+    games_selection = _parse_games_selection(parser, parsed_args)
+    export_format = ExportFormat(parsed_args.format)
+    path = parsed_args.output or paths.EXPORTS_DIR / get_export_file_name(team, year, export_format, games_selection)
+    team_seasons = get_team_seasons(team, year, games_selection)
+    logger.info(f"Exporting {len(team_seasons)} team-seasons to {path.as_posix()}")
+    export_team_seasons_stats(
+        team_seasons, path, export_format=export_format, workers=parsed_args.workers, resume=parsed_args.resume
+    )
+
+
+def _parse_year(parser: argparse.ArgumentParser, year: str) -> int | None:
+    if year.upper() == ALL:
+        return None
+    if not year.isdigit() or not FIRST_AVAILABLE_YEAR <= int(year) <= LAST_AVAILABLE_YEAR:
+        parser.error(f"--year must be {ALL} or a year from {FIRST_AVAILABLE_YEAR} to {LAST_AVAILABLE_YEAR}: {year}")
+
+    return int(year)
+
+
+def _parse_team(parser: argparse.ArgumentParser, team_id: str, year: int | None) -> Team | None:
+    team_id = team_id.upper()
+    if team_id == ALL:
+        return None
+    if year is None:
+        if team_id not in TEAM_RETROSHEET_ID_TO_TEAM:
+            parser.error(f"Unknown --team: {team_id}")
+        return TEAM_RETROSHEET_ID_TO_TEAM[team_id]
+
+    try:
+        return get_team_for_year(team_id, year)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def _parse_date(date: str) -> dt.date:
+    try:
+        return dt.date.fromisoformat(date)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"dates must be YYYY-MM-DD: {date}")
+
+
+def _parse_games_selection(parser: argparse.ArgumentParser, parsed_args: argparse.Namespace) -> GamesSelection | None:
+    games_selection_args = [parsed_args.start_date, parsed_args.end_date, parsed_args.last_games, parsed_args.last_days]
+    if all(arg is None for arg in games_selection_args):
+        return None
+
+    try:
+        return GamesSelection(*games_selection_args)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
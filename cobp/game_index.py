@@ -0,0 +1,227 @@
+"""Indexes of a game's play data, built once per game and shared by all stats."""
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import accumulate
+from threading import RLock
+
+from pyretrosheet.models.game import ChronologicalEvents, Game
+from pyretrosheet.models.play import Play
+from pyretrosheet.models.team import TeamLocation
+from pyretrosheet.views import get_plays
+
+from cobp.base_runners import GameRuns
+
+HalfInning = tuple[TeamLocation, int]
+
+# bits of a play's classification mask, so that a play's classifications are computed once rather than by every stat
+(
+    AT_BAT,
+    HIT,
+    SINGLE,
+    DOUBLE,
+    TRIPLE,
+    HOME_RUN,
+    WALK,
+    HIT_BY_PITCH,
+    SACRIFICE_FLY,
+    GETS_ON_BASE,
+) = (1 << i for i in range(10))
+_BIT_TO_CLASSIFIER = {
+    AT_BAT: Play.is_an_at_bat,
+    HIT: Play.is_hit,
+    SINGLE: Play.is_single,
+    DOUBLE: Play.is_double,
+    TRIPLE: Play.is_triple,
+    HOME_RUN: Play.is_home_run,
+    WALK: Play.is_walk,
+    HIT_BY_PITCH: Play.is_hit_by_pitch,
+    SACRIFICE_FLY: Play.is_sacrifice_fly,
+    GETS_ON_BASE: Play.batter_gets_on_base,
+}
+
+
+def classify_play(play: Play) -> int:
+    """Get the play's classification mask, e.g. `classify_play(play) & HIT` is truthy for a hit."""
+    mask = 0
+    for bit, classifier in _BIT_TO_CLASSIFIER.items():
+        if classifier(play):
+            mask |= bit
+    return mask
+
+
+@dataclass(frozen=True)
+class PlayContext:
+    """A play's context within its half-inning.
+
+    Plays are located by value (as pyretrosheet's views compare them), so a play identical to an earlier play in the
+    same half-inning shares that play's position and is excluded from the play's on-base counts.
+
+    Args:
+        position: the play's 0-based position within the half-inning
+        on_bases_before: number of batters getting on base prior to the play in the half-inning
+        on_bases_after: number of batters getting on base after the play in the half-inning
+        half_inning_on_bases: number of batters getting on base in the half-inning, including the play's batter
+    """
+
+    position: int
+    on_bases_before: int
+    on_bases_after: int
+    half_inning_on_bases: int
+
+    @property
+    def is_first_batter(self) -> bool:
+        return self.position == 0
+
+    @property
+    def has_other_on_base(self) -> bool:
+        return self.on_bases_before + self.on_bases_after > 0
+
+
+@dataclass
+class GameIndex:
+    plays: list[Play]
+    batter_to_plays: dict[str, list[Play]]
+    half_inning_to_plays: dict[HalfInning, list[Play]]
+    play_id_to_context: dict[int, PlayContext]
+    play_id_to_mask: dict[int, int]
+    runs: GameRuns
+    _chronological_events: ChronologicalEvents = field(repr=False)
+    _num_chronological_events: int = field(repr=False)
+
+    @classmethod
+    def from_game(cls, game: Game) -> "GameIndex":
+        plays = get_plays(game)
+        play_id_to_mask = {id(play): classify_play(play) for play in plays}
+        batter_to_plays: dict[str, list[Play]] = defaultdict(list)
+        half_inning_to_plays: dict[HalfInning, list[Play]] = defaultdict(list)
+        for play in plays:
+            batter_to_plays[play.batter_id].append(play)
+            half_inning_to_plays[(play.team_location, play.inning)].append(play)
+
+        play_id_to_context = {}
+        for half_inning_plays in half_inning_to_plays.values():
+            play_id_to_context.update(_get_play_id_to_context(half_inning_plays, play_id_to_mask))
+
+        return cls(
+            plays=plays,
+            batter_to_plays=dict(batter_to_plays),
+            half_inning_to_plays=dict(half_inning_to_plays),
+            play_id_to_context=play_id_to_context,
+            play_id_to_mask=play_id_to_mask,
+            runs=GameRuns.from_game(game),
+            _chronological_events=game.chronological_events,
+            _num_chronological_events=len(game.chronological_events),
+        )
+
+    def get_batter_plays(self, batter_id: str) -> list[Play]:
+        return self.batter_to_plays.get(batter_id, [])
+
+    def get_inning_plays(self, team_location: TeamLocation) -> dict[int, list[Play]]:
+        """Get a map of inning number to the team's plays in that inning."""
+        return {
+            inning: plays
+            for (half_inning_team_location, inning), plays in self.half_inning_to_plays.items()
+            if half_inning_team_location == team_location
+        }
+
+    def get_half_inning_on_bases(self, team_location: TeamLocation, inning: int) -> int:
+        plays = self.half_inning_to_plays.get((team_location, inning))
+        return self.play_id_to_context[id(plays[0])].half_inning_on_bases if plays else 0
+
+    def get_play_context(self, play: Play) -> PlayContext | None:
+        """Get the play's context within its half-inning, if the play is within the game."""
+        if context := self.play_id_to_context.get(id(play)):
+            return context
+
+        # fall back to locating an equal, but not identical, play
+        for half_inning_play in self.half_inning_to_plays.get((play.team_location, play.inning), []):
+            if half_inning_play == play:
+                return self.play_id_to_context[id(half_inning_play)]
+
+        return None
+
+    def get_play_mask(self, play: Play) -> int:
+        """Get the play's classification mask, classifying plays which are not within the game."""
+        mask = self.play_id_to_mask.get(id(play))
+        return classify_play(play) if mask is None else mask
+
+    def is_stale(self, game: Game) -> bool:
+        """Determine if the game's events have changed since the index was built."""
+        return (
+            game.chronological_events is not self._chronological_events
+            or len(game.chronological_events) != self._num_chronological_events
+        )
+
+
+# games are not hashable, so indexes are keyed by object id and removed once the game is garbage collected
+_GAME_ID_TO_INDEX: dict[int, GameIndex] = {}
+# indexes are shared by the app's sessions, which run in threads. The lock is re-entrant as a game may be garbage
+# collected (removing its index) by the thread holding it
+_game_indexes_lock = RLock()
+
+
+def get_game_index(game: Game) -> GameIndex:
+    with _game_indexes_lock:
+        game_index = _GAME_ID_TO_INDEX.get(id(game))
+    if game_index and not game_index.is_stale(game):
+        return game_index
+
+    # built without holding the lock, so that indexing a game does not block other games' lookups
+    game_index = GameIndex.from_game(game)
+    with _game_indexes_lock:
+        if id(game) not in _GAME_ID_TO_INDEX:
+            weakref.finalize(game, _remove_game_index, id(game))
+        _GAME_ID_TO_INDEX[id(game)] = game_index
+    return game_index
+
+
+def index_games(games: list[Game]) -> None:
+    """Build the indexes for games up-front so that later lookups are free."""
+    for game in games:
+        get_game_index(game)
+
+
+def _remove_game_index(game_id: int) -> None:
+    with _game_indexes_lock:
+        _GAME_ID_TO_INDEX.pop(game_id, None)
+
+
+def _get_play_id_to_context(half_inning_plays: list[Play], play_id_to_mask: dict[int, int]) -> dict[int, PlayContext]:
+    on_bases = [bool(play_id_to_mask[id(play)] & GETS_ON_BASE) for play in half_inning_plays]
+    half_inning_on_bases = sum(on_bases)
+    # the number of batters getting on base before, and after, each position, from forward and reverse running counts
+    position_to_on_bases_before = list(accumulate(on_bases, initial=0))
+    position_to_on_bases_after = []
+    on_bases_after = 0
+    for on_base in reversed(on_bases):
+        position_to_on_bases_after.append(on_bases_after)
+        on_bases_after += on_base
+    position_to_on_bases_after.reverse()
+
+    # group the positions of equal plays in a single pass, looking up candidates by their raw play
+    raw_to_same_plays_positions: dict[str, list[list[int]]] = defaultdict(list)
+    same_plays_positions = []
+    for i, play in enumerate(half_inning_plays):
+        raw_same_plays_positions = raw_to_same_plays_positions[play.raw]
+        positions = next((p for p in raw_same_plays_positions if half_inning_plays[p[0]] == play), None)
+        if positions is None:
+            positions = []
+            raw_same_plays_positions.append(positions)
+            same_plays_positions.append(positions)
+        positions.append(i)
+
+    play_id_to_context = {}
+    for positions in same_plays_positions:
+        # equal plays share the position of the first of them, and are excluded from each other's on-base counts
+        position = positions[0]
+        context = PlayContext(
+            position=position,
+            on_bases_before=position_to_on_bases_before[position],
+            on_bases_after=position_to_on_bases_after[position] - sum(on_bases[i] for i in positions[1:]),
+            half_inning_on_bases=half_inning_on_bases,
+        )
+        for i in positions:
+            play_id_to_context[id(half_inning_plays[i])] = context
+
+    return play_id_to_context
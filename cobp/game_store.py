@@ -0,0 +1,125 @@
+"""A store of games ordered by date, for selecting games by id or by date range."""
+import datetime as dt
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from pyretrosheet.models.game import Game
+
+
+@dataclass
+class Stand:
+    """A run of consecutive games played by a team at home (a homestand) or away (a road trip)."""
+
+    is_home: bool
+    games: list[Game]
+
+    @property
+    def pretty_name(self) -> str:
+        kind = "Homestand" if self.is_home else "Road Trip"
+        first_date, last_date = self.games[0].id.date, self.games[-1].id.date
+        return f"{kind} {first_date.strftime('%Y/%m/%d')} - {last_date.strftime('%Y/%m/%d')} ({len(self.games)} games)"
+
+
+@dataclass
+class GameStore:
+    """Games sorted by date (and game number, for doubleheaders), indexed by game id."""
+
+    games: list[Game]
+    dates: list[dt.date]
+    game_id_to_game: dict[str, Game]
+
+    @classmethod
+    def from_games(cls, games: list[Game]) -> "GameStore":
+        games = sorted(games, key=lambda game: (game.id.date, game.id.game_number))
+        return cls(
+            games=games,
+            dates=[game.id.date for game in games],
+            game_id_to_game={game.id.raw: game for game in games},
+        )
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def get_games(self, game_ids: list[str]) -> list[Game]:
+        """Get the games of the game ids which are in the store, in date order."""
+        games = [self.game_id_to_game[game_id] for game_id in set(game_ids) if game_id in self.game_id_to_game]
+        return sorted(games, key=lambda game: (game.id.date, game.id.game_number))
+
+    def get_games_between(self, start_date: dt.date | None, end_date: dt.date | None) -> list[Game]:
+        """Get the games played from the start date through the end date, where no date leaves the range open."""
+        start = bisect_left(self.dates, start_date) if start_date else 0
+        end = bisect_right(self.dates, end_date) if end_date else len(self.dates)
+        return self.games[start:end]
+
+    def get_last_games(self, n: int) -> list[Game]:
+        return self.games[-n:] if n > 0 else []
+
+    def get_last_days_games(self, days: int) -> list[Game]:
+        """Get the games of the last `days` days on which the store has games, counting back from its last game."""
+        if not self.games or days < 1:
+            return []
+
+        return self.get_games_between(self.dates[-1] - dt.timedelta(days=days - 1), None)
+
+    def get_months(self) -> list[dt.date]:
+        """Get the first day of each month with games."""
+        return sorted({date.replace(day=1) for date in self.dates})
+
+    def get_month_games(self, month: dt.date) -> list[Game]:
+        next_month = (month.replace(day=28) + dt.timedelta(days=4)).replace(day=1)
+        return self.get_games_between(month.replace(day=1), next_month - dt.timedelta(days=1))
+
+    def get_stands(self, team_id: str) -> list[Stand]:
+        """Get the team's homestands and road trips, in date order."""
+        stands: list[Stand] = []
+        for game in self.games:
+            is_home = game.home_team_id == team_id
+            if stands and stands[-1].is_home == is_home:
+                stands[-1].games.append(game)
+            else:
+                stands.append(Stand(is_home=is_home, games=[game]))
+        return stands
+
+
+@dataclass(frozen=True)
+class GamesSelection:
+    """A selection of a team's games within a season, from only which stats are calculated.
+
+    Dates bound the selected games, which may be further limited to the last N games or days of those games.
+    """
+
+    start_date: dt.date | None = None
+    end_date: dt.date | None = None
+    last_games: int | None = None
+    last_days: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError(f"The start date {self.start_date} is after the end date {self.end_date}")
+        if self.last_games is not None and self.last_days is not None:
+            raise ValueError("Select either the last games or the last days, not both")
+        for n in [self.last_games, self.last_days]:
+            if n is not None and n < 1:
+                raise ValueError(f"The number of last games or days must be positive, not {n}")
+
+    @property
+    def name(self) -> str:
+        """A name of the selection, for use in file names."""
+        names = []
+        if self.start_date or self.end_date:
+            names.append(f"{self.start_date or 'start'}_to_{self.end_date or 'end'}")
+        if self.last_games:
+            names.append(f"last_{self.last_games}_games")
+        if self.last_days:
+            names.append(f"last_{self.last_days}_days")
+        return "_".join(names)
+
+    def select(self, store: GameStore) -> list[Game]:
+        games = store.get_games_between(self.start_date, self.end_date)
+        if self.last_games is None and self.last_days is None:
+            return games
+
+        games_store = GameStore.from_games(games)
+        if self.last_games is not None:
+            return games_store.get_last_games(self.last_games)
+        return games_store.get_last_days_games(self.last_days)  # type: ignore
@@ -3,8 +3,9 @@ from pathlib import Path
 
 COBP_DIR = Path.home() / ".cobp"
 DATA_DIR = COBP_DIR / "data"
+EXPORTS_DIR = COBP_DIR / "exports"
 
-for dir in [COBP_DIR, DATA_DIR]:
+for dir in [COBP_DIR, DATA_DIR, EXPORTS_DIR]:
     dir.mkdir(exist_ok=True, parents=True)
 
 PROJECT_ROOT = Path(__file__).parents[1]
@@ -1,25 +1,51 @@
 """Generates and displays results based on user input."""
 import logging
+from dataclasses import dataclass
+from pathlib import Path
 from traceback import format_exc
 
 import pandas as pd
 import streamlit as st
-from pyretrosheet.load import load_games
 from pyretrosheet.models.game import Game
-from streamlit.delta_generator import DeltaGenerator
+from pyretrosheet.models.player import Player
 
-from cobp import session
+from cobp import paths, session
+from cobp.cache import LRUCache, SingleFlight
+from cobp.data.retrosheet import load_team_games
 from cobp.env import ENV
-from cobp.models.team import Team, get_teams_for_year
-from cobp.stats.aggregated import get_player_to_stats, get_player_to_stats_df
+from cobp.export import ExportFormat, TeamSeason, get_export_file_name, get_team_seasons, write_team_seasons_stats
+from cobp.game_store import GameStore
+from cobp.models.team import Team
+from cobp.stats.aggregated import PlayerToStats, get_player_to_stats_df, get_players_and_player_to_stats
 from cobp.ui import download, selectors
 from cobp.ui.core import display_error
-from cobp.ui.selectors import ALL_TEAMS, ENTIRE_SEASON, FIRST_AVAILABLE_YEAR, FULL_PERIOD, LAST_AVAILABLE_YEAR
+from cobp.ui.selectors import ALL_TEAMS, FULL_PERIOD
 from cobp.ui.stats import display_game
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class TeamGamesResults:
+    """A team's games (with only their basic info), players and stats, which are cached and so must not be mutated."""
+
+    games: list[Game]
+    players: list[Player]
+    player_to_stats: PlayerToStats
+    player_to_stats_df: pd.DataFrame
+
+
+# keyed by (team id, year, game ids)
+TeamGamesKey = tuple[str, int, tuple[str, ...]]
+_TEAM_GAMES_RESULTS_CACHE: LRUCache[TeamGamesKey, TeamGamesResults] = LRUCache(
+    "Team games results", max_entries=ENV.RESULTS_CACHE_ENTRIES
+)
+# keyed by (export format, (team id, year) of each team-season)
+TeamSeasonsExportKey = tuple[ExportFormat, tuple[tuple[str, int], ...]]
+# exports are too large to cache, but concurrent requests of the same export share one calculation
+_TEAM_SEASONS_EXPORT_SINGLE_FLIGHT: SingleFlight[TeamSeasonsExportKey, Path] = SingleFlight("Team seasons export")
+
+
 def load_season_games(
     year: int,
     team: Team,
@@ -27,18 +53,7 @@ def load_season_games(
     game_ids: list[str] | None = None,
 ) -> list[Game]:
     try:
-        games_for_year = load_games(year=year, basic_info_only=basic_info_only)
-        logger.info(f"Loaded {len(games_for_year)} games for {year} ({basic_info_only=})")
-        if game_ids:
-            teams_games_for_year = [g for g in games_for_year if g.id.raw in game_ids]
-            logger.info(f"Loaded {len(teams_games_for_year)} games for {year}, matching {len(game_ids)} game ids")
-        else:
-            teams_games_for_year = [
-                g for g in games_for_year if team.retrosheet_id in (g.home_team_id, g.visiting_team_id)
-            ]
-            logger.info(f"Loaded {len(teams_games_for_year)} games for {year} {team.pretty_name}")
-
-        return teams_games_for_year
+        return load_team_games(year, team, basic_info_only=basic_info_only, game_ids=game_ids)
     except ValueError:
         display_error(f"Error in loading {year} {team.pretty_name}'s data:\n\n{format_exc()}")
         raise
@@ -57,62 +72,21 @@ def display(team: Team | str, year: int | str, game_id: str | None) -> None:
 
 
 def _display_download_for_all_teams_for_year(year: int) -> None:
-    df = pd.DataFrame()
-    progress = st.progress(0)
-    teams_for_year = get_teams_for_year(year)
-    for i, team_ in enumerate(teams_for_year):
-        team_player_to_stats_df = _get_team_player_to_stats_df(
-            progress=progress,
-            current_iteration=i,
-            total_iterations=len(teams_for_year),
-            team=team_,
-            year=year,
-        )
-        df = pd.concat([df, team_player_to_stats_df])
-
-    progress.empty()
-    download.download_df_button(df, f"{year}_all_teams.csv")
-    session.set_state(session.StateKey.REFRESH_NEEDED, True)
+    _display_download(team=None, year=year)
 
 
 def _display_download_for_team_for_all_years(team: Team) -> None:
-    df = pd.DataFrame()
-    progress = st.progress(0)
-    for i, year_ in enumerate(reversed(range(FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR + 1))):
-        team_player_to_stats_df = _get_team_player_to_stats_df(
-            progress=progress,
-            current_iteration=i,
-            total_iterations=LAST_AVAILABLE_YEAR - FIRST_AVAILABLE_YEAR,
-            team=team,
-            year=year_,
-        )
-        df = pd.concat([df, team_player_to_stats_df])
-
-    progress.empty()
-    download.download_df_button(df, f"{FIRST_AVAILABLE_YEAR}_to_{LAST_AVAILABLE_YEAR}_{team.pretty_name}.csv")
-    session.set_state(session.StateKey.REFRESH_NEEDED, True)
+    _display_download(team=team, year=None)
 
 
 def _display_download_for_all_teams_for_all_years() -> None:
-    df = pd.DataFrame()
-    progress = st.progress(0)
-    current_iteration = 0
-    for year_ in reversed(range(FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR + 1)):
-        teams_for_year = get_teams_for_year(year_)
-        for team_ in teams_for_year:
-            team_player_to_stats_df = _get_team_player_to_stats_df(
-                progress=progress,
-                current_iteration=current_iteration,
-                total_iterations=LAST_AVAILABLE_YEAR - FIRST_AVAILABLE_YEAR,
-                team=team_,
-                year=year_,
-            )
-            df = pd.concat([df, team_player_to_stats_df])
-
-        current_iteration += 1
+    _display_download(team=None, year=None)
 
-    progress.empty()
-    download.download_df_button(df, f"{FIRST_AVAILABLE_YEAR}_to_{LAST_AVAILABLE_YEAR}_all_teams.csv")
+
+def _display_download(team: Team | None, year: int | None) -> None:
+    export_format = selectors.get_export_format_selection()
+    path = _write_team_seasons(team, year, export_format)
+    download.download_file_button(path, path.name, export_format)
     session.set_state(session.StateKey.REFRESH_NEEDED, True)
 
 
@@ -126,45 +100,64 @@ def _display_stats_for_team_in_year(year: int, team: Team, game_id: str | None)
     elif ENV.YEAR:
         game_ids = [game.id.raw for game in games]
     else:
-        game_selection = _get_games_selection(games)
+        game_selection = selectors.get_games_selection(GameStore.from_games(games), team.retrosheet_id)
         if not game_selection:
             return
         game_ids = [game.id.raw for game in game_selection]
 
-    loaded_games = load_season_games(year, team, basic_info_only=False, game_ids=game_ids)
-    player_to_stats = get_player_to_stats(loaded_games, team, year)
+    is_full_season = len(game_ids) == len(games)
+    team_games_results = get_team_games_results(year, team, game_ids, is_full_season=is_full_season)
     display_game(
+        year=year,
         team=team,
-        games=loaded_games,
-        player_to_stats=player_to_stats,
-        player_to_stats_df=get_player_to_stats_df(loaded_games, player_to_stats, team=team, year=year),
+        games=team_games_results.games,
+        players=team_games_results.players,
+        player_to_stats=team_games_results.player_to_stats,
+        player_to_stats_df=team_games_results.player_to_stats_df,
     )
 
 
-def _get_games_selection(all_games: list[Game]) -> list[Game] | None:
-    game_ = selectors.get_game_selection(all_games)
-    if not game_:
-        return None
+def get_team_games_results(
+    year: int, team: Team, game_ids: list[str], is_full_season: bool = False
+) -> TeamGamesResults:
+    """Calculate the stats of the team's games, reusing the results of prior reruns and sessions.
 
-    return all_games if game_ == ENTIRE_SEASON else [game_]
+    The stats are summed from the games' partials, so only the games' basic info is loaded.
+    """
 
+    def load_team_games_results() -> TeamGamesResults:
+        games = load_season_games(year, team, basic_info_only=True, game_ids=game_ids)
+        players, player_to_stats = get_players_and_player_to_stats(
+            games, team, year, explain=False, is_full_season=is_full_season
+        )
+        return TeamGamesResults(
+            games=games,
+            players=players,
+            player_to_stats=player_to_stats,
+            player_to_stats_df=get_player_to_stats_df(players, player_to_stats, team=team, year=year),
+        )
 
-def _get_team_player_to_stats_df(
-    progress: DeltaGenerator,
-    current_iteration: int,
-    total_iterations: int,
-    team: Team,
-    year: int,
-) -> pd.DataFrame:
-    progress.progress(current_iteration / total_iterations, text=f"Loading {year} {team.pretty_name} data...")
-    team_games: list[Game] = load_season_games(year, team)
-    team_player_to_stats = get_player_to_stats(team_games, team, year)
-    df = get_player_to_stats_df(
-        team_games,
-        team_player_to_stats,
-        team=team,
-        year=year,
+    key = (team.retrosheet_id, year, tuple(game_ids))
+    return _TEAM_GAMES_RESULTS_CACHE.get_or_compute(key, load_team_games_results)
+
+
+def _write_team_seasons(team: Team | None, year: int | None, export_format: ExportFormat) -> Path:
+    team_seasons = get_team_seasons(team, year)
+    key = (export_format, tuple((team_season.team.retrosheet_id, team_season.year) for team_season in team_seasons))
+    path = paths.EXPORTS_DIR / get_export_file_name(team, year, export_format)
+    return _TEAM_SEASONS_EXPORT_SINGLE_FLIGHT.do(
+        key, lambda: _calculate_team_seasons(team_seasons, export_format, path)
     )
-    # remove players without ABs as they are not currently useful
-    df = df[df["AB"] > 0]
-    return df
+
+
+def _calculate_team_seasons(team_seasons: list[TeamSeason], export_format: ExportFormat, path: Path) -> Path:
+    progress = st.progress(0, text=f"Loading {team_seasons[0].pretty_name} data...")
+    try:
+        for i, team_season in enumerate(write_team_seasons_stats(team_seasons, {export_format: path})):
+            progress.progress((i + 1) / len(team_seasons), text=f"Loaded {team_season.pretty_name} data")
+    except ValueError:
+        display_error(f"Error in loading data:\n\n{format_exc()}")
+        raise
+
+    progress.empty()
+    return path
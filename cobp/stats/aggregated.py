@@ -1,19 +1,28 @@
 import logging
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Mapping
 
+import numpy as np
 import pandas as pd
 from pyretrosheet.models.game import Game
+from pyretrosheet.models.player import Player
 from pyretrosheet.views import get_team_players
 
+from cobp.env import ENV
 from cobp.models.team import Team
-from cobp.stats.ba import BA, get_player_to_ba
-from cobp.stats.basic import BasicStats, get_player_to_basic_stats
+from cobp.stats.ba import BA
+from cobp.stats.basic import BasicStats
 from cobp.stats.derived import COPS, LOOPS, OPS, SOPS
-from cobp.stats.obp import OBP, get_player_to_cobp, get_player_to_loop, get_player_to_obp, get_player_to_sobp
-from cobp.stats.runs import Runs, get_player_to_runs
-from cobp.stats.sp import SP, get_player_to_csp, get_player_to_lsp, get_player_to_sp, get_player_to_ssp
+from cobp.stats.engine import get_player_to_play_stats
+from cobp.stats.obp import OBP
+from cobp.stats.partials import (
+    get_game_id_to_partials,
+    get_player_to_play_stats_from_partials,
+    get_team_players_from_partials,
+)
+from cobp.stats.runs import Runs, cross_check_player_to_runs
+from cobp.stats.sp import SP
 from cobp.utils import build_team_player
 
 logger = logging.getLogger(__name__)
@@ -32,110 +41,187 @@ class PlayerStats:
     ba: BA
     basic: BasicStats
     runs: Runs
+    # derived stats read their components' counters when valued, so they are only rebuilt if a component is replaced
+    _ops: OPS | None = field(default=None, init=False, repr=False, compare=False)
+    _cops: COPS | None = field(default=None, init=False, repr=False, compare=False)
+    _loops: LOOPS | None = field(default=None, init=False, repr=False, compare=False)
+    _sops: SOPS | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def ops(self) -> OPS:
-        return OPS(obp=self.obp, sp=self.sp)
+        if self._ops is None or self._ops.obp is not self.obp or self._ops.sp is not self.sp:
+            self._ops = OPS(obp=self.obp, sp=self.sp)
+        return self._ops
 
     @property
     def cops(self) -> COPS:
-        return COPS(cobp=self.cobp, csp=self.csp)
+        if self._cops is None or self._cops.cobp is not self.cobp or self._cops.csp is not self.csp:
+            self._cops = COPS(cobp=self.cobp, csp=self.csp)
+        return self._cops
 
     @property
     def loops(self) -> LOOPS:
-        return LOOPS(loop=self.loop, lsp=self.lsp)
+        if self._loops is None or self._loops.loop is not self.loop or self._loops.lsp is not self.lsp:
+            self._loops = LOOPS(loop=self.loop, lsp=self.lsp)
+        return self._loops
 
     @property
     def sops(self) -> SOPS:
-        return SOPS(sobp=self.sobp, ssp=self.ssp)
+        if self._sops is None or self._sops.sobp is not self.sobp or self._sops.ssp is not self.ssp:
+            self._sops = SOPS(sobp=self.sobp, ssp=self.ssp)
+        return self._sops
 
 
 PlayerToStats = dict[str, PlayerStats]
 
 
-def get_player_to_stats(games: list[Game], team: Team, year: int) -> PlayerToStats:
-    players = get_team_players(games, team.retrosheet_id)
-    player_to_obp = get_player_to_obp(games, players)
-    player_to_cobp = get_player_to_cobp(games, players)
-    player_to_sobp = get_player_to_sobp(games, players)
-    player_to_loop = get_player_to_loop(games, players)
-    player_to_ba = get_player_to_ba(games, players)
-    player_to_sp = get_player_to_sp(games, players)
-    player_to_csp = get_player_to_csp(games, players)
-    player_to_lsp = get_player_to_lsp(games, players)
-    player_to_ssp = get_player_to_ssp(games, players)
-    player_to_basic_stats = get_player_to_basic_stats(games, players)
-    player_to_runs = get_player_to_runs(year, team, players, player_to_basic_stats)
+def get_player_to_stats(
+    games: list[Game], team: Team, year: int, explain: bool = True, is_full_season: bool = False
+) -> PlayerToStats:
+    """Get the stats of the team's players in the games (see `get_players_and_player_to_stats`)."""
+    _, player_to_stats = get_players_and_player_to_stats(games, team, year, explain, is_full_season)
+    return player_to_stats
+
+
+def get_players_and_player_to_stats(
+    games: list[Game], team: Team, year: int, explain: bool = True, is_full_season: bool = False
+) -> tuple[list[Player], PlayerToStats]:
+    """Get the team's players in the games, and their stats.
+
+    Unexplained stats are summed from per-game partials, so the games need only their basic info (e.g. their ids).
+    Runs are only cross-checked against Baseball Reference's seasonal stats if the games are the team's full season.
+    """
+    players: list[Player]
+    if explain:
+        players = get_team_players(games, team.retrosheet_id)
+        player_to_play_stats = get_player_to_play_stats(games, players)
+    else:
+        # explanations reference each play, so only unexplained stats can be summed from per-game partials, which are
+        # resolved once for both the players and their stats
+        game_id_to_partials = get_game_id_to_partials(games, team, year)
+        players = get_team_players_from_partials(games, game_id_to_partials)
+        player_to_play_stats = get_player_to_play_stats_from_partials(games, players, game_id_to_partials)
+    if ENV.CROSS_CHECK_RUNS and is_full_season:
+        player_to_runs = {player_id: play_stats.runs for player_id, play_stats in player_to_play_stats.items()}
+        players_with_at_bats = [player for player in players if player_to_play_stats[player.id].basic.at_bats > 0]
+        cross_check_player_to_runs(year, team, players_with_at_bats, player_to_runs)
+
     all_players = [build_team_player(), *players]
-    return {
+    return players, {
         player.id: PlayerStats(
-            obp=player_to_obp.get(player.id) or OBP(),
-            cobp=player_to_cobp.get(player.id) or OBP(),
-            sobp=player_to_sobp.get(player.id) or OBP(),
-            loop=player_to_loop.get(player.id) or OBP(),
-            ba=player_to_ba.get(player.id) or BA(),
-            sp=player_to_sp.get(player.id) or SP(),
-            csp=player_to_csp.get(player.id) or SP(),
-            lsp=player_to_lsp.get(player.id) or SP(),
-            ssp=player_to_ssp.get(player.id) or SP(),
-            basic=player_to_basic_stats.get(player.id) or BasicStats(),
-            runs=player_to_runs.get(player.id) or Runs(),
+            obp=player_to_play_stats[player.id].obp,
+            cobp=player_to_play_stats[player.id].cobp,
+            sobp=player_to_play_stats[player.id].sobp,
+            loop=player_to_play_stats[player.id].loop,
+            ba=player_to_play_stats[player.id].ba,
+            sp=player_to_play_stats[player.id].sp,
+            csp=player_to_play_stats[player.id].csp,
+            lsp=player_to_play_stats[player.id].lsp,
+            ssp=player_to_play_stats[player.id].ssp,
+            basic=player_to_play_stats[player.id].basic,
+            runs=player_to_play_stats[player.id].runs,
         )
         for player in all_players
     }
 
 
+_COUNTER_COLUMNS = ["G", "AB", "H", "W", "HBP", "SF", "S", "D", "T", "HR", "R", "RBI"]
+_RATE_COLUMNS = ["OBP", "COBP", "LOOP", "SOBP", "BA", "SP", "CSP", "LSP", "SSP"]
+_OPS_COLUMN_TO_OBP_AND_SP_COLUMNS = {
+    "OPS": ("OBP", "SP"),
+    "COPS": ("COBP", "CSP"),
+    "LOOPS": ("LOOP", "LSP"),
+    "SOPS": ("SOBP", "SSP"),
+}
+_RATE_COLUMN_ORDER = [*_RATE_COLUMNS, *_OPS_COLUMN_TO_OBP_AND_SP_COLUMNS]
+
+
 def get_player_to_stats_df(
-    games: list[Game],
+    players: list[Player],
     player_to_stats: PlayerToStats,
     team: Team,
     year: int,
 ) -> pd.DataFrame:
-    players = [build_team_player(), *get_team_players(games, team.retrosheet_id)]
-    player_id_to_player = {p.id: p for p in players}
-    data: Mapping[str, list[str | float | int]] = defaultdict(list)
-    for player_id, stats in player_to_stats.items():
-        player = player_id_to_player[player_id]
-        data["Team"].append(team.name)
-        data["Year"].append(year)
-        data["Player"].append(player.name)
-        data["ID"].append(player.name)
-        data["G"].append(stats.basic.games)
-        data["AB"].append(stats.basic.at_bats)
-        data["H"].append(stats.basic.hits)
-        data["W"].append(stats.basic.walks)
-        data["HBP"].append(stats.basic.hit_by_pitches)
-        data["SF"].append(stats.basic.sacrifice_flys)
-        data["S"].append(stats.basic.singles)
-        data["D"].append(stats.basic.doubles)
-        data["T"].append(stats.basic.triples)
-        data["HR"].append(stats.basic.home_runs)
-        data["R"].append(stats.runs.runs)
-        data["RBI"].append(stats.runs.rbis)
-        data["OBP"].append(stats.obp.value)
-        data["COBP"].append(stats.cobp.value)
-        data["LOOP"].append(stats.loop.value)
-        data["SOBP"].append(stats.sobp.value)
-        data["BA"].append(stats.ba.value)
-        data["SP"].append(stats.sp.value)
-        data["CSP"].append(stats.csp.value)
-        data["LSP"].append(stats.lsp.value)
-        data["SSP"].append(stats.ssp.value)
-        data["OPS"].append(stats.ops.value)
-        data["COPS"].append(stats.cops.value)
-        data["LOOPS"].append(stats.loops.value)
-        data["SOPS"].append(stats.sops.value)
-
-    return pd.DataFrame(data=data)
+    """Build a table of the players' stats, with compact dtypes (int32 counters and float32 rate stats)."""
+    player_id_to_player = {p.id: p for p in [build_team_player(), *players]}
+    player_names = [player_id_to_player[player_id].name for player_id in player_to_stats]
+    # one row of counters per player, with the numerator and denominator of each rate stat
+    counts = np.array([_get_counters(stats) for stats in player_to_stats.values()], dtype=np.int64).reshape(
+        len(player_to_stats), len(_COUNTER_COLUMNS) + 2 * len(_RATE_COLUMNS)
+    )
+    counters = counts[:, : len(_COUNTER_COLUMNS)]
+    rate_counts = counts[:, len(_COUNTER_COLUMNS) :]
+    rates = {
+        column: _divide(rate_counts[:, 2 * i], rate_counts[:, 2 * i + 1]) for i, column in enumerate(_RATE_COLUMNS)
+    }
+    for ops_column, (obp_column, sp_column) in _OPS_COLUMN_TO_OBP_AND_SP_COLUMNS.items():
+        rates[ops_column] = rates[obp_column] + rates[sp_column]
+
+    return pd.DataFrame(
+        {
+            "Team": pd.Categorical([team.name] * len(player_names)),
+            "Year": np.full(len(player_names), year, dtype=np.int16),
+            "Player": pd.Categorical(player_names),
+            "ID": pd.Categorical(player_names),
+            **{column: counters[:, i].astype(np.int32) for i, column in enumerate(_COUNTER_COLUMNS)},
+            **{column: rates[column].astype(np.float32) for column in _RATE_COLUMN_ORDER},
+        }
+    )
+
+
+def _get_counters(stats: PlayerStats) -> tuple[int, ...]:
+    """Get the player's counters, in the order of `_COUNTER_COLUMNS` then each of `_RATE_COLUMNS`' fraction."""
+    basic = stats.basic
+    return (
+        basic.games,
+        basic.at_bats,
+        basic.hits,
+        basic.walks,
+        basic.hit_by_pitches,
+        basic.sacrifice_flys,
+        basic.singles,
+        basic.doubles,
+        basic.triples,
+        basic.home_runs,
+        stats.runs.runs,
+        stats.runs.rbis,
+        stats.obp.numerator,
+        stats.obp.denominator,
+        stats.cobp.numerator,
+        stats.cobp.denominator,
+        stats.loop.numerator,
+        stats.loop.denominator,
+        stats.sobp.numerator,
+        stats.sobp.denominator,
+        stats.ba.hits,
+        stats.ba.at_bats,
+        stats.sp.numerator,
+        stats.sp.denominator,
+        stats.csp.numerator,
+        stats.csp.denominator,
+        stats.lsp.numerator,
+        stats.lsp.denominator,
+        stats.ssp.numerator,
+        stats.ssp.denominator,
+    )
+
+
+def _divide(numerators: np.ndarray, denominators: np.ndarray) -> np.ndarray:
+    """Divide, treating division by zero as 0.0 (as the stat classes do)."""
+    return np.divide(
+        numerators,
+        denominators,
+        out=np.zeros(len(numerators), dtype=np.float64),
+        where=denominators != 0,
+    )
 
 
 def get_player_to_game_stat_df(
-    games: list[Game], team: Team, player_to_stats: PlayerToStats, stat_name: str
+    games: list[Game], players: list[Player], player_to_stats: PlayerToStats, stat_name: str
 ) -> pd.DataFrame:
-    players = [build_team_player(), get_team_players(games, team.retrosheet_id)]
-    player_id_to_player = {p.id: p for p in players}
+    player_id_to_player = {p.id: p for p in [build_team_player(), *players]}
     data: Mapping[str, list[str | float]] = defaultdict(list)
-    for game_id, player_game_stat in _get_game_to_player_stat(games, team, player_to_stats, stat_name).items():
+    for game_id, player_game_stat in _get_game_to_player_stat(games, players, player_to_stats, stat_name).items():
         data["Game"].append(game_id)
         for player_id, game_stat in player_game_stat.items():
             player = player_id_to_player[player_id]
@@ -145,20 +231,19 @@ def get_player_to_game_stat_df(
 
 
 def _get_game_to_player_stat(
-    games: list[Game], team: Team, player_to_stats: PlayerToStats, stat_name: str
+    games: list[Game], players: list[Player], player_to_stats: PlayerToStats, stat_name: str
 ) -> Mapping[str, Mapping[str, float]]:
-    players = get_team_players(games, team.retrosheet_id)
-    player_id_to_player = {p.id for p in players}
     game_to_player_stat: Mapping[str, Mapping[str, float]] = defaultdict(dict)
-    for player_id, _ in player_id_to_player.items():
+    for player_id in dict.fromkeys(p.id for p in players):
         if player_to_stats[player_id].basic.at_bats == 0:
             continue
 
         player_stats = player_to_stats[player_id]
         player_stat = getattr(player_stats, stat_name)
         for game in games:
-            player_game_stat = player_stat.game_to_stat.get(game.id)
+            # each game's stat is looked up by its ordinal, rather than building every game's stat per game
+            player_game_stat = player_stat.get_game_stat(game.id.raw)
             player_game_stat_value = player_game_stat.value if player_game_stat else None
-            game_to_player_stat[game.id][player_id] = player_game_stat_value  # type: ignore
+            game_to_player_stat[game.id.raw][player_id] = player_game_stat_value  # type: ignore
 
     return game_to_player_stat
@@ -2,19 +2,31 @@
 from dataclasses import dataclass
 
 from pyretrosheet.models.game import Game
+from pyretrosheet.models.play import Play
 from pyretrosheet.models.player import Player
 
+from cobp.game_index import AT_BAT, HIT, get_game_index
 from cobp.stats.stat import Stat
 from cobp.utils import TEAM_PLAYER_ID, get_players_plays
 
 
-@dataclass
+@dataclass(slots=True)
 class BA(Stat):
     hits: int = 0
     at_bats: int = 0
 
-    def add_arithmetic(self) -> None:
-        self.explanation.append(f"*H={self.hits} / AB={self.at_bats} == {round(self.value, 3)}*")
+    def __add__(self, other: "BA") -> "BA":
+        added = BA(hits=self.hits + other.hits, at_bats=self.at_bats + other.at_bats)
+        return self._with_added_explanations(added, other)
+
+    def __iadd__(self, other: "BA") -> "BA":
+        self.hits += other.hits
+        self.at_bats += other.at_bats
+        self._add_explanations(other)
+        return self
+
+    def get_arithmetic_explanation(self) -> list[str]:
+        return [f"*H={self.hits} / AB={self.at_bats} == {round(self.value, 3)}*"]
 
     @property
     def value(self) -> float:
@@ -29,32 +41,36 @@ PlayerToBA = dict[str, BA]
 
 def get_player_to_ba(games: list[Game], players: list[Player]) -> PlayerToBA:
     player_to_ba = {player.id: _get_ba(games, player) for player in players}
-    player_to_ba[TEAM_PLAYER_ID] = _get_teams_ba(player_to_ba)
+    player_to_ba[TEAM_PLAYER_ID] = get_teams_ba(player_to_ba)
     return player_to_ba
 
 
 def _get_ba(games: list[Game], player: Player) -> BA:
     ba = BA()
-    for _, plays in get_players_plays(games, player):
+    for game, plays in get_players_plays(games, player):
+        game_index = get_game_index(game)
         for play in plays:
-            if not play.is_hit() and not play.is_an_at_bat():
-                ba.add_play(play, resultant="N/A", color="red")
-                continue
-
-            if play.is_hit():
-                ba.hits += 1
-            if play.is_an_at_bat():
-                ba.at_bats += 1
-
-            ba.add_play(play)
+            add_ba_play(ba, play, game_index.get_play_mask(play))
 
     ba.add_arithmetic()
     return ba
 
 
-def _get_teams_ba(player_to_ba: PlayerToBA) -> BA:
-    team_ba = BA()
+def add_ba_play(ba: BA, play: Play, play_mask: int) -> None:
+    if not play_mask & (HIT | AT_BAT):
+        ba.add_play(play, resultant="N/A", color="red")
+        return
+
+    if play_mask & HIT:
+        ba.hits += 1
+    if play_mask & AT_BAT:
+        ba.at_bats += 1
+
+    ba.add_play(play)
+
+
+def get_teams_ba(player_to_ba: PlayerToBA) -> BA:
+    team_ba = BA(explain=False)
     for ba in player_to_ba.values():
-        team_ba.hits += ba.hits
-        team_ba.at_bats += ba.at_bats
+        team_ba += ba
     return team_ba
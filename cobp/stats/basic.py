@@ -3,10 +3,22 @@ from dataclasses import dataclass
 from pyretrosheet.models.game import Game
 from pyretrosheet.models.player import Player
 
+from cobp.game_index import (
+    AT_BAT,
+    DOUBLE,
+    HIT,
+    HIT_BY_PITCH,
+    HOME_RUN,
+    SACRIFICE_FLY,
+    SINGLE,
+    TRIPLE,
+    WALK,
+    get_game_index,
+)
 from cobp.utils import TEAM_PLAYER_ID, get_players_plays
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicStats:
     games: int = 0
     at_bats: int = 0
@@ -19,58 +31,66 @@ class BasicStats:
     triples: int = 0
     home_runs: int = 0
 
+    def __add__(self, other: "BasicStats") -> "BasicStats":
+        return BasicStats(
+            games=self.games + other.games,
+            at_bats=self.at_bats + other.at_bats,
+            hits=self.hits + other.hits,
+            walks=self.walks + other.walks,
+            hit_by_pitches=self.hit_by_pitches + other.hit_by_pitches,
+            sacrifice_flys=self.sacrifice_flys + other.sacrifice_flys,
+            singles=self.singles + other.singles,
+            doubles=self.doubles + other.doubles,
+            triples=self.triples + other.triples,
+            home_runs=self.home_runs + other.home_runs,
+        )
+
 
 PlayerToBasicStats = dict[str, BasicStats]
 
 
 def get_player_to_basic_stats(games: list[Game], players: list[Player]) -> PlayerToBasicStats:
     player_to_basic_stats = {player.id: _get_players_basic_stats(games, player) for player in players}
-    player_to_basic_stats[TEAM_PLAYER_ID] = _get_teams_basic_stats(player_to_basic_stats)
+    player_to_basic_stats[TEAM_PLAYER_ID] = get_teams_basic_stats(player_to_basic_stats)
     player_to_basic_stats[TEAM_PLAYER_ID].games = len(games)
     return player_to_basic_stats
 
 
 def _get_players_basic_stats(games: list[Game], player: Player) -> BasicStats:
     basic_stats = BasicStats()
-    for _, plays in get_players_plays(games, player):
+    for game, plays in get_players_plays(games, player):
         if not plays:
             continue
 
         basic_stats.games += 1
+        game_index = get_game_index(game)
         for play in plays:
-            if play.is_an_at_bat():
-                basic_stats.at_bats += 1
-            if play.is_hit():
-                basic_stats.hits += 1
-            if play.is_walk():
-                basic_stats.walks += 1
-            if play.is_hit_by_pitch():
-                basic_stats.hit_by_pitches += 1
-            if play.is_sacrifice_fly():
-                basic_stats.sacrifice_flys += 1
-            if play.is_single():
-                basic_stats.singles += 1
-            if play.is_double():
-                basic_stats.doubles += 1
-            if play.is_triple():
-                basic_stats.triples += 1
-            if play.is_home_run():
-                basic_stats.home_runs += 1
+            add_basic_play(basic_stats, game_index.get_play_mask(play))
 
     return basic_stats
 
 
-def _get_teams_basic_stats(player_to_basic_stats: PlayerToBasicStats) -> BasicStats:
-    team_basic_stats = BasicStats()
-    for basic_stat in player_to_basic_stats.values():
-        team_basic_stats.at_bats += basic_stat.at_bats
-        team_basic_stats.hits += basic_stat.hits
-        team_basic_stats.walks += basic_stat.walks
-        team_basic_stats.hit_by_pitches += basic_stat.hit_by_pitches
-        team_basic_stats.sacrifice_flys += basic_stat.sacrifice_flys
-        team_basic_stats.singles += basic_stat.singles
-        team_basic_stats.doubles += basic_stat.doubles
-        team_basic_stats.triples += basic_stat.triples
-        team_basic_stats.home_runs += basic_stat.home_runs
-
-    return team_basic_stats
+def add_basic_play(basic_stats: BasicStats, play_mask: int) -> None:
+    if play_mask & AT_BAT:
+        basic_stats.at_bats += 1
+    if play_mask & HIT:
+        basic_stats.hits += 1
+    if play_mask & WALK:
+        basic_stats.walks += 1
+    if play_mask & HIT_BY_PITCH:
+        basic_stats.hit_by_pitches += 1
+    if play_mask & SACRIFICE_FLY:
+        basic_stats.sacrifice_flys += 1
+    if play_mask & SINGLE:
+        basic_stats.singles += 1
+    if play_mask & DOUBLE:
+        basic_stats.doubles += 1
+    if play_mask & TRIPLE:
+        basic_stats.triples += 1
+    if play_mask & HOME_RUN:
+        basic_stats.home_runs += 1
+
+
+def get_teams_basic_stats(player_to_basic_stats: PlayerToBasicStats) -> BasicStats:
+    """Sum the players' basic stats (the team's games are not the sum of its players' games, so are left to callers)."""
+    return sum(player_to_basic_stats.values(), BasicStats())
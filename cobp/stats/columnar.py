@@ -0,0 +1,220 @@
+"""Calculate stats with vectorized operations over a table of plate appearances.
+
+Games are converted to a table with one row per play, holding the play's location in the game and flags for each
+event classification. Stats are then calculated for any set of players with NumPy/pandas group-bys rather than by
+walking Play objects, e.g. each batter's per-game counters from which `cobp.stats.partials` builds a season's
+partials.
+"""
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from pyretrosheet.models.game import Game
+
+from cobp.game_index import (
+    AT_BAT,
+    DOUBLE,
+    GETS_ON_BASE,
+    HIT,
+    HIT_BY_PITCH,
+    HOME_RUN,
+    SACRIFICE_FLY,
+    SINGLE,
+    TRIPLE,
+    WALK,
+    get_game_index,
+)
+from cobp.utils import TEAM_PLAYER_ID
+
+# flag columns, from the bits of each play's classification mask
+PLAY_FLAGS: dict[str, int] = {
+    "is_at_bat": AT_BAT,
+    "is_hit": HIT,
+    "is_single": SINGLE,
+    "is_double": DOUBLE,
+    "is_triple": TRIPLE,
+    "is_home_run": HOME_RUN,
+    "is_walk": WALK,
+    "is_hit_by_pitch": HIT_BY_PITCH,
+    "is_sacrifice_fly": SACRIFICE_FLY,
+    "gets_on_base": GETS_ON_BASE,
+}
+PLAY_CONTEXT_COLUMNS = ["position", "on_bases_before", "on_bases_after", "half_inning_on_bases"]
+BASIC_COLUMNS = ["AB", "H", "W", "HBP", "SF", "S", "D", "T", "HR"]
+# prefix of each conditional stat's name (e.g. COBP, CSP) to the plays meeting its condition
+CONDITION_PREFIXES = ["", "C", "L", "S"]
+# counters of each OBP and SP (e.g. 'COBP_W'), in the order of the stats' per-game counters
+OBP_COUNTERS = ["H", "W", "HBP", "AB", "SF", "PA"]
+SP_COUNTERS = ["S", "D", "T", "HR", "AB"]
+
+
+def get_plays_df(games: list[Game]) -> pd.DataFrame:
+    """Get a table of the games' plays, one row per play in chronological order."""
+    columns: dict[str, list[str | int | bool]] = defaultdict(list)
+    for game in games:
+        game_index = get_game_index(game)
+        for play in game_index.plays:
+            play_context = game_index.play_id_to_context[id(play)]
+            columns["game_id"].append(game.id.raw)
+            columns["batter_id"].append(play.batter_id)
+            columns["team_location"].append(play.team_location.value)
+            columns["inning"].append(play.inning)
+            for context_column in PLAY_CONTEXT_COLUMNS:
+                columns[context_column].append(getattr(play_context, context_column))
+            columns["mask"].append(game_index.play_id_to_mask[id(play)])
+            columns["rbis"].append(game_index.runs.play_id_to_rbis.get(id(play), 0))
+
+    masks = np.array(columns["mask"], dtype=np.int32)
+    return pd.DataFrame(
+        {
+            "game_id": pd.Categorical(columns["game_id"]),
+            "batter_id": pd.Categorical(columns["batter_id"]),
+            "team_location": np.array(columns["team_location"], dtype=np.int8),
+            "inning": np.array(columns["inning"], dtype=np.int16),
+            **{column: np.array(columns[column], dtype=np.int16) for column in PLAY_CONTEXT_COLUMNS},
+            "rbis": np.array(columns["rbis"], dtype=np.int16),
+            **{column: (masks & bit) != 0 for column, bit in PLAY_FLAGS.items()},
+        }
+    )
+
+
+def get_player_stats_df(plays_df: pd.DataFrame, player_ids: list[str], num_games: int) -> pd.DataFrame:
+    """Calculate basic, BA, OBP and SP stats (and their conditional variants) for players and their team.
+
+    Args:
+        plays_df: table of plays, from `get_plays_df`
+        player_ids: the ids of the team's players
+        num_games: the number of games the team played
+
+    Returns:
+        stats indexed by player id, with the team's stats first (indexed by `TEAM_PLAYER_ID`)
+    """
+    plays_df = plays_df[plays_df["batter_id"].isin(player_ids)]
+    counts_df = _get_play_counts_df(plays_df)
+    counts_df["batter_id"] = plays_df["batter_id"].astype(str).to_numpy()
+    player_counts_df = counts_df.groupby("batter_id", sort=False).sum()
+    player_counts_df["G"] = plays_df.groupby("batter_id", observed=True)["game_id"].nunique()
+    team_counts = player_counts_df.sum()
+    team_counts["G"] = num_games
+    stats_df = pd.concat([team_counts.to_frame(TEAM_PLAYER_ID).T, player_counts_df])
+    stats_df = stats_df.reindex([TEAM_PLAYER_ID, *player_ids], fill_value=0).astype(np.int64)
+    for prefix in CONDITION_PREFIXES:
+        obp_name = "LOOP" if prefix == "L" else f"{prefix}OBP"
+        sp_name = f"{prefix}SP"
+        ops_name = "LOOPS" if prefix == "L" else f"{prefix}OPS"
+        obp_hits, obp_walks, obp_hit_by_pitches, obp_at_bats, obp_sacrifice_flys, _ = (
+            stats_df[f"{prefix}OBP_{counter}"] for counter in OBP_COUNTERS
+        )
+        singles, doubles, triples, home_runs, sp_at_bats = (
+            stats_df[f"{prefix}SP_{counter}"] for counter in SP_COUNTERS
+        )
+        stats_df[obp_name] = _divide(
+            obp_hits + obp_walks + obp_hit_by_pitches,
+            obp_at_bats + obp_walks + obp_hit_by_pitches + obp_sacrifice_flys,
+        )
+        stats_df[sp_name] = _divide(singles + 2 * doubles + 3 * triples + 4 * home_runs, sp_at_bats)
+        stats_df[ops_name] = stats_df[obp_name] + stats_df[sp_name]
+
+    stats_df["BA"] = _divide(stats_df["H"], stats_df["AB"])
+    return stats_df[
+        [
+            "G",
+            *BASIC_COLUMNS,
+            "OBP",
+            "COBP",
+            "LOOP",
+            "SOBP",
+            "BA",
+            "SP",
+            "CSP",
+            "LSP",
+            "SSP",
+            "OPS",
+            "COPS",
+            "LOOPS",
+            "SOPS",
+        ]
+    ]
+
+
+def get_batter_game_counts_df(plays_df: pd.DataFrame) -> pd.DataFrame:
+    """Sum each batter's counters (as of `get_player_stats_df`, with RBIs) in each game they batted in.
+
+    Args:
+        plays_df: table of plays, from `get_plays_df`
+
+    Returns:
+        counters indexed by game id and batter id, in order of the batter's first play in the game, where 'G' is 1
+    """
+    counts_df = _get_play_counts_df(plays_df)
+    counts_df["game_id"] = plays_df["game_id"].astype(str).to_numpy()
+    counts_df["batter_id"] = plays_df["batter_id"].astype(str).to_numpy()
+    game_counts_df = counts_df.groupby(["game_id", "batter_id"], sort=False).sum()
+    game_counts_df.insert(0, "G", 1)
+    return game_counts_df
+
+
+def _get_play_counts_df(plays_df: pd.DataFrame) -> pd.DataFrame:
+    at_bats = plays_df["is_at_bat"].to_numpy()
+    hits = plays_df["is_hit"].to_numpy()
+    walks = plays_df["is_walk"].to_numpy()
+    hit_by_pitches = plays_df["is_hit_by_pitch"].to_numpy()
+    sacrifice_flys = plays_df["is_sacrifice_fly"].to_numpy()
+    singles = plays_df["is_single"].to_numpy()
+    doubles = plays_df["is_double"].to_numpy()
+    triples = plays_df["is_triple"].to_numpy()
+    home_runs = plays_df["is_home_run"].to_numpy()
+    counts = {
+        "AB": at_bats,
+        "H": hits,
+        "W": walks,
+        "HBP": hit_by_pitches,
+        "SF": sacrifice_flys,
+        "S": singles,
+        "D": doubles,
+        "T": triples,
+        "HR": home_runs,
+        "RBI": plays_df["rbis"].to_numpy(),
+    }
+
+    # OBP counts a play's hit, walk, hit by pitch or sacrifice fly, in that precedence, at most once
+    obp_walks = walks & ~hits
+    obp_hit_by_pitches = hit_by_pitches & ~hits & ~walks
+    obp_sacrifice_flys = sacrifice_flys & ~hits & ~walks & ~hit_by_pitches
+    # SP likewise counts a play's single, double, triple or home run at most once
+    sp_doubles = doubles & ~singles
+    sp_triples = triples & ~singles & ~doubles
+    sp_home_runs = home_runs & ~singles & ~doubles & ~triples
+    position = plays_df["position"].to_numpy()
+    on_bases_before = plays_df["on_bases_before"].to_numpy()
+    on_bases_after = plays_df["on_bases_after"].to_numpy()
+    half_inning_on_bases = plays_df["half_inning_on_bases"].to_numpy()
+    prefix_to_condition = {
+        "": np.ones(len(plays_df), dtype=bool),
+        # another batter gets on base in the half-inning
+        "C": (on_bases_before + on_bases_after) > 0,
+        # leadoff batter of a half-inning with an on-base
+        "L": (position == 0) & (half_inning_on_bases > 0),
+        # a batter got on base prior to the play in the half-inning, excluding leadoff batters
+        "S": (position > 0) & (on_bases_before > 0),
+    }
+    for prefix, condition in prefix_to_condition.items():
+        obp_counts = [hits, obp_walks, obp_hit_by_pitches, at_bats, obp_sacrifice_flys, np.ones_like(condition)]
+        for counter, obp_counter_counts in zip(OBP_COUNTERS, obp_counts):
+            counts[f"{prefix}OBP_{counter}"] = obp_counter_counts & condition
+        sp_counts = [singles, sp_doubles, sp_triples, sp_home_runs, at_bats]
+        for counter, sp_counter_counts in zip(SP_COUNTERS, sp_counts):
+            counts[f"{prefix}SP_{counter}"] = sp_counter_counts & condition
+
+    return pd.DataFrame({column: np.asarray(values, dtype=np.int64) for column, values in counts.items()})
+
+
+def _divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Divide, treating division by zero as 0.0 (as the stat classes do)."""
+    values = np.divide(
+        numerator.to_numpy(dtype=np.float64),
+        denominator.to_numpy(dtype=np.float64),
+        out=np.zeros(len(numerator), dtype=np.float64),
+        where=denominator.to_numpy() != 0,
+    )
+    return pd.Series(values, index=numerator.index)
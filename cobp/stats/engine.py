@@ -0,0 +1,157 @@
+"""Calculate all play-based stats in a single pass over game data.
+
+Each play is visited exactly once and every stat (basic, BA, OBP, SP and their conditional variants, runs and
+RBIs) is updated from it, rather than each stat separately re-traversing all games for all players.
+"""
+from dataclasses import dataclass, field
+
+from pyretrosheet.models.game import Game
+from pyretrosheet.models.player import Player
+
+from cobp.game_index import get_game_index
+from cobp.stats.ba import BA, add_ba_play
+from cobp.stats.basic import BasicStats, add_basic_play
+from cobp.stats.conditions import is_conditional_play, is_leadoff_play, is_sequential_play
+from cobp.stats.obp import OBP, add_obp_play
+from cobp.stats.runs import Runs
+from cobp.stats.sp import SP, add_sp_play
+from cobp.stats.stat import GameOrdinals
+from cobp.utils import TEAM_PLAYER_ID
+
+
+@dataclass(slots=True)
+class PlayStats:
+    """All stats which are calculated from a player's plays."""
+
+    obp: OBP = field(default_factory=OBP)
+    cobp: OBP = field(default_factory=OBP)
+    sobp: OBP = field(default_factory=OBP)
+    loop: OBP = field(default_factory=OBP)
+    sp: SP = field(default_factory=SP)
+    csp: SP = field(default_factory=SP)
+    lsp: SP = field(default_factory=SP)
+    ssp: SP = field(default_factory=SP)
+    ba: BA = field(default_factory=BA)
+    basic: BasicStats = field(default_factory=BasicStats)
+    runs: Runs = field(default_factory=Runs)
+
+    def __add__(self, other: "PlayStats") -> "PlayStats":
+        return PlayStats(
+            obp=self.obp + other.obp,
+            cobp=self.cobp + other.cobp,
+            sobp=self.sobp + other.sobp,
+            loop=self.loop + other.loop,
+            sp=self.sp + other.sp,
+            csp=self.csp + other.csp,
+            lsp=self.lsp + other.lsp,
+            ssp=self.ssp + other.ssp,
+            ba=self.ba + other.ba,
+            basic=self.basic + other.basic,
+            runs=self.runs + other.runs,
+        )
+
+    def __iadd__(self, other: "PlayStats") -> "PlayStats":
+        """Add the other's stats in place, which (unlike `+`) does not copy explanations or per-game counts."""
+        self.obp += other.obp
+        self.cobp += other.cobp
+        self.sobp += other.sobp
+        self.loop += other.loop
+        self.sp += other.sp
+        self.csp += other.csp
+        self.lsp += other.lsp
+        self.ssp += other.ssp
+        self.ba += other.ba
+        self.basic += other.basic
+        self.runs += other.runs
+        return self
+
+
+PlayerToPlayStats = dict[str, PlayStats]
+
+
+def get_player_to_play_stats(games: list[Game], players: list[Player], explain: bool = True) -> PlayerToPlayStats:
+    """Calculate each player's (and the team's) play stats, recording explanations of the stats when `explain`."""
+    return get_player_to_play_stats_by_ids(games, [player.id for player in players], explain=explain)
+
+
+def get_player_to_play_stats_by_ids(
+    games: list[Game], player_ids: list[str], explain: bool = True
+) -> PlayerToPlayStats:
+    """Calculate play stats of players by id (e.g. for batters who are not in any of the games' lineups)."""
+    game_ordinals = GameOrdinals.from_games(games)
+    player_to_play_stats = {player_id: _build_play_stats(game_ordinals, explain) for player_id in player_ids}
+    for game in games:
+        _add_game(game, player_to_play_stats)
+
+    for play_stats in player_to_play_stats.values():
+        for stat in [*_get_obps(play_stats), *_get_sps(play_stats), play_stats.ba]:
+            stat.add_arithmetic()
+
+    player_to_play_stats[TEAM_PLAYER_ID] = get_teams_play_stats(player_to_play_stats, games)
+    return player_to_play_stats
+
+
+def _build_play_stats(game_ordinals: GameOrdinals, explain: bool) -> PlayStats:
+    return PlayStats(
+        obp=OBP.for_games(game_ordinals, explain=explain),
+        cobp=OBP.for_games(game_ordinals, explain=explain),
+        sobp=OBP.for_games(game_ordinals, explain=explain),
+        loop=OBP.for_games(game_ordinals, explain=explain),
+        sp=SP.for_games(game_ordinals, explain=explain),
+        csp=SP.for_games(game_ordinals, explain=explain),
+        lsp=SP.for_games(game_ordinals, explain=explain),
+        ssp=SP.for_games(game_ordinals, explain=explain),
+        ba=BA(explain=explain),
+    )
+
+
+def _add_game(game: Game, player_to_play_stats: PlayerToPlayStats) -> None:
+    players_in_game = set()
+    game_index = get_game_index(game)
+    for play in game_index.plays:
+        play_stats = player_to_play_stats.get(play.batter_id)
+        if not play_stats:
+            continue
+
+        players_in_game.add(play.batter_id)
+        play_mask = game_index.play_id_to_mask[id(play)]
+        cobp_condition = is_conditional_play(game, play)
+        sobp_condition = is_sequential_play(game, play)
+        loop_condition = is_leadoff_play(game, play)
+        add_obp_play(play_stats.obp, game, play, play_mask, None)
+        add_obp_play(play_stats.cobp, game, play, play_mask, cobp_condition)
+        add_obp_play(play_stats.sobp, game, play, play_mask, sobp_condition)
+        add_obp_play(play_stats.loop, game, play, play_mask, loop_condition)
+        add_sp_play(play_stats.sp, game, play, play_mask, None)
+        add_sp_play(play_stats.csp, game, play, play_mask, cobp_condition)
+        add_sp_play(play_stats.lsp, game, play, play_mask, loop_condition)
+        add_sp_play(play_stats.ssp, game, play, play_mask, sobp_condition)
+        add_ba_play(play_stats.ba, play, play_mask)
+        add_basic_play(play_stats.basic, play_mask)
+        play_stats.runs.rbis += game_index.runs.play_id_to_rbis.get(id(play), 0)
+
+    for player_id in players_in_game:
+        player_to_play_stats[player_id].basic.games += 1
+
+    # runners (e.g. pinch runners) may score without batting in the game
+    for runner_id, runs in game_index.runs.runner_to_runs.items():
+        if runner_play_stats := player_to_play_stats.get(runner_id):
+            runner_play_stats.runs.runs += runs
+
+
+def _get_obps(play_stats: PlayStats) -> tuple[OBP, OBP, OBP, OBP]:
+    return play_stats.obp, play_stats.cobp, play_stats.sobp, play_stats.loop
+
+
+def _get_sps(play_stats: PlayStats) -> tuple[SP, SP, SP, SP]:
+    return play_stats.sp, play_stats.csp, play_stats.lsp, play_stats.ssp
+
+
+def get_teams_play_stats(player_to_play_stats: PlayerToPlayStats, games: list[Game]) -> PlayStats:
+    # summed in place, as summing with `+` copies every per-game count once per player, into stats that are not
+    # explained, as the team's explanation would otherwise collect every player's explained plays
+    team_play_stats = _build_play_stats(GameOrdinals.from_games(games), explain=False)
+    for play_stats in player_to_play_stats.values():
+        team_play_stats += play_stats
+    team_play_stats.basic.games = len(games)
+    return team_play_stats
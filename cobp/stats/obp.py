@@ -1,28 +1,85 @@
 """Calculate OBP and COBP stats from game data."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from pyretrosheet.models.game import Game
 from pyretrosheet.models.play import Play
 from pyretrosheet.models.player import Player
 
-from cobp.stats.conditions import ConditionFunction, is_conditional_play, is_leadoff_play, is_sequential_play
-from cobp.stats.stat import Stat
+from cobp.game_index import AT_BAT, HIT, HIT_BY_PITCH, SACRIFICE_FLY, WALK, get_game_index
+from cobp.stats.conditions import Condition, ConditionFunction, is_conditional_play, is_leadoff_play, is_sequential_play
+from cobp.stats.stat import GameCounts, GameOrdinals, GameStat
 from cobp.utils import TEAM_PLAYER_ID, get_players_plays
 
+# per-game counters, the last being the number of plays the OBP counted in the game
+_HITS, _WALKS, _HIT_BY_PITCHES, _AT_BATS, _SACRIFICE_FLYS, _PLAYS = range(6)
 
-@dataclass
-class OBP(Stat):
+
+@dataclass(slots=True)
+class OBP(GameStat):
     hits: int = 0
     walks: int = 0
     hit_by_pitches: int = 0
     at_bats: int = 0
     sacrifice_flys: int = 0
-    game_to_stat: dict[str, "OBP"] = field(default_factory=dict)
+    num_game_counters = 6
+
+    @classmethod
+    def from_game_counts(cls, game_counts: GameCounts) -> "OBP":
+        """Build an (unexplained) OBP from its per-game counts."""
+        hits, walks, hit_by_pitches, at_bats, sacrifice_flys, _ = game_counts.to_numpy().sum(axis=0).tolist()
+        return cls(
+            explain=False,
+            hits=hits,
+            walks=walks,
+            hit_by_pitches=hit_by_pitches,
+            at_bats=at_bats,
+            sacrifice_flys=sacrifice_flys,
+            game_counts=game_counts,
+        )
 
-    def add_arithmetic(self) -> None:
+    @property
+    def game_to_stat(self) -> dict[str, "OBP"]:
+        """Each game's OBP, for the games in which the OBP counted a play."""
+        if self.game_counts is None:
+            return {}
+
+        return {
+            game_id: _get_game_obp(counts) for game_id, counts in self.game_counts.iter_game_counts() if counts[_PLAYS]
+        }
+
+    def get_game_stat(self, game_id: str) -> "OBP | None":
+        """A game's OBP, if the OBP counted a play in the game (as in `game_to_stat`, without building every game's)."""
+        counts = self.game_counts.get_game_counts(game_id) if self.game_counts is not None else None
+        if not counts or not counts[_PLAYS]:
+            return None
+
+        return _get_game_obp(counts)
+
+    def __add__(self, other: "OBP") -> "OBP":
+        added = OBP(
+            hits=self.hits + other.hits,
+            walks=self.walks + other.walks,
+            hit_by_pitches=self.hit_by_pitches + other.hit_by_pitches,
+            at_bats=self.at_bats + other.at_bats,
+            sacrifice_flys=self.sacrifice_flys + other.sacrifice_flys,
+            game_counts=self._add_game_counts(other),
+        )
+        return self._with_added_explanations(added, other)
+
+    def __iadd__(self, other: "OBP") -> "OBP":
+        self.hits += other.hits
+        self.walks += other.walks
+        self.hit_by_pitches += other.hit_by_pitches
+        self.at_bats += other.at_bats
+        self.sacrifice_flys += other.sacrifice_flys
+        self._add_game_counts_in_place(other)
+        self._add_explanations(other)
+        return self
+
+    def get_arithmetic_explanation(self) -> list[str]:
         numerator = f"*H={self.hits} + W={self.walks} + HBP={self.hit_by_pitches} == {self.numerator}*"
         denominator = f"*AB={self.at_bats} + W={self.walks} + HBP={self.hit_by_pitches} + SF={self.sacrifice_flys} == {self.denominator}*"  # noqa: E501
-        self.explanation.extend([numerator, denominator])
+        return [numerator, denominator]
 
     @property
     def numerator(self) -> int:
@@ -43,6 +100,16 @@ class OBP(Stat):
 PlayerToOBP = dict[str, OBP]
 
 
+def _get_game_obp(counts: list[int]) -> OBP:
+    return OBP(
+        hits=counts[_HITS],
+        walks=counts[_WALKS],
+        hit_by_pitches=counts[_HIT_BY_PITCHES],
+        at_bats=counts[_AT_BATS],
+        sacrifice_flys=counts[_SACRIFICE_FLYS],
+    )
+
+
 def get_player_to_obp(games: list[Game], players: list[Player]) -> PlayerToOBP:
     return _get_player_to_obp(games, players, condition=None)
 
@@ -60,68 +127,58 @@ def get_player_to_loop(games: list[Game], players: list[Player]) -> PlayerToOBP:
 
 
 def _get_player_to_obp(games: list[Game], players: list[Player], condition: ConditionFunction | None) -> PlayerToOBP:
-    player_to_obp = {player.id: _get_obp(games, player, condition=condition) for player in players}
-    player_to_obp[TEAM_PLAYER_ID] = _get_teams_obp(player_to_obp)
+    game_ordinals = GameOrdinals.from_games(games)
+    player_to_obp = {player.id: _get_obp(games, game_ordinals, player, condition=condition) for player in players}
+    player_to_obp[TEAM_PLAYER_ID] = get_teams_obp(player_to_obp)
     return player_to_obp
 
 
-def _get_obp(games: list[Game], player: Player, condition: ConditionFunction | None) -> OBP:
-    obp = OBP()
+def _get_obp(
+    games: list[Game], game_ordinals: GameOrdinals, player: Player, condition: ConditionFunction | None
+) -> OBP:
+    obp = OBP.for_games(game_ordinals)
     for game, plays in get_players_plays(games, player):
         for play in plays:
-            if condition:
-                is_condition = condition(game, play)
-                if not is_condition.is_met:
-                    obp.add_play(play, resultant=is_condition.reason, color="red")
-                    continue
-
-            obp.add_play(play)
-            _increment_obp_counters(game, play, obp)
+            play_mask = get_game_index(game).get_play_mask(play)
+            add_obp_play(obp, game, play, play_mask, condition(game, play) if condition else None)
 
     obp.add_arithmetic()
     return obp
 
 
-def _increment_obp_counters(game: Game, play: Play, obp: OBP) -> None:
-    if game.id.raw not in obp.game_to_stat:
-        obp.game_to_stat[game.id.raw] = OBP()
+def add_obp_play(obp: OBP, game: Game, play: Play, play_mask: int, condition: Condition | None) -> None:
+    """Add a play to the OBP, only counting it if the (already evaluated) condition is met."""
+    if condition and not condition.is_met:
+        obp.add_play(play, resultant=condition.reason, color="red")
+        return
+
+    obp.add_play(play)
+    _increment_obp_counters(game, play_mask, obp)
 
-    game_obp = obp.game_to_stat[game.id.raw]
-    if play.is_an_at_bat():
+
+def _increment_obp_counters(game: Game, play_mask: int, obp: OBP) -> None:
+    game_id = game.id.raw
+    obp.increment_game_count(game_id, _PLAYS)
+    if play_mask & AT_BAT:
         obp.at_bats += 1
-        game_obp.at_bats += 1
+        obp.increment_game_count(game_id, _AT_BATS)
 
-    if play.is_hit():
+    if play_mask & HIT:
         obp.hits += 1
-        game_obp.hits += 1
-    elif play.is_walk():
+        obp.increment_game_count(game_id, _HITS)
+    elif play_mask & WALK:
         obp.walks += 1
-        game_obp.walks += 1
-    elif play.is_hit_by_pitch():
+        obp.increment_game_count(game_id, _WALKS)
+    elif play_mask & HIT_BY_PITCH:
         obp.hit_by_pitches += 1
-        game_obp.hit_by_pitches += 1
-    elif play.is_sacrifice_fly():
+        obp.increment_game_count(game_id, _HIT_BY_PITCHES)
+    elif play_mask & SACRIFICE_FLY:
         obp.sacrifice_flys += 1
-        game_obp.sacrifice_flys += 1
+        obp.increment_game_count(game_id, _SACRIFICE_FLYS)
 
 
-def _get_teams_obp(player_to_obp: PlayerToOBP) -> OBP:
-    team_obp = OBP()
+def get_teams_obp(player_to_obp: PlayerToOBP) -> OBP:
+    team_obp = OBP(explain=False)
     for obp in player_to_obp.values():
-        team_obp.at_bats += obp.at_bats
-        team_obp.hit_by_pitches += obp.hit_by_pitches
-        team_obp.walks += obp.walks
-        team_obp.hits += obp.hits
-        team_obp.sacrifice_flys += obp.sacrifice_flys
-        for game_id, game_obp in obp.game_to_stat.items():
-            if game_id not in team_obp.game_to_stat:
-                team_obp.game_to_stat[game_id] = OBP()
-
-            team_game_obp = team_obp.game_to_stat[game_id]
-            team_game_obp.at_bats += game_obp.at_bats
-            team_game_obp.hit_by_pitches += game_obp.hit_by_pitches
-            team_game_obp.walks += game_obp.walks
-            team_game_obp.hits += game_obp.hits
-            team_game_obp.sacrifice_flys += game_obp.sacrifice_flys
-
+        team_obp += obp
     return team_obp
@@ -0,0 +1,246 @@
+"""Store per-game partials of play stats, so that the stats of any subset of games are a summation of partials.
+
+A game's partials hold every play stat's counters (including the conditional OBPs and SPs) for each of the team's
+batters and runners in the game, along with the team's players in the game. They are pickled per team-season to
+'~/.cobp/data/<year>/', keyed by game id, in a file keyed by the checksum of the season's Retrosheet data so that
+partials are recalculated when the data changes. Stats are summed from partials by game id alone, so the games need
+only their basic info, and games are only fully loaded to calculate missing partials, which are calculated together
+from a columnar table of the games' plays (see `cobp.stats.columnar`).
+Partials do not reference plays, so stats summed from them have no explanations.
+"""
+import logging
+import pickle
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from pyretrosheet.models.game import Game
+from pyretrosheet.models.player import Player
+from pyretrosheet.models.team import TeamLocation
+from pyretrosheet.views import get_players
+
+from cobp import disk_cache, paths
+from cobp.data.retrosheet import PYRETROSHEET_VERSION, get_season_checksum, load_team_games
+from cobp.game_index import get_game_index
+from cobp.models.team import Team
+from cobp.stats import columnar
+from cobp.stats.ba import BA
+from cobp.stats.basic import BasicStats
+from cobp.stats.engine import PlayerToPlayStats, PlayStats, get_teams_play_stats
+from cobp.stats.obp import OBP
+from cobp.stats.runs import Runs
+from cobp.stats.sp import SP
+from cobp.stats.stat import GameCounts, GameOrdinals
+from cobp.utils import TEAM_PLAYER_ID
+
+logger = logging.getLogger(__name__)
+
+# increment when the calculation or layout of partials changes, invalidating stored partials
+PARTIALS_VERSION = 4
+_OBP_NAMES = ["obp", "cobp", "sobp", "loop"]
+_SP_NAMES = ["sp", "csp", "lsp", "ssp"]
+_BASIC_FIELDS = [field.name for field in fields(BasicStats)]
+# locks of each team-season's partials within this process, whose loaded partials are shared across sessions
+_team_to_partials_lock: dict[tuple[int, str], Lock] = {}
+_team_partials_locks_lock = Lock()
+
+
+def _get_stat_to_columns() -> dict[str, slice]:
+    stat_to_num_counters = {
+        "basic": len(_BASIC_FIELDS),
+        "ba": 2,
+        "runs": 2,
+        **{obp_name: OBP.num_game_counters for obp_name in _OBP_NAMES},
+        **{sp_name: SP.num_game_counters for sp_name in _SP_NAMES},
+    }
+    stat_to_columns = {}
+    start = 0
+    for stat_name, num_counters in stat_to_num_counters.items():
+        stat_to_columns[stat_name] = slice(start, start + num_counters)
+        start += num_counters
+    return stat_to_columns
+
+
+# the columns of each stat's counters within a player's partials
+_STAT_TO_COLUMNS = _get_stat_to_columns()
+_NUM_COLUMNS = sum(columns.stop - columns.start for columns in _STAT_TO_COLUMNS.values())
+_OBP_NAME_TO_PREFIX = {"obp": "", "cobp": "C", "sobp": "S", "loop": "L"}
+_SP_NAME_TO_PREFIX = {"sp": "", "csp": "C", "lsp": "L", "ssp": "S"}
+# the columns of `columnar.get_batter_game_counts_df` in the order of the partials' counters, where runs ('R') are
+# counted from the game's runners rather than its plays
+_COUNTS_DF_COLUMNS = [
+    "G",
+    *columnar.BASIC_COLUMNS,
+    "H",
+    "AB",
+    "R",
+    "RBI",
+    *(f"{_OBP_NAME_TO_PREFIX[name]}OBP_{counter}" for name in _OBP_NAMES for counter in columnar.OBP_COUNTERS),
+    *(f"{_SP_NAME_TO_PREFIX[name]}SP_{counter}" for name in _SP_NAMES for counter in columnar.SP_COUNTERS),
+]
+
+
+@dataclass
+class GamePartials:
+    """A game's play stat counters for each of the team's batters, and the team's players in the game."""
+
+    players: list[Player]
+    player_ids: list[str]
+    # (players, counters)
+    counts: np.ndarray
+
+
+GameIdToPartials = dict[str, GamePartials]
+
+
+def get_game_id_to_partials(games: list[Game], team: Team, year: int) -> GameIdToPartials:
+    """Get the partials of the games, calculating and storing the partials of any of the games without them.
+
+    The games need only their basic info (e.g. their ids).
+    """
+    # the team's loaded partials are shared across sessions, so are only read and updated while holding its lock
+    with _get_team_partials_lock(year, team.retrosheet_id):
+        game_id_to_partials = _load_team_partials(year, team.retrosheet_id, get_season_checksum(year))
+        missing_games = [game for game in games if game.id.raw not in game_id_to_partials]
+        if missing_games:
+            logger.info(f"Calculating partials of {len(missing_games)} {year} {team.pretty_name} games")
+            # games loaded with only their basic info have no events, so are fully loaded to calculate their partials
+            if not all(game.chronological_events for game in missing_games):
+                missing_games = load_team_games(year, team, game_ids=[game.id.raw for game in missing_games])
+            game_id_to_partials.update(_get_games_partials(missing_games, team))
+            _write_team_partials(year, team.retrosheet_id, game_id_to_partials)
+
+        return {game.id.raw: game_id_to_partials[game.id.raw] for game in games}
+
+
+def get_team_players_from_partials(games: list[Game], game_id_to_partials: GameIdToPartials) -> list[Player]:
+    """Get the team's players in the games, in order of their first appearance, from the games' partials."""
+    player_id_to_player: dict[str, Player] = {}
+    for game in games:
+        for player in game_id_to_partials[game.id.raw].players:
+            player_id_to_player.setdefault(player.id, player)
+    return list(player_id_to_player.values())
+
+
+def get_player_to_play_stats_from_partials(
+    games: list[Game], players: list[Player], game_id_to_partials: GameIdToPartials
+) -> PlayerToPlayStats:
+    """Sum the games' partials (see `get_game_id_to_partials`) into each player's (and the team's) play stats."""
+    game_ordinals = GameOrdinals.from_games(games)
+    player_id_to_index = {player.id: i for i, player in enumerate(players)}
+    counts = np.zeros((len(players), len(game_ordinals.game_ids), _NUM_COLUMNS), dtype=np.int32)
+    for game_id, ordinal in game_ordinals.game_id_to_ordinal.items():
+        partials = game_id_to_partials[game_id]
+        player_indexes = np.array([player_id_to_index.get(player_id, -1) for player_id in partials.player_ids])
+        is_player = player_indexes >= 0
+        counts[player_indexes[is_player], ordinal] = partials.counts[is_player]
+
+    player_to_play_stats = {
+        player.id: _build_play_stats(game_ordinals, player_counts) for player, player_counts in zip(players, counts)
+    }
+    player_to_play_stats[TEAM_PLAYER_ID] = get_teams_play_stats(player_to_play_stats, games)
+    return player_to_play_stats
+
+
+def _get_team_partials_lock(year: int, team_id: str) -> Lock:
+    with _team_partials_locks_lock:
+        return _team_to_partials_lock.setdefault((year, team_id), Lock())
+
+
+def _get_games_partials(games: list[Game], team: Team) -> dict[str, GamePartials]:
+    """Calculate the games' partials from a single table of the games' plays (see `cobp.stats.columnar`)."""
+    plays_df = columnar.get_plays_df(games)
+    game_id_to_team_location = {game.id.raw: _get_team_location(game, team).value for game in games}
+    team_locations = plays_df["game_id"].astype(str).map(game_id_to_team_location).to_numpy()
+    team_plays_df = plays_df[plays_df["team_location"].to_numpy() == team_locations]
+    counts_df = columnar.get_batter_game_counts_df(team_plays_df).reindex(columns=_COUNTS_DF_COLUMNS, fill_value=0)
+    game_id_to_counts_df = dict(tuple(counts_df.groupby(level="game_id", sort=False)))
+    return {game.id.raw: _get_game_partials(game, team, game_id_to_counts_df.get(game.id.raw)) for game in games}
+
+
+def _get_game_partials(game: Game, team: Team, counts_df: pd.DataFrame | None) -> GamePartials:
+    """Get the game's partials from the team's batters' counters in the game, adding the runs of its runners."""
+    is_home = _get_team_location(game, team) == TeamLocation.HOME
+    players = get_players(game, include_home_team=is_home, include_visiting_team=not is_home)
+    batter_ids = [] if counts_df is None else counts_df.index.get_level_values("batter_id").tolist()
+    batter_counts = np.zeros((0, _NUM_COLUMNS), dtype=np.int32) if counts_df is None else counts_df.to_numpy(np.int32)
+    team_player_ids = {*batter_ids, *(player.id for player in players)}
+    runner_to_runs = get_game_index(game).runs.runner_to_runs
+    # runners (e.g. pinch runners) may score without batting in the game
+    runner_ids = [runner_id for runner_id in runner_to_runs if runner_id in team_player_ids - set(batter_ids)]
+    player_ids = [*batter_ids, *runner_ids]
+    counts = np.vstack([batter_counts, np.zeros((len(runner_ids), _NUM_COLUMNS), dtype=np.int32)])
+    counts[:, _STAT_TO_COLUMNS["runs"].start] = [runner_to_runs.get(player_id, 0) for player_id in player_ids]
+    return GamePartials(players=players, player_ids=player_ids, counts=counts)
+
+
+def _get_team_location(game: Game, team: Team) -> TeamLocation:
+    return TeamLocation.HOME if game.home_team_id == team.retrosheet_id else TeamLocation.VISITING
+
+
+def _build_play_stats(game_ordinals: GameOrdinals, player_counts: np.ndarray) -> PlayStats:
+    """Build a player's play stats from their (games, counters) partials."""
+    totals = player_counts.sum(axis=0).tolist()
+    ba_hits, ba_at_bats = totals[_STAT_TO_COLUMNS["ba"]]
+    runs, rbis = totals[_STAT_TO_COLUMNS["runs"]]
+
+    def get_game_counts(stat_name: str) -> GameCounts:
+        return GameCounts.from_numpy(game_ordinals, player_counts[:, _STAT_TO_COLUMNS[stat_name]])
+
+    return PlayStats(
+        obp=OBP.from_game_counts(get_game_counts("obp")),
+        cobp=OBP.from_game_counts(get_game_counts("cobp")),
+        sobp=OBP.from_game_counts(get_game_counts("sobp")),
+        loop=OBP.from_game_counts(get_game_counts("loop")),
+        sp=SP.from_game_counts(get_game_counts("sp")),
+        csp=SP.from_game_counts(get_game_counts("csp")),
+        lsp=SP.from_game_counts(get_game_counts("lsp")),
+        ssp=SP.from_game_counts(get_game_counts("ssp")),
+        ba=BA(explain=False, hits=ba_hits, at_bats=ba_at_bats),
+        basic=BasicStats(*totals[_STAT_TO_COLUMNS["basic"]]),
+        runs=Runs(runs=runs, rbis=rbis),
+    )
+
+
+@lru_cache(maxsize=32)
+def _load_team_partials(year: int, team_id: str, season_checksum: str) -> dict[str, GamePartials]:
+    return disk_cache.read(_get_team_partials_path(year, team_id, season_checksum), _read_team_partials) or {}
+
+
+def _read_team_partials(partials_path: Path) -> dict[str, GamePartials] | None:
+    try:
+        with partials_path.open("rb") as f:
+            return pickle.load(f)  # type: ignore
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning(f"Ignoring unreadable partials {partials_path.as_posix()}: {e!r}")
+        return None
+
+
+def _write_team_partials(year: int, team_id: str, game_id_to_partials: dict[str, GamePartials]) -> None:
+    """Write the team's partials, merged with any partials written by other processes since they were loaded."""
+    partials_path = _get_team_partials_path(year, team_id, get_season_checksum(year))
+    with disk_cache.lock(partials_path):
+        stored_game_id_to_partials = disk_cache.read(partials_path, _read_team_partials) or {}
+        for game_id, partials in stored_game_id_to_partials.items():
+            game_id_to_partials.setdefault(game_id, partials)
+
+        # remove partials of prior pyretrosheet or partials versions, or of prior data
+        for stale_partials_path in partials_path.parent.glob(f"partials_{team_id}_*.pickle"):
+            if stale_partials_path != partials_path:
+                disk_cache.remove(stale_partials_path)
+
+        disk_cache.write(partials_path, lambda tmp_path: _dump_team_partials(tmp_path, game_id_to_partials))
+    logger.info(f"Wrote partials of {len(game_id_to_partials)} games to {partials_path.as_posix()}")
+
+
+def _dump_team_partials(partials_path: Path, game_id_to_partials: dict[str, GamePartials]) -> None:
+    with partials_path.open("wb") as f:
+        pickle.dump(game_id_to_partials, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _get_team_partials_path(year: int, team_id: str, season_checksum: str) -> Path:
+    file_name = f"partials_{team_id}_{PYRETROSHEET_VERSION}_{season_checksum}_v{PARTIALS_VERSION}.pickle"
+    return paths.DATA_DIR / str(year) / file_name
@@ -1,66 +1,60 @@
+"""Runs scored and RBIs, counted from plays' runner advances by `cobp.base_runners`.
+
+Baseball Reference's seasonal stats may optionally be used to cross-check the counted runs (see `ENV.CROSS_CHECK_RUNS`).
+"""
+import logging
 from dataclasses import dataclass
 
 from pyretrosheet.models.player import Player
 
 from cobp.data import baseball_reference
 from cobp.models.team import Team
-from cobp.stats.basic import PlayerToBasicStats
-from cobp.utils import TEAM_PLAYER_ID
+
+logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Runs:
     runs: int = 0
     rbis: int = 0
 
+    def __add__(self, other: "Runs") -> "Runs":
+        return Runs(runs=self.runs + other.runs, rbis=self.rbis + other.rbis)
+
 
 PlayerToRuns = dict[str, Runs]
 
 
-def get_player_to_runs(
-    year: int, team: Team, players: list[Player], player_to_basic_stats: PlayerToBasicStats
-) -> PlayerToRuns:
-    player_to_runs = {
-        player.id: _get_player_runs(year, team, player, player_to_basic_stats[player.id].at_bats) for player in players
-    }
-    player_to_runs[TEAM_PLAYER_ID] = _get_team_runs_and_rbis(player_to_runs)
-    return player_to_runs
+def cross_check_player_to_runs(year: int, team: Team, players: list[Player], player_to_runs: PlayerToRuns) -> int:
+    """Log each player whose runs differ from their Baseball Reference seasonal stats, returning the number logged.
 
+    Only meaningful for a team's entire season, as Baseball Reference only has seasonal stats. Players without any at
+    bats should not be given, as they will not appear in the Baseball Reference data.
+    """
+    mismatches = 0
+    for player in players:
+        runs = player_to_runs.get(player.id) or Runs()
+        baseball_reference_runs = _get_baseball_reference_runs(year, team, player)
+        if baseball_reference_runs is not None and baseball_reference_runs != runs:
+            logger.warning(
+                f"{year} {team.pretty_name} {player.name}'s {runs} != Baseball Reference's {baseball_reference_runs}"
+            )
+            mismatches += 1
 
-def _get_player_runs(year: int, team: Team, player: Player, at_bats: int) -> Runs:
-    # players without any bats will not appear in the Baseball Reference data
-    if at_bats == 0:
-        return Runs(runs=0, rbis=0)
+    # the players' matches are written once for all of the players, rather than once per player
+    if players:
+        baseball_reference.write_new_matches(year)
 
-    # rare case where the player will appear in the baseball reference data due to having more than one
-    # at bat for the season, but they had all of their hits for a single team and no hits for another team
-    # so they are not reported to have any hitting stats for that team
-    no_team_at_bats = [
-        ("Mat Latos", "ANA", 2015),
-        ("Jay Buente", "TBA", 2011),
-        ("Cha Seung Baek", "SEA", 2008),
-        ("Todd Wellemeyer", "KCA", 2007),
-        ("Cory Lidle", "NYA", 2006),
-        ("Felix Heredia", "NYA", 2003),
-        ("Jason Bere", "CLE", 2000),
-        ("Steve Woodard", "CLE", 2000),
-    ]
-    if (player.name, team.retrosheet_id, year) in no_team_at_bats:
-        return Runs(runs=0, rbis=0)
+    logger.info(f"Cross-checked {len(players)} {year} {team.pretty_name} players' runs: {mismatches} mismatches")
+    return mismatches
 
-    bb_ref_stats = baseball_reference.get_seasonal_players_stats(year)
-    bb_ref_player = baseball_reference.lookup_player(bb_ref_stats, player, team)
-    return Runs(
-        runs=bb_ref_player["runs"].values[0],  # type: ignore
-        rbis=bb_ref_player["rbis"].values[0],  # type: ignore
-    )
 
+def _get_baseball_reference_runs(year: int, team: Team, player: Player) -> Runs | None:
+    if (player.name, team.retrosheet_id, year) in baseball_reference.get_no_team_at_bats_players():
+        return Runs(runs=0, rbis=0)
 
-def _get_team_runs_and_rbis(player_to_runs: PlayerToRuns) -> Runs:
-    runs = 0
-    rbis = 0
-    for player_runs in player_to_runs.values():
-        runs += player_runs.runs
-        rbis += player_runs.rbis
+    bb_ref_player = baseball_reference.lookup_player(year, player, team)
+    if bb_ref_player is None:
+        return None
 
-    return Runs(runs=runs, rbis=rbis)
+    return Runs(runs=int(bb_ref_player["runs"]), rbis=int(bb_ref_player["rbis"]))
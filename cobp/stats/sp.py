@@ -1,17 +1,21 @@
 """Calculate SP (Slugging Percentage) stats from game data."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from pyretrosheet.models.game import Game
 from pyretrosheet.models.play import Play
 from pyretrosheet.models.player import Player
 
-from cobp.stats.conditions import ConditionFunction, is_conditional_play, is_leadoff_play, is_sequential_play
-from cobp.stats.stat import Stat
+from cobp.game_index import AT_BAT, DOUBLE, HOME_RUN, SINGLE, TRIPLE, get_game_index
+from cobp.stats.conditions import Condition, ConditionFunction, is_conditional_play, is_leadoff_play, is_sequential_play
+from cobp.stats.stat import GameCounts, GameOrdinals, GameStat
 from cobp.utils import TEAM_PLAYER_ID, get_players_plays
 
+# per-game counters
+_SINGLES, _DOUBLES, _TRIPLES, _HOME_RUNS, _AT_BATS = range(5)
 
-@dataclass
-class SP(Stat):
+
+@dataclass(slots=True)
+class SP(GameStat):
     """Slugging Percentage."""
 
     singles: int = 0
@@ -19,8 +23,34 @@ class SP(Stat):
     triples: int = 0
     home_runs: int = 0
     at_bats: int = 0
-    explanation: list[str] = field(default_factory=list)
-    game_to_stat: dict[str, "SP"] = field(default_factory=dict)
+    num_game_counters = 5
+
+    @classmethod
+    def from_game_counts(cls, game_counts: GameCounts) -> "SP":
+        """Build an (unexplained) SP from its per-game counts."""
+        singles, doubles, triples, home_runs, at_bats = game_counts.to_numpy().sum(axis=0).tolist()
+        return cls(
+            explain=False,
+            singles=singles,
+            doubles=doubles,
+            triples=triples,
+            home_runs=home_runs,
+            at_bats=at_bats,
+            game_counts=game_counts,
+        )
+
+    @property
+    def game_to_stat(self) -> dict[str, "SP"]:
+        """Each game's SP, for every game (including those without a play)."""
+        if self.game_counts is None:
+            return {}
+
+        return {game_id: _get_game_sp(counts) for game_id, counts in self.game_counts.iter_game_counts()}
+
+    def get_game_stat(self, game_id: str) -> "SP | None":
+        """A game's SP, if the game is one of the SP's games (as in `game_to_stat`, without building every game's)."""
+        counts = self.game_counts.get_game_counts(game_id) if self.game_counts is not None else None
+        return _get_game_sp(counts) if counts is not None else None
 
     @property
     def numerator(self) -> int:
@@ -30,10 +60,31 @@ class SP(Stat):
     def denominator(self) -> int:
         return self.at_bats
 
-    def add_arithmetic(self) -> None:
+    def __add__(self, other: "SP") -> "SP":
+        added = SP(
+            singles=self.singles + other.singles,
+            doubles=self.doubles + other.doubles,
+            triples=self.triples + other.triples,
+            home_runs=self.home_runs + other.home_runs,
+            at_bats=self.at_bats + other.at_bats,
+            game_counts=self._add_game_counts(other),
+        )
+        return self._with_added_explanations(added, other)
+
+    def __iadd__(self, other: "SP") -> "SP":
+        self.singles += other.singles
+        self.doubles += other.doubles
+        self.triples += other.triples
+        self.home_runs += other.home_runs
+        self.at_bats += other.at_bats
+        self._add_game_counts_in_place(other)
+        self._add_explanations(other)
+        return self
+
+    def get_arithmetic_explanation(self) -> list[str]:
         numerator = f"*1 * 1B={self.singles} + 2 * 2B={self.doubles} + 3 * 3B={self.triples} + 4 * HR={self.home_runs} = {self.numerator}*"  # noqa
         denominator = f"*AB={self.at_bats}*"
-        self.explanation.extend([numerator, denominator])
+        return [numerator, denominator]
 
     @property
     def value(self) -> float:
@@ -46,6 +97,16 @@ class SP(Stat):
 PlayerToSP = dict[str, SP]
 
 
+def _get_game_sp(counts: list[int]) -> SP:
+    return SP(
+        singles=counts[_SINGLES],
+        doubles=counts[_DOUBLES],
+        triples=counts[_TRIPLES],
+        home_runs=counts[_HOME_RUNS],
+        at_bats=counts[_AT_BATS],
+    )
+
+
 def get_player_to_sp(games: list[Game], players: list[Player]) -> PlayerToSP:
     return _get_player_to_sp(games, players, condition=None)
 
@@ -66,67 +127,55 @@ def get_player_to_lsp(games: list[Game], players: list[Player]) -> PlayerToSP:
 
 
 def _get_player_to_sp(games: list[Game], players: list[Player], condition: ConditionFunction | None) -> PlayerToSP:
-    player_to_sp = {player.id: _get_sp(games, player, condition=condition) for player in players}
-    player_to_sp[TEAM_PLAYER_ID] = _get_teams_sp(player_to_sp)
+    game_ordinals = GameOrdinals.from_games(games)
+    player_to_sp = {player.id: _get_sp(games, game_ordinals, player, condition=condition) for player in players}
+    player_to_sp[TEAM_PLAYER_ID] = get_teams_sp(player_to_sp)
     return player_to_sp
 
 
-def _get_sp(games: list[Game], player: Player, condition: ConditionFunction | None) -> SP:
-    sp = SP()
+def _get_sp(games: list[Game], game_ordinals: GameOrdinals, player: Player, condition: ConditionFunction | None) -> SP:
+    sp = SP.for_games(game_ordinals)
     for game, plays in get_players_plays(games, player):
-        game_sp = SP()
         for play in plays:
-            if condition:
-                is_condition = condition(game, play)
-                if not is_condition.is_met:
-                    sp.add_play(play, resultant=is_condition.reason, color="red")
-                    continue
-
-            _increment_sp_counters(play, sp, game_sp)
-            sp.add_play(play)
-
-        sp.game_to_stat[game.id.raw] = game_sp
+            play_mask = get_game_index(game).get_play_mask(play)
+            add_sp_play(sp, game, play, play_mask, condition(game, play) if condition else None)
 
     sp.add_arithmetic()
     return sp
 
 
-def _increment_sp_counters(play: Play, sp: SP, game_sp: SP) -> None:
-    if play.is_an_at_bat():
+def add_sp_play(sp: SP, game: Game, play: Play, play_mask: int, condition: Condition | None) -> None:
+    """Add a play to the SP, only counting it if the (already evaluated) condition is met."""
+    if condition and not condition.is_met:
+        sp.add_play(play, resultant=condition.reason, color="red")
+        return
+
+    _increment_sp_counters(game, play_mask, sp)
+    sp.add_play(play)
+
+
+def _increment_sp_counters(game: Game, play_mask: int, sp: SP) -> None:
+    game_id = game.id.raw
+    if play_mask & AT_BAT:
         sp.at_bats += 1
-        game_sp.at_bats += 1
+        sp.increment_game_count(game_id, _AT_BATS)
 
-    if play.is_single():
+    if play_mask & SINGLE:
         sp.singles += 1
-        game_sp.singles += 1
-    elif play.is_double():
+        sp.increment_game_count(game_id, _SINGLES)
+    elif play_mask & DOUBLE:
         sp.doubles += 1
-        game_sp.doubles += 1
-    elif play.is_triple():
+        sp.increment_game_count(game_id, _DOUBLES)
+    elif play_mask & TRIPLE:
         sp.triples += 1
-        game_sp.triples += 1
-    elif play.is_home_run():
+        sp.increment_game_count(game_id, _TRIPLES)
+    elif play_mask & HOME_RUN:
         sp.home_runs += 1
-        game_sp.home_runs += 1
+        sp.increment_game_count(game_id, _HOME_RUNS)
 
 
-def _get_teams_sp(player_to_sp: PlayerToSP) -> SP:
-    team_sp = SP()
+def get_teams_sp(player_to_sp: PlayerToSP) -> SP:
+    team_sp = SP(explain=False)
     for sp in player_to_sp.values():
-        team_sp.singles += sp.singles
-        team_sp.doubles += sp.doubles
-        team_sp.triples += sp.triples
-        team_sp.home_runs += sp.home_runs
-        team_sp.at_bats += sp.at_bats
-        for game_id, game_sp in sp.game_to_stat.items():
-            if game_id not in team_sp.game_to_stat:
-                team_sp.game_to_stat[game_id] = SP()
-
-            team_game_sp = team_sp.game_to_stat[game_id]
-            team_game_sp.singles += game_sp.singles
-            team_game_sp.doubles += game_sp.doubles
-            team_game_sp.triples += game_sp.triples
-            team_game_sp.home_runs += game_sp.home_runs
-            team_game_sp.at_bats += game_sp.at_bats
-
+        team_sp += sp
     return team_sp
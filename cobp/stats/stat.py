@@ -1,11 +1,27 @@
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from typing import ClassVar, NamedTuple, Self
 
+import numpy as np
+from pyretrosheet.models.game import Game
 from pyretrosheet.models.play import Play
 
 
-@dataclass
+class ExplainedPlay(NamedTuple):
+    """A play added to a stat, rendered into its explanation only when the explanation is requested."""
+
+    play: Play
+    resultant: str | None
+    color: str | None
+
+
+@dataclass(slots=True)
 class Stat:
-    explanation: list[str] = field(default_factory=list)
+    # skip recording explanations (e.g. for exports, where they are never displayed)
+    explain: bool = True
+    explained_plays: list[ExplainedPlay] = field(default_factory=list)
+    explains_arithmetic: bool = False
 
     def add_play(
         self,
@@ -13,29 +29,187 @@ class Stat:
         resultant: str | None = None,
         color: str | None = None,
     ) -> None:
-        if not resultant:
-            if play.is_hit():
-                resultant = "H"
-            elif play.is_walk():
-                resultant = "W"
-            elif play.is_hit_by_pitch():
-                resultant = "HBP"
-            elif play.is_sacrifice_fly():
-                resultant = "SF"
-            elif play.is_an_at_bat():
-                resultant = "AB"
-            else:
-                resultant = "N/A"
-
-        if not color:
-            if play.is_hit():
-                color = "green"
-            elif play.is_an_at_bat():
-                color = "orange"
-            elif any([play.is_hit_by_pitch(), play.is_sacrifice_fly(), play.is_walk()]):
-                color = "white"
-            else:
-                color = "red"
-
-        value = f"{play.raw} => :{color}[{resultant}]"
-        self.explanation.append(value)
+        if self.explain:
+            self.explained_plays.append(ExplainedPlay(play, resultant, color))
+
+    def add_arithmetic(self) -> None:
+        if self.explain:
+            self.explains_arithmetic = True
+
+    def get_arithmetic_explanation(self) -> list[str]:
+        return []
+
+    def _with_added_explanations(self, added: Self, other: "Stat") -> Self:
+        """Give the sum of two stats both of their explanations."""
+        added.explain = self.explain and other.explain
+        added.explained_plays = self.explained_plays + other.explained_plays
+        added.explains_arithmetic = self.explains_arithmetic or other.explains_arithmetic
+        return added
+
+    def _add_explanations(self, other: "Stat") -> None:
+        """Add the other stat's explanations, in place (as when summing stats with `+=`), unless not explaining."""
+        self.explain = self.explain and other.explain
+        if self.explain:
+            self.explained_plays.extend(other.explained_plays)
+            self.explains_arithmetic = self.explains_arithmetic or other.explains_arithmetic
+
+    @property
+    def explanation(self) -> list[str]:
+        lines = [_explain_play(*explained_play) for explained_play in self.explained_plays]
+        if self.explains_arithmetic:
+            lines.extend(self.get_arithmetic_explanation())
+        return lines
+
+
+@dataclass(frozen=True)
+class GameOrdinals:
+    """The ordinal of each game, by id, which indexes stats' per-game counts."""
+
+    game_ids: tuple[str, ...]
+    game_id_to_ordinal: dict[str, int]
+
+    @classmethod
+    def from_games(cls, games: list[Game]) -> "GameOrdinals":
+        return cls.from_game_ids(game.id.raw for game in games)
+
+    @classmethod
+    def from_game_ids(cls, game_ids: Iterable[str]) -> "GameOrdinals":
+        unique_game_ids = tuple(dict.fromkeys(game_ids))
+        return cls(
+            game_ids=unique_game_ids, game_id_to_ordinal={game_id: i for i, game_id in enumerate(unique_game_ids)}
+        )
+
+
+class GameCounts:
+    """A stat's counters for each game, stored in a flat integer array indexed by game ordinal and counter."""
+
+    __slots__ = ("game_ordinals", "num_counters", "counts")
+
+    def __init__(self, game_ordinals: GameOrdinals, num_counters: int, counts: "array[int] | None" = None):
+        self.game_ordinals = game_ordinals
+        self.num_counters = num_counters
+        self.counts = counts if counts is not None else array("i", [0]) * (len(game_ordinals.game_ids) * num_counters)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, GameCounts)
+            and self.game_ordinals.game_ids == other.game_ordinals.game_ids
+            and self.counts == other.counts
+        )
+
+    def increment(self, game_id: str, counter: int) -> None:
+        self.counts[self.game_ordinals.game_id_to_ordinal[game_id] * self.num_counters + counter] += 1
+
+    def __add__(self, other: "GameCounts") -> "GameCounts":
+        """Sum the counts of each game, across the games of both."""
+        if self.num_counters != other.num_counters:
+            raise ValueError(f"Can not add counts of {self.num_counters} and {other.num_counters} counters")
+
+        if self.game_ordinals is other.game_ordinals or self.game_ordinals == other.game_ordinals:
+            counts = self.to_numpy() + other.to_numpy()
+            return GameCounts(self.game_ordinals, self.num_counters, array("i", counts.tobytes()))
+
+        game_ordinals = GameOrdinals.from_game_ids([*self.game_ordinals.game_ids, *other.game_ordinals.game_ids])
+        counts = np.zeros((len(game_ordinals.game_ids), self.num_counters), dtype=np.int32)
+        for game_counts in [self, other]:
+            ordinals = [game_ordinals.game_id_to_ordinal[game_id] for game_id in game_counts.game_ordinals.game_ids]
+            counts[ordinals] += game_counts.to_numpy()
+
+        return GameCounts(game_ordinals, self.num_counters, array("i", counts.tobytes()))
+
+    def __iadd__(self, other: "GameCounts") -> "GameCounts":
+        """Sum the counts of each game in place, if both are of the same games."""
+        if self.num_counters == other.num_counters and (
+            self.game_ordinals is other.game_ordinals or self.game_ordinals == other.game_ordinals
+        ):
+            counts = self.to_numpy()
+            counts += other.to_numpy()
+            return self
+
+        return self + other
+
+    @classmethod
+    def from_numpy(cls, game_ordinals: GameOrdinals, counts: np.ndarray) -> "GameCounts":
+        """Build from a (games, counters) array."""
+        return cls(game_ordinals, counts.shape[1], array("i", np.ascontiguousarray(counts, dtype=np.int32).tobytes()))
+
+    def copy(self) -> "GameCounts":
+        return GameCounts(self.game_ordinals, self.num_counters, array("i", self.counts))
+
+    def to_numpy(self) -> np.ndarray:
+        """Get the counts as a (games, counters) array."""
+        return np.frombuffer(self.counts, dtype=np.int32).reshape(-1, self.num_counters)
+
+    def get_game_counts(self, game_id: str) -> list[int] | None:
+        """Get a game's counts by its ordinal, or None if the game is not counted."""
+        ordinal = self.game_ordinals.game_id_to_ordinal.get(game_id)
+        if ordinal is None:
+            return None
+
+        start = ordinal * self.num_counters
+        return self.counts[start : start + self.num_counters].tolist()
+
+    def iter_game_counts(self) -> Iterator[tuple[str, list[int]]]:
+        for ordinal, game_id in enumerate(self.game_ordinals.game_ids):
+            start = ordinal * self.num_counters
+            yield game_id, self.counts[start : start + self.num_counters].tolist()
+
+
+@dataclass(slots=True)
+class GameStat(Stat):
+    """A stat which also keeps its counters for each game."""
+
+    game_counts: GameCounts | None = None
+    num_game_counters: ClassVar[int] = 0
+
+    @classmethod
+    def for_games(cls, game_ordinals: GameOrdinals, explain: bool = True) -> Self:
+        return cls(explain=explain, game_counts=GameCounts(game_ordinals, cls.num_game_counters))
+
+    def increment_game_count(self, game_id: str, counter: int) -> None:
+        if self.game_counts is not None:
+            self.game_counts.increment(game_id, counter)
+
+    def _add_game_counts(self, other: "GameStat") -> GameCounts | None:
+        if self.game_counts is None:
+            return other.game_counts.copy() if other.game_counts is not None else None
+        if other.game_counts is None:
+            return self.game_counts.copy()
+
+        return self.game_counts + other.game_counts
+
+    def _add_game_counts_in_place(self, other: "GameStat") -> None:
+        if other.game_counts is None:
+            return
+        if self.game_counts is None:
+            self.game_counts = other.game_counts.copy()
+        else:
+            self.game_counts += other.game_counts
+
+
+def _explain_play(play: Play, resultant: str | None, color: str | None) -> str:
+    if not resultant:
+        if play.is_hit():
+            resultant = "H"
+        elif play.is_walk():
+            resultant = "W"
+        elif play.is_hit_by_pitch():
+            resultant = "HBP"
+        elif play.is_sacrifice_fly():
+            resultant = "SF"
+        elif play.is_an_at_bat():
+            resultant = "AB"
+        else:
+            resultant = "N/A"
+
+    if not color:
+        if play.is_hit():
+            color = "green"
+        elif play.is_an_at_bat():
+            color = "orange"
+        elif any([play.is_hit_by_pitch(), play.is_sacrifice_fly(), play.is_walk()]):
+            color = "white"
+        else:
+            color = "red"
+
+    return f"{play.raw} => :{color}[{resultant}]"
@@ -1,15 +1,38 @@
-import csv
+from pathlib import Path
 from typing import Any
 
 import pandas as pd
 import streamlit as st
 
+from cobp.export import CSV_QUOTING, ExportFormat
+
+EXPORT_FORMAT_TO_LABEL = {
+    ExportFormat.CSV: "CSV",
+    ExportFormat.PARQUET: "Parquet",
+}
+EXPORT_FORMAT_TO_MIME = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
 
 def download_df_button(df: pd.DataFrame, file_name: str) -> None:
     csv_df = _convert_df_to_csv(df)
     st.download_button(label="Download As CSV", data=csv_df, file_name=file_name, mime="text/csv", key="download-csv")
 
 
+def download_file_button(path: Path, file_name: str, export_format: ExportFormat = ExportFormat.CSV) -> None:
+    """Download a file which was written to disk (e.g. a streamed export)."""
+    with path.open("rb") as f:
+        st.download_button(
+            label=f"Download As {EXPORT_FORMAT_TO_LABEL[export_format]}",
+            data=f,
+            file_name=file_name,
+            mime=EXPORT_FORMAT_TO_MIME[export_format],
+            key=f"download-{export_format.value}",
+        )
+
+
 @st.cache_data
 def _convert_df_to_csv(df: pd.DataFrame) -> Any:
-    return df.to_csv(index=False, quoting=csv.QUOTE_NONNUMERIC).encode("utf-8")
+    return df.to_csv(index=False, quoting=CSV_QUOTING).encode("utf-8")
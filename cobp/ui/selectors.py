@@ -4,13 +4,22 @@ import streamlit as st
 from pyretrosheet.models.game import Game
 from pyretrosheet.models.player import Player
 
+from cobp.data.retrosheet import FIRST_AVAILABLE_YEAR, LAST_AVAILABLE_YEAR
+from cobp.export import ExportFormat
+from cobp.game_store import GameStore
 from cobp.models.team import TEAMS, Team, get_teams_for_year
+from cobp.ui.download import EXPORT_FORMAT_TO_LABEL
 
 EMPTY_CHOICE = ""
 ENTIRE_SEASON = "Entire Season"
+MONTH = "Month"
+HOMESTAND_OR_ROAD_TRIP = "Homestand / Road Trip"
+LAST_GAMES = "Last N Games"
+LAST_DAYS = "Last N Days"
+DATE_RANGE = "Date Range"
+GAMES = "Multiple Games"
+GAMES_SELECTIONS = [MONTH, HOMESTAND_OR_ROAD_TRIP, LAST_GAMES, LAST_DAYS, DATE_RANGE, GAMES]
 ALL_TEAMS = "All Teams"
-FIRST_AVAILABLE_YEAR = 2000
-LAST_AVAILABLE_YEAR = 2022
 FULL_PERIOD = f"Full Period ({FIRST_AVAILABLE_YEAR} - {LAST_AVAILABLE_YEAR})"
 
 
@@ -30,19 +39,54 @@ def get_team_selection(year: int | str) -> Team | str | None:
     return team_pretty_name_to_team.get(selected_team)
 
 
-def get_game_selection(games: list[Game]) -> Game | str | None:
-    game_id_to_game = {g.id.raw: g for g in games}
-    game_pretty_ids = [g.pretty_id for g in games]
-    game_pretty_id_to_game_id = {g.pretty_id: g.id.raw for g in games}
-    options = [EMPTY_CHOICE, ENTIRE_SEASON, *sorted(game_pretty_ids)]
+def get_games_selection(store: GameStore, team_id: str) -> list[Game] | None:
+    """Select the team's games from which to calculate stats: the entire season, a date range of games or a game."""
+    game_pretty_id_to_game = {g.pretty_id: g for g in store.games}
+    options = [EMPTY_CHOICE, ENTIRE_SEASON, *GAMES_SELECTIONS, *sorted(game_pretty_id_to_game.keys())]
     selection = _get_selection("Select Game:", options=options)
     if not selection:
         return None
     if selection == ENTIRE_SEASON:
-        return ENTIRE_SEASON
+        return store.games
+    if selection == MONTH:
+        return _get_month_games_selection(store)
+    if selection == HOMESTAND_OR_ROAD_TRIP:
+        return _get_stand_games_selection(store, team_id)
+    if selection == LAST_GAMES:
+        last_games = st.number_input("Number Of Games:", min_value=1, max_value=len(store), value=min(10, len(store)))
+        return store.get_last_games(int(last_games))
+    if selection == LAST_DAYS:
+        last_days = st.number_input("Number Of Days:", min_value=1, value=30)
+        return store.get_last_days_games(int(last_days))
+    if selection == DATE_RANGE:
+        return _get_date_range_games_selection(store)
+    if selection == GAMES:
+        selected_pretty_ids = st.multiselect("Select Games:", options=list(game_pretty_id_to_game.keys()))
+        return store.get_games([game_pretty_id_to_game[pretty_id].id.raw for pretty_id in selected_pretty_ids]) or None
+
+    return [game_pretty_id_to_game[selection]]
+
+
+def _get_month_games_selection(store: GameStore) -> list[Game] | None:
+    month_name_to_month = {month.strftime("%B"): month for month in store.get_months()}
+    month_name = _get_selection("Select Month:", options=[EMPTY_CHOICE, *month_name_to_month.keys()])
+    return store.get_month_games(month_name_to_month[month_name]) if month_name else None
+
+
+def _get_stand_games_selection(store: GameStore, team_id: str) -> list[Game] | None:
+    stand_name_to_stand = {stand.pretty_name: stand for stand in store.get_stands(team_id)}
+    stand_name = _get_selection("Select Homestand Or Road Trip:", options=[EMPTY_CHOICE, *stand_name_to_stand.keys()])
+    return stand_name_to_stand[stand_name].games if stand_name else None
+
+
+def _get_date_range_games_selection(store: GameStore) -> list[Game] | None:
+    first_date, last_date = store.dates[0], store.dates[-1]
+    dates = st.date_input("Select Dates:", value=(first_date, last_date), min_value=first_date, max_value=last_date)
+    # only the start date is returned while the end date is being selected
+    if not isinstance(dates, tuple) or len(dates) != 2:
+        return None
 
-    game_id_selected = game_pretty_id_to_game_id[selection]
-    return game_id_to_game[game_id_selected]
+    return store.get_games_between(*dates)
 
 
 def get_player_selection(players: list[Player]) -> Player | None:
@@ -62,5 +106,11 @@ def get_stat_to_correlate() -> str | None:
     return selection if selection != EMPTY_CHOICE else None
 
 
+def get_export_format_selection() -> ExportFormat:
+    label_to_export_format = {label: export_format for export_format, label in EXPORT_FORMAT_TO_LABEL.items()}
+    label = _get_selection("Select Download Format:", options=list(label_to_export_format.keys()))
+    return label_to_export_format[label]
+
+
 def _get_selection(prompt: str, options: list[Any]) -> Any:
     return st.selectbox(prompt, options=options)
@@ -1,11 +1,16 @@
 import pandas as pd
 import streamlit as st
 from pyretrosheet.models.game import Game
+from pyretrosheet.models.player import Player
 from pyretrosheet.models.team import TeamLocation
-from pyretrosheet.views import get_inning_plays, get_team_players
+from pyretrosheet.views import get_team_players
 
+from cobp.data.retrosheet import load_team_games
+from cobp.game_index import get_game_index
 from cobp.models.team import Team
-from cobp.stats.aggregated import PlayerStats, PlayerToStats, get_player_to_game_stat_df
+from cobp.stats.aggregated import PlayerToStats, get_player_to_game_stat_df
+from cobp.stats.derived import COPS, OPS
+from cobp.stats.engine import PlayStats, get_player_to_play_stats
 from cobp.stats.summary import get_team_seasonal_summary_stats_df
 from cobp.ui import download, formatters
 from cobp.ui.selectors import get_correlation_method, get_player_selection, get_stat_to_correlate
@@ -13,21 +18,27 @@ from cobp.utils import does_inning_have_an_on_base, prettify_play
 
 
 def display_game(
+    year: int,
     team: Team,
     games: list[Game],
+    players: list[Player],
     player_to_stats: PlayerToStats,
     player_to_stats_df: pd.DataFrame,
 ) -> None:
+    """Display the stats of the team's players in the games.
+
+    The games need only their basic info, as the games' plays are loaded only once they are displayed.
+    """
     player_to_stats_df = player_to_stats_df.drop(columns=["Team", "Year", "ID"])
     _display_stats(team, games, player_to_stats_df)
     if len(games) > 1:
         _display_summary_stats(games, player_to_stats)
-        _display_correlations(team, games, player_to_stats)
+        _display_correlations(team, games, players, player_to_stats)
 
     if len(games) == 1:
-        _display_innings_toggle(games[0], team)
+        _display_innings_toggle(year, games[0], team)
 
-    _display_player_stats_explanations_toggle(games, team, player_to_stats)
+    _display_player_stats_explanations_toggle(year, games, players, team)
     _display_footer()
 
 
@@ -49,10 +60,10 @@ def _display_summary_stats(games: list[Game], player_to_stats: PlayerToStats) ->
     st.dataframe(formatted_df, hide_index=True, use_container_width=True)
 
 
-def _display_correlations(team: Team, games: list[Game], player_to_stats: PlayerToStats) -> None:
+def _display_correlations(team: Team, games: list[Game], players: list[Player], player_to_stats: PlayerToStats) -> None:
     st.header("Correlations")
     if stat_to_correlate := get_stat_to_correlate():
-        player_to_game_stat_df = get_player_to_game_stat_df(games, team, player_to_stats, stat_to_correlate.lower())
+        player_to_game_stat_df = get_player_to_game_stat_df(games, players, player_to_stats, stat_to_correlate.lower())
         player_to_game_stat_no_game_df = player_to_game_stat_df.drop(columns=["Game"])
         _display_correlations_df(stat_to_correlate, player_to_game_stat_no_game_df)
         _display_df_toggle(f"Player {stat_to_correlate} Per Game", player_to_game_stat_df)
@@ -78,17 +89,15 @@ def _display_df_toggle(header: str, df: pd.DataFrame) -> None:
         st.dataframe(df, use_container_width=True, hide_index=True)
 
 
-def _display_innings_toggle(game: Game, team: Team) -> None:
+def _display_innings_toggle(year: int, game: Game, team: Team) -> None:
     team_is_home = game.home_team_id == team.retrosheet_id
-    team_is_visiting = game.visiting_team_id == team.retrosheet_id
     team_location = TeamLocation.HOME if team_is_home else TeamLocation.VISITING
-    player_id_to_player = {p.id: p for p in get_team_players([game], team.retrosheet_id)}
     header = f"Inning Play-by-Play For {team.pretty_name}"
     with st.expander(f"View {header}"):
         st.header(header)
-        for inning, plays in get_inning_plays(
-            game, include_home_team=team_is_home, include_visiting_team=team_is_visiting
-        ).items():
+        [game] = load_team_games(year, team, game_ids=[game.id.raw])
+        player_id_to_player = {p.id: p for p in get_team_players([game], team.retrosheet_id)}
+        for inning, plays in get_game_index(game).get_inning_plays(team_location).items():
             has_an_on_base = "Yes" if does_inning_have_an_on_base(game, inning, team_location) else "No"
             st.markdown(f"**Inning {inning}** (Has An On Base: {has_an_on_base})")
             for play in plays:
@@ -98,12 +107,14 @@ def _display_innings_toggle(game: Game, team: Team) -> None:
             st.divider()
 
 
-def _display_player_stats_explanations_toggle(games: list[Game], team: Team, player_to_stats: PlayerToStats) -> None:
+def _display_player_stats_explanations_toggle(year: int, games: list[Game], players: list[Player], team: Team) -> None:
     with st.expander("View Player Stat Explanations"):
-        player = get_player_selection(get_team_players(games, team.retrosheet_id))
+        player = get_player_selection(players)
         if player:
             st.markdown(":green[GREEN]: On-Base | :orange[ORANGE]: At Bat | :red[RED]: N/A")
-            _display_player_stats_explanation_row(player_to_stats[player.id])
+            # displayed stats are summed from per-game partials without explanations, so explain only the selection
+            games = load_team_games(year, team, game_ids=[game.id.raw for game in games])
+            _display_player_stats_explanation_row(get_player_to_play_stats(games, [player])[player.id])
 
 
 def _display_footer() -> None:
@@ -118,7 +129,9 @@ def _display_footer() -> None:
     st.caption(retrosheet_notice)
 
 
-def _display_player_stats_explanation_row(stats: PlayerStats) -> None:
+def _display_player_stats_explanation_row(stats: PlayStats) -> None:
+    ops = OPS(obp=stats.obp, sp=stats.sp)
+    cops = COPS(cobp=stats.cobp, csp=stats.csp)
     obp_column, cobp_column, sobp_column, ba_column, sp_column, ops_column, cops_column = st.columns(7)
     with obp_column:
         _display_stat("OBP", stats.obp.value, stats.obp.explanation)
@@ -131,9 +144,9 @@ def _display_player_stats_explanation_row(stats: PlayerStats) -> None:
     with sp_column:
         _display_stat("SP", stats.sp.value, stats.sp.explanation)
     with ops_column:
-        _display_stat("OPS", stats.ops.value, stats.ops.explanation)
+        _display_stat("OPS", ops.value, ops.explanation)
     with cops_column:
-        _display_stat("COPS", stats.cops.value, stats.cops.explanation)
+        _display_stat("COPS", cops.value, cops.explanation)
     st.divider()
 
 
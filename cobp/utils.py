@@ -4,7 +4,8 @@ from pyretrosheet.models.game import Game
 from pyretrosheet.models.play import Play
 from pyretrosheet.models.player import Player
 from pyretrosheet.models.team import TeamLocation
-from pyretrosheet.views import get_inning_plays, get_plays
+
+from cobp.game_index import get_game_index
 
 TEAM_PLAYER_ID = "Team"
 
@@ -23,60 +24,33 @@ def build_team_player() -> Player:
 
 def get_players_plays(games: list[Game], player: Player) -> Iterator[tuple[Game, list[Play]]]:
     for game in games:
-        plays = [p for p in get_plays(game) if p.batter_id == player.id]
-        yield game, plays
+        yield game, get_game_index(game).get_batter_plays(player.id)
 
 
 def does_inning_have_an_on_base(game: Game, inning: int, team_location: TeamLocation) -> bool:
-    inning_plays = get_inning_plays(
-        game,
-        include_visiting_team=team_location == TeamLocation.VISITING,
-        include_home_team=team_location == TeamLocation.HOME,
-    )
-    for play in inning_plays[inning]:
-        if play.batter_gets_on_base():
-            return True
-    return False
+    return get_game_index(game).get_half_inning_on_bases(team_location, inning) > 0
 
 
 def does_inning_have_another_play_get_on_base(game: Game, play: Play, team_location: TeamLocation) -> bool:
-    inning_plays = get_inning_plays(
-        game,
-        include_visiting_team=team_location == TeamLocation.VISITING,
-        include_home_team=team_location == TeamLocation.HOME,
-    )
-    for inning_play in inning_plays[play.inning]:
-        if inning_play == play:
-            continue
+    game_index = get_game_index(game)
+    play_context = game_index.get_play_context(play) if play.team_location == team_location else None
+    if not play_context:
+        return game_index.get_half_inning_on_bases(team_location, play.inning) > 0
 
-        if inning_play.batter_gets_on_base():
-            return True
-
-    return False
+    return play_context.has_other_on_base
 
 
 def does_play_have_on_base_before_it_in_inning(game: Game, play: Play) -> bool:
-    inning_plays = get_inning_plays(
-        game,
-        include_visiting_team=play.team_location == TeamLocation.VISITING,
-        include_home_team=play.team_location == TeamLocation.HOME,
-    )
-    for inning_play in inning_plays[play.inning]:
-        if inning_play == play:
-            return False
-        if inning_play.batter_gets_on_base():
-            return True
+    play_context = get_game_index(game).get_play_context(play)
+    if not play_context:
+        raise ValueError(f"Unable to find play within inning | play={play.raw}")
 
-    raise ValueError(f"Unable to find play within inning | play={play.raw}")
+    return play_context.on_bases_before > 0
 
 
 def is_play_first_of_inning(game: Game, play: Play) -> bool:
-    inning_plays = get_inning_plays(
-        game,
-        include_visiting_team=play.team_location == TeamLocation.VISITING,
-        include_home_team=play.team_location == TeamLocation.HOME,
-    )
-    return inning_plays[play.inning][0] == play  # type: ignore
+    play_context = get_game_index(game).get_play_context(play)
+    return play_context.is_first_batter if play_context else False
 
 
 def prettify_play(play: Play) -> str:
@@ -0,0 +1,241 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+import requests
+
+from cobp.data import baseball_reference
+from cobp.data.baseball_reference import BaseballReferenceClient, PlayerSeasonalStats
+from cobp.models.team import Team
+
+MODULE_PATH = "cobp.data.baseball_reference"
+BATTING_TABLE = """
+<table id="players_standard_batting">
+  <thead><tr><th data-stat="ranker">Rk</th><th data-stat="name_display">Player</th></tr></thead>
+  <tbody>
+    <tr>
+      <th data-stat="ranker">1</th>
+      <td data-stat="name_display"><a href="/players/a/abramcj01.shtml">CJ Abrams*</a></td>
+      <td data-stat="team_name_abbr">SDP</td>
+      <td data-stat="b_r">17</td>
+      <td data-stat="b_rbi">10</td>
+    </tr>
+    <tr>
+      <th data-stat="ranker">2</th>
+      <td data-stat="name_display"><a href="/players/a/abreujo02.shtml">José Abreu</a></td>
+      <td data-stat="team_name_abbr">2TM</td>
+      <td data-stat="b_r">85</td>
+      <td data-stat="b_rbi">75</td>
+    </tr>
+    <tr class="thead"><th data-stat="ranker">Rk</th><td data-stat="name_display">Player</td></tr>
+    <tr>
+      <th data-stat="ranker">3</th>
+      <td data-stat="name_display"><a href="/players/a/abreujo02.shtml">José Abreu</a></td>
+      <td data-stat="team_name_abbr">CHW</td>
+      <td data-stat="b_r">85</td>
+      <td data-stat="b_rbi">75</td>
+    </tr>
+  </tbody>
+</table>
+"""
+PLAYERS_SEASONAL_STATS = [
+    PlayerSeasonalStats("CJ Abrams", "abramcj01", "SDP", rbis=10, runs=17),
+    PlayerSeasonalStats("José Abreu", "abreujo02", "CHW", rbis=75, runs=85),
+]
+
+
+class _BaseballReferenceHandler(BaseHTTPRequestHandler):
+    """Serves batting pages, with the table commented out as on Baseball Reference, failing the first request."""
+
+    requested_paths: list[str] = []
+
+    def do_GET(self) -> None:
+        self.requested_paths.append(self.path)
+        if self.path.endswith("1999-standard-batting.shtml"):
+            self.send_error(404)
+            return
+        if self.requested_paths.count(self.path) == 1:
+            self.send_error(503)
+            return
+
+        body = f"<html><body><div id='all_players_standard_batting'><!--{BATTING_TABLE}--></div></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _BaseballReferenceHandler.requested_paths = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BaseballReferenceHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    host, port = server.server_address
+    with BaseballReferenceClient(
+        base_url=f"http://{host}:{port}", max_workers=3, min_request_interval_seconds=0, backoff_factor=0
+    ) as client:
+        yield client
+
+
+def test_parse_players_seasonal_stats__parses_prior_layout():
+    html = (
+        '<table id="players_standard_batting"><tbody><tr>'
+        '<td data-stat="player"><a href="/players/a/abramcj01.shtml">CJ Abrams</a></td>'
+        '<td data-stat="team_ID">SDP</td><td data-stat="R">17</td><td data-stat="RBI">10</td>'
+        '</tr><tr><td data-stat="player"><a href="/players/x/x.shtml">X</a></td><td data-stat="team_ID">TOT</td>'
+        "</tr></tbody></table>"
+    )
+
+    assert baseball_reference.parse_players_seasonal_stats(html) == PLAYERS_SEASONAL_STATS[:1]
+
+
+def test_parse_players_seasonal_stats__requires_batting_table():
+    with pytest.raises(ValueError):
+        baseball_reference.parse_players_seasonal_stats("<html></html>")
+
+
+def test_client__retries_failed_requests(client):
+    assert client.get_players_seasonal_stats(2022) == PLAYERS_SEASONAL_STATS
+    assert _BaseballReferenceHandler.requested_paths == ["/leagues/majors/2022-standard-batting.shtml"] * 2
+
+
+def test_client__raises_on_unavailable_years(client):
+    with pytest.raises(requests.HTTPError):
+        client.get_players_seasonal_stats(1999)
+
+
+def test_client__fetches_years_concurrently_in_order(client):
+    years = [2022, 2021, 2020, 2019]
+
+    years_stats = list(client.iter_years_players_seasonal_stats(years))
+
+    assert [year for year, _ in years_stats] == years
+    assert all(players_stats == PLAYERS_SEASONAL_STATS for _, players_stats in years_stats)
+
+
+def test_dump_all_seasons__writes_each_season(mocker, tmp_path, client):
+    mocker.patch(f"{MODULE_PATH}.paths.DATA_DIR", tmp_path)
+    mocker.patch(f"{MODULE_PATH}.FIRST_AVAILABLE_YEAR", 2021)
+    mocker.patch(f"{MODULE_PATH}.LAST_AVAILABLE_YEAR", 2022)
+    baseball_reference.get_players_stats_store.cache_clear()
+
+    baseball_reference.dump_all_seasons(client)
+
+    assert baseball_reference.get_players_stats_store().years == {2021, 2022}
+    df = baseball_reference.get_seasonal_players_stats(2021)
+    # sorted by team
+    assert df["player_id"].tolist() == ["abreujo02", "abramcj01"]
+    assert df["runs"].tolist() == [85, 17]
+    assert [path.name for path in tmp_path.rglob("*") if path.suffix in [".csv", ".parquet"]] == [
+        "baseball_reference.parquet"
+    ]
+    baseball_reference.get_players_stats_store.cache_clear()
+
+
+def test_get_seasonal_players_stats__moves_legacy_seasons_into_store(mocker, tmp_path):
+    mocker.patch(f"{MODULE_PATH}.paths.DATA_DIR", tmp_path)
+    baseball_reference.get_players_stats_store.cache_clear()
+    baseball_reference._write_seasons_players_stats({2021: PLAYERS_SEASONAL_STATS})
+    legacy_data_path = tmp_path / "2022" / "baseball_reference.csv"
+    legacy_data_path.parent.mkdir()
+    legacy_data_path.write_text(
+        "player_name,player_id,baseball_reference_team_id,rbis,runs\nCJ Abrams,abramcj01,WSN,1,2"
+    )
+    dump_players_seasonal_stats = mocker.patch(f"{MODULE_PATH}.dump_players_seasonal_stats")
+
+    df = baseball_reference.get_seasonal_players_stats(2022)
+
+    assert df.to_dict("records") == [
+        {
+            "baseball_reference_team_id": "WSN",
+            "player_id": "abramcj01",
+            "player_name": "CJ Abrams",
+            "rbis": 1,
+            "runs": 2,
+        }
+    ]
+    assert baseball_reference.get_players_stats_store().years == {2021, 2022}
+    assert len(baseball_reference.get_seasonal_players_stats(2021)) == 2
+    dump_players_seasonal_stats.assert_not_called()
+    baseball_reference.get_players_stats_store.cache_clear()
+
+
+@pytest.fixture
+def season_players_matcher(mocker, tmp_path):
+    mocker.patch(f"{MODULE_PATH}.paths.DATA_DIR", tmp_path)
+    baseball_reference.get_players_stats_store.cache_clear()
+    baseball_reference._write_seasons_players_stats(
+        {
+            2022: [
+                *PLAYERS_SEASONAL_STATS,
+                PlayerSeasonalStats("Manny Piña", "pinama01", "ATL", rbis=1, runs=2),
+                PlayerSeasonalStats("Zoilo Almonte", "almonzo01", "ATL", rbis=3, runs=4),
+                PlayerSeasonalStats("Michael Harris II", "harrimi04", "ATL", rbis=64, runs=75),
+            ]
+        }
+    )
+    yield baseball_reference.SeasonPlayersMatcher.from_year(2022)
+    baseball_reference.get_players_stats_store.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "player_id, player_name, team_id, expected_player_id",
+    [
+        pytest.param("abrac001", "CJ Abrams", "SDP", "abramcj01", id="exact"),
+        pytest.param("abrej003", "Jose Abreu", "CHW", "abreujo02", id="accents"),
+        pytest.param("pinam001", "Manuel Pina", "ATL", "pinama01", id="alias"),
+        pytest.param("almoz001", "Drew Stubbs", "ATL", "almonzo01", id="name correction"),
+        pytest.param("harrm005", "Michael Harris", "ATL", "harrimi04", id="fuzzy"),
+        pytest.param("abrac001", "CJ Abrams", "NYY", None, id="team without players"),
+    ],
+)
+def test_season_players_matcher__matches_players(
+    season_players_matcher, mock_player_builder, player_id, player_name, team_id, expected_player_id
+):
+    player = mock_player_builder(id=player_id, name=player_name)
+
+    assert season_players_matcher.match_player(player, team_id) == expected_player_id
+
+
+def test_season_players_matcher__persists_matches(mocker, season_players_matcher, mock_player_builder):
+    player = mock_player_builder(id="harrm005", name="Michael Harris")
+    season_players_matcher.match_player(player, "ATL")
+    season_players_matcher.write_new_matches()
+    fuzzy_lookup_player = mocker.patch(f"{MODULE_PATH}._fuzzy_lookup_player")
+
+    season_players_matcher = baseball_reference.SeasonPlayersMatcher.from_year(2022)
+
+    assert season_players_matcher.match_player(player, "ATL") == "harrimi04"
+    fuzzy_lookup_player.assert_not_called()
+
+
+def test_season_players_matcher__writes_new_matches_once(mocker, season_players_matcher, mock_player_builder):
+    write = mocker.spy(baseball_reference.disk_cache, "write")
+    season_players_matcher.match_player(mock_player_builder(id="abrac001", name="CJ Abrams"), "SDP")
+    season_players_matcher.match_player(mock_player_builder(id="pinam001", name="Manuel Pina"), "ATL")
+
+    season_players_matcher.write_new_matches()
+    season_players_matcher.write_new_matches()
+
+    assert write.call_count == 1
+    assert baseball_reference._read_matches(2022) == {("SDP", "abrac001"): "abramcj01", ("ATL", "pinam001"): "pinama01"}
+
+
+def test_season_players_matcher__lookup_player(season_players_matcher, mock_player_builder):
+    team = Team("ATL", "Atlanta", "Braves", 1966, 2022)
+
+    player_stats = season_players_matcher.lookup_player(mock_player_builder(id="pinam001", name="Manuel Pina"), team)
+
+    assert player_stats["player_name"] == "Manny Piña"
+    assert player_stats["runs"] == 2
@@ -0,0 +1,101 @@
+import datetime as dt
+
+import pytest
+
+from cobp.data import retrosheet
+from cobp.game_store import GamesSelection
+
+MODULE_PATH = "cobp.data.retrosheet"
+
+
+@pytest.fixture(autouse=True)
+def clear_load_season_cache():
+    retrosheet.load_season.cache_clear()
+    retrosheet.get_season_checksum.cache_clear()
+    yield
+    retrosheet.load_season.cache_clear()
+    retrosheet.get_season_checksum.cache_clear()
+
+
+@pytest.fixture
+def data_dir(mocker, tmp_path):
+    mocker.patch(f"{MODULE_PATH}.paths.DATA_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def play_by_play_file(mocker, tmp_path):
+    play_by_play_file = tmp_path / "2022CHN.EVN"
+    play_by_play_file.write_text("id,CHN202204070")
+    mocker.patch(f"{MODULE_PATH}.retrosheet.retrieve_years_play_by_play_files", return_value=[play_by_play_file])
+    return play_by_play_file
+
+
+@pytest.fixture
+def pyretrosheet_load_games(mocker, mock_game):
+    return mocker.patch(f"{MODULE_PATH}.load.load_games.__wrapped__", return_value=[mock_game])
+
+
+def test_load_games__parses_and_caches_on_miss(data_dir, play_by_play_file, pyretrosheet_load_games, mock_game):
+    games = retrosheet.load_games(2022)
+
+    assert games == [mock_game]
+    pyretrosheet_load_games.assert_called_once_with(year=2022, basic_info_only=False)
+    assert len(list((data_dir / "2022").glob("retrosheet_games_*.pickle"))) == 1
+
+
+def test_load_games__reads_cache_on_hit(data_dir, play_by_play_file, pyretrosheet_load_games, mock_game):
+    retrosheet.load_games(2022)
+
+    games = retrosheet.load_games(2022)
+
+    assert games == [mock_game]
+    pyretrosheet_load_games.assert_called_once()
+    # the season's event files are only checksummed once per process
+    retrosheet.retrosheet.retrieve_years_play_by_play_files.assert_called_once()
+
+
+def test_load_games__invalidates_cache_on_data_change(data_dir, play_by_play_file, pyretrosheet_load_games):
+    retrosheet.load_games(2022)
+    play_by_play_file.write_text("id,CHN202204080")
+    # as in a new process, which checksums the changed data
+    retrosheet.get_season_checksum.cache_clear()
+
+    retrosheet.load_games(2022)
+
+    assert pyretrosheet_load_games.call_count == 2
+    assert len(list((data_dir / "2022").glob("retrosheet_games_*.pickle"))) == 1
+
+
+def test_load_games__ignores_unreadable_cache(data_dir, play_by_play_file, pyretrosheet_load_games, mock_game):
+    retrosheet.load_games(2022)
+    for cache_path in (data_dir / "2022").glob("retrosheet_games_*.pickle"):
+        cache_path.write_bytes(b"partial")
+
+    games = retrosheet.load_games(2022)
+
+    assert games == [mock_game]
+    assert pyretrosheet_load_games.call_count == 2
+
+
+def test_load_season__indexes_games_by_team(data_dir, play_by_play_file, pyretrosheet_load_games, mock_game, mock_team):
+    mock_game.info["visteam"] = "visiting_team_id"
+
+    season_games = retrosheet.load_season(2022)
+
+    assert season_games.year == 2022
+    assert season_games.get_team_games(mock_team.retrosheet_id) == [mock_game]
+    assert season_games.get_team_games("visiting_team_id") == [mock_game]
+    assert season_games.get_team_games("not_a_team_id") == []
+    assert retrosheet.load_season(2022) is season_games
+
+
+def test_load_team_games__loads_selected_games(
+    data_dir, play_by_play_file, pyretrosheet_load_games, mock_game, mock_team
+):
+    games_selection = GamesSelection(end_date=mock_game.id.date - dt.timedelta(days=1))
+
+    assert retrosheet.load_team_games(2022, mock_team, games_selection=GamesSelection()) == [mock_game]
+    assert retrosheet.load_team_games(2022, mock_team, games_selection=games_selection) == []
+    with pytest.raises(ValueError):
+        retrosheet.load_team_games(2022, mock_team, game_ids=[mock_game.id.raw], games_selection=GamesSelection())
@@ -11,13 +11,7 @@ from cobp.stats.basic import BasicStats
 from cobp.stats.obp import OBP
 from cobp.stats.runs import Runs
 from cobp.stats.sp import SP
-
-MODULE_PATH = "cobp.stats.aggregated"
-
-
-@pytest.fixture
-def get_player_to_runs(mocker):
-    return mocker.patch(f"{MODULE_PATH}.get_player_to_runs")
+from cobp.utils import TEAM_PLAYER_ID
 
 
 class TestPlayerStats:
@@ -41,10 +35,32 @@ class TestPlayerStats:
         assert player_stats.loops.value == 0.5  # 0.0 + 0.5
         assert player_stats.sops.value == 1.0  # 0.5 + 0.5
 
+    def test_derived_stats_are_cached_until_a_component_is_replaced(self):
+        player_stats = aggregated.PlayerStats(
+            obp=OBP(hits=1, at_bats=2),
+            cobp=OBP(),
+            sobp=OBP(),
+            loop=OBP(),
+            sp=SP(singles=1, at_bats=2),
+            csp=SP(),
+            lsp=SP(),
+            ssp=SP(),
+            ba=BA(),
+            basic=BasicStats(),
+            runs=Runs(),
+        )
+        ops = player_stats.ops
+
+        player_stats.obp.hits += 1
 
-def test_aggregated_stats_scenario(
-    mock_game, mock_team, mock_player, mock_player_2, mock_batter_event_play_builder, get_player_to_runs
-):
+        assert player_stats.ops is ops
+        assert ops.value == 1.5  # 1.0 + 0.5
+        player_stats.sp = SP(doubles=1, at_bats=2)
+        assert player_stats.ops is not ops
+        assert player_stats.ops.value == 2.0  # 1.0 + 1.0
+
+
+def test_aggregated_stats_scenario(mock_game, mock_team, mock_player, mock_player_2, mock_batter_event_play_builder):
     """Can be used for regression testing - was initially given a specific scenario to test against (this test)
     which allowed for finding some errors in stat calculations.
 
@@ -99,7 +115,6 @@ def test_aggregated_stats_across_real_games(
     mock_play_builder,
     mock_event_builder,
     mock_modifier_builder,
-    get_player_to_runs,
 ):
     """Used to verify how stats are being calculated over a series of real games."""
     orter001 = mock_player_builder(id="orter001", name="Rafael Ortega")
@@ -405,3 +420,60 @@ def test_aggregated_stats_across_real_games(
     assert round(schwindel_stats.sops.value, 3) == 0.586
     assert round(schwindel_stats.cops.value, 3) == 0.421
     assert schwindel_stats.loops.value == 1.0
+
+
+@pytest.mark.parametrize("is_full_season", [True, False])
+def test_get_player_to_stats__cross_checks_runs_of_full_seasons_only(
+    mocker, mock_game, mock_team, mock_player, mock_batter_event_play_builder, is_full_season
+):
+    mocker.patch("cobp.stats.aggregated.ENV.CROSS_CHECK_RUNS", True)
+    cross_check_player_to_runs = mocker.patch("cobp.stats.aggregated.cross_check_player_to_runs")
+    mock_game.chronological_events.append(mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1))
+
+    aggregated.get_player_to_stats([mock_game], mock_team, 2022, is_full_season=is_full_season)
+
+    assert cross_check_player_to_runs.called == is_full_season
+
+
+def test_get_player_to_game_stat_df(mock_game, mock_team, mock_player, mock_batter_event_play_builder):
+    mock_game.chronological_events.extend(
+        [
+            mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1),
+            mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 2),
+        ]
+    )
+    player_to_stats = aggregated.get_player_to_stats([mock_game], mock_team, 2022)
+
+    df = aggregated.get_player_to_game_stat_df([mock_game], [mock_player], player_to_stats, "obp")
+
+    assert df.to_dict("list") == {"Game": [mock_game.id.raw], mock_player.name: [0.5]}
+
+
+def test_get_player_to_stats_df__vectorizes_stats_with_compact_dtypes(mock_team, mock_player):
+    player_stats = aggregated.PlayerStats(
+        obp=OBP(hits=1, walks=1, at_bats=3),
+        cobp=OBP(),
+        sobp=OBP(),
+        loop=OBP(),
+        sp=SP(doubles=1, at_bats=3),
+        csp=SP(),
+        lsp=SP(),
+        ssp=SP(),
+        ba=BA(hits=1, at_bats=3),
+        basic=BasicStats(games=1, at_bats=3, hits=1, walks=1, doubles=1),
+        runs=Runs(runs=1, rbis=2),
+    )
+    player_to_stats = {TEAM_PLAYER_ID: player_stats, mock_player.id: player_stats}
+
+    df = aggregated.get_player_to_stats_df([mock_player], player_to_stats, team=mock_team, year=2022)
+
+    assert df["Player"].tolist() == [TEAM_PLAYER_ID, mock_player.name]
+    assert df["Team"].dtype == "category"
+    assert df["AB"].dtype == "int32"
+    assert df["OBP"].dtype == "float32"
+    row = df.iloc[1]
+    assert (row["AB"], row["R"], row["RBI"]) == (3, 1, 2)
+    assert row["OBP"] == pytest.approx(0.5)
+    assert row["SP"] == pytest.approx(2 / 3)
+    assert row["OPS"] == pytest.approx(0.5 + 2 / 3)
+    assert row["COBP"] == 0.0
@@ -0,0 +1,102 @@
+import pytest
+from pyretrosheet.models.play.description import BatterEvent
+
+from cobp.stats import columnar, engine
+from cobp.utils import TEAM_PLAYER_ID
+
+
+def test_get_plays_df__one_row_per_play_with_context(
+    mock_game, mock_player, mock_player_2, mock_batter_event_play_builder
+):
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 2),
+    ]
+
+    plays_df = columnar.get_plays_df([mock_game])
+
+    assert plays_df["batter_id"].tolist() == [mock_player.id, mock_player_2.id, mock_player.id]
+    assert plays_df["inning"].tolist() == [1, 1, 2]
+    assert plays_df["position"].tolist() == [0, 1, 0]
+    assert plays_df["on_bases_before"].tolist() == [0, 0, 0]
+    assert plays_df["on_bases_after"].tolist() == [1, 0, 0]
+    assert plays_df["is_hit"].tolist() == [False, True, False]
+    assert plays_df["is_walk"].tolist() == [False, False, True]
+
+
+def test_get_player_stats_df__matches_play_stats(
+    mock_game, mock_player, mock_player_2, mock_player_builder, mock_batter_event_play_builder
+):
+    opposing_player = mock_player_builder(id="opposing_player", name="opposing_player")
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.SINGLE, opposing_player, 1),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 2),
+        mock_batter_event_play_builder(BatterEvent.DOUBLE, mock_player_2, 2),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 3),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player_2, 3),
+        mock_batter_event_play_builder(BatterEvent.HOME_RUN_LEAVING_PARK, mock_player, 4),
+        mock_batter_event_play_builder(BatterEvent.HIT_BY_PITCH, mock_player_2, 4),
+    ]
+    games = [mock_game]
+    players = [mock_player, mock_player_2]
+    player_to_play_stats = engine.get_player_to_play_stats(games, players)
+
+    stats_df = columnar.get_player_stats_df(
+        columnar.get_plays_df(games), [player.id for player in players], num_games=len(games)
+    )
+
+    assert stats_df.index.tolist() == [TEAM_PLAYER_ID, mock_player.id, mock_player_2.id]
+    for player_id, play_stats in player_to_play_stats.items():
+        row = stats_df.loc[player_id]
+        basic = play_stats.basic
+        assert [row[c] for c in ["G", "AB", "H", "W", "HBP", "SF", "S", "D", "T", "HR"]] == [
+            basic.games,
+            basic.at_bats,
+            basic.hits,
+            basic.walks,
+            basic.hit_by_pitches,
+            basic.sacrifice_flys,
+            basic.singles,
+            basic.doubles,
+            basic.triples,
+            basic.home_runs,
+        ]
+        for column, stat in [
+            ("OBP", play_stats.obp),
+            ("COBP", play_stats.cobp),
+            ("LOOP", play_stats.loop),
+            ("SOBP", play_stats.sobp),
+            ("BA", play_stats.ba),
+            ("SP", play_stats.sp),
+            ("CSP", play_stats.csp),
+            ("LSP", play_stats.lsp),
+            ("SSP", play_stats.ssp),
+        ]:
+            assert row[column] == pytest.approx(stat.value), (player_id, column)
+
+
+def test_get_batter_game_counts_df__sums_each_batters_game(
+    mock_game, mock_player, mock_player_2, mock_batter_event_play_builder
+):
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 2),
+    ]
+
+    counts_df = columnar.get_batter_game_counts_df(columnar.get_plays_df([mock_game]))
+
+    game_id = mock_game.id.raw
+    assert counts_df.index.tolist() == [(game_id, mock_player.id), (game_id, mock_player_2.id)]
+    assert counts_df.loc[(game_id, mock_player.id), ["G", "AB", "H", "OBP_PA", "COBP_H", "SOBP_H"]].tolist() == [
+        1,
+        2,
+        1,
+        2,
+        1,
+        0,
+    ]
+    assert counts_df.loc[(game_id, mock_player_2.id), ["G", "AB", "W", "OBP_W", "SOBP_W"]].tolist() == [1, 0, 1, 1, 1]
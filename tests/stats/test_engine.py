@@ -0,0 +1,96 @@
+from pyretrosheet.models.play import Play
+from pyretrosheet.models.play.description import BatterEvent
+
+from cobp.stats import engine
+from cobp.stats.ba import get_player_to_ba
+from cobp.stats.basic import get_player_to_basic_stats
+from cobp.stats.obp import get_player_to_cobp, get_player_to_loop, get_player_to_obp, get_player_to_sobp
+from cobp.stats.runs import Runs
+from cobp.stats.sp import get_player_to_csp, get_player_to_lsp, get_player_to_sp, get_player_to_ssp
+from cobp.utils import TEAM_PLAYER_ID
+
+
+def test_get_player_to_play_stats__matches_individual_stat_calculations(
+    mock_game, mock_player, mock_player_2, mock_batter_event_play_builder
+):
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 2),
+        mock_batter_event_play_builder(BatterEvent.DOUBLE, mock_player_2, 2),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 3),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player_2, 3),
+        mock_batter_event_play_builder(BatterEvent.HOME_RUN_LEAVING_PARK, mock_player, 4),
+        mock_batter_event_play_builder(BatterEvent.HIT_BY_PITCH, mock_player_2, 4),
+    ]
+    games = [mock_game]
+    players = [mock_player, mock_player_2]
+
+    player_to_play_stats = engine.get_player_to_play_stats(games, players)
+
+    assert len(player_to_play_stats) == 3
+    for stat_name, get_player_to_stat in [
+        ("obp", get_player_to_obp),
+        ("cobp", get_player_to_cobp),
+        ("sobp", get_player_to_sobp),
+        ("loop", get_player_to_loop),
+        ("sp", get_player_to_sp),
+        ("csp", get_player_to_csp),
+        ("lsp", get_player_to_lsp),
+        ("ssp", get_player_to_ssp),
+        ("ba", get_player_to_ba),
+        ("basic", get_player_to_basic_stats),
+    ]:
+        player_to_stat = get_player_to_stat(games, players)
+        for player_id in [mock_player.id, mock_player_2.id, TEAM_PLAYER_ID]:
+            assert getattr(player_to_play_stats[player_id], stat_name) == player_to_stat[player_id], stat_name
+
+
+def test_get_player_to_play_stats__explains_lazily(mock_game, mock_player, mock_batter_event_play_builder):
+    single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)
+    mock_game.chronological_events = [single]
+
+    play_stats = engine.get_player_to_play_stats([mock_game], [mock_player])[mock_player.id]
+    unexplained_play_stats = engine.get_player_to_play_stats([mock_game], [mock_player], explain=False)[mock_player.id]
+
+    assert play_stats.ba.explanation == [f"{single.raw} => :green[H]", "*H=1 / AB=1 == 1.0*"]
+    assert unexplained_play_stats.ba.explanation == []
+    assert unexplained_play_stats.ba.value == play_stats.ba.value
+
+
+def test_get_player_to_play_stats__counts_runs_and_rbis(mock_game, mock_player, mock_player_2, mock_team_location):
+    def get_play(batter_id: str, event: str) -> Play:
+        return Play.from_play_line(f"play,1,{mock_team_location.value},{batter_id},00,,{event}", None)
+
+    mock_game.chronological_events = [
+        mock_player,
+        mock_player_2,
+        get_play(mock_player.id, "S8"),
+        get_play(mock_player_2.id, "HR/F78.1-H"),
+    ]
+
+    player_to_play_stats = engine.get_player_to_play_stats([mock_game], [mock_player, mock_player_2], explain=False)
+
+    assert player_to_play_stats[mock_player.id].runs == Runs(runs=1, rbis=0)
+    assert player_to_play_stats[mock_player_2.id].runs == Runs(runs=1, rbis=2)
+    assert player_to_play_stats[TEAM_PLAYER_ID].runs == Runs(runs=2, rbis=2)
+
+
+def test_get_teams_play_stats__sums_unexplained_without_changing_players_stats(
+    mock_game, mock_player, mock_player_2, mock_batter_event_play_builder
+):
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player_2, 1),
+    ]
+    player_to_play_stats = engine.get_player_to_play_stats([mock_game], [mock_player, mock_player_2])
+    del player_to_play_stats[TEAM_PLAYER_ID]
+
+    team_play_stats = engine.get_teams_play_stats(player_to_play_stats, [mock_game])
+
+    assert team_play_stats.obp.at_bats == 2
+    assert team_play_stats.obp.hits == 1
+    assert team_play_stats.basic.games == 1
+    assert team_play_stats.obp.explanation == []
+    assert len(player_to_play_stats[mock_player.id].obp.explained_plays) == 1
+    assert player_to_play_stats[mock_player.id].obp.at_bats == 1
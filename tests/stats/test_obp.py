@@ -134,3 +134,40 @@ def test_get_player_to_sobp__play_has_no_on_base_before_it_in_inning_skips_play(
     assert player_to_sobp[mock_player_2.id].value == 0.0
     assert player_to_sobp[mock_player_2.id].at_bats == 0
     assert player_to_sobp[TEAM_PLAYER_ID].value == 0.0
+
+
+def test_get_player_to_obp__game_to_stat(mock_game, mock_player, mock_player_2, mock_batter_event_play_builder):
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 2),
+    ]
+    games = [mock_game]
+    players = [mock_player, mock_player_2]
+
+    player_to_cobp = obp.get_player_to_cobp(games, players)
+
+    game_id = mock_game.id.raw
+    assert player_to_cobp[mock_player.id].game_to_stat == {game_id: obp.OBP(hits=1, at_bats=1)}
+    assert player_to_cobp[mock_player_2.id].game_to_stat == {game_id: obp.OBP(walks=1)}
+    assert player_to_cobp[TEAM_PLAYER_ID].game_to_stat == {game_id: obp.OBP(hits=1, walks=1, at_bats=1)}
+    assert player_to_cobp[mock_player.id].get_game_stat(game_id) == obp.OBP(hits=1, at_bats=1)
+    assert player_to_cobp[mock_player.id].get_game_stat("other_game_id") is None
+
+
+def test_obp__add_is_associative(
+    mock_game, mock_player, mock_player_2, mock_player_builder, mock_batter_event_play_builder
+):
+    mock_player_3 = mock_player_builder(id="player_3", name="player_3")
+    mock_game.chronological_events = [
+        mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player_3, 1),
+    ]
+    player_to_obp = obp.get_player_to_obp([mock_game], [mock_player, mock_player_2, mock_player_3])
+    obp_1, obp_2, obp_3 = (player_to_obp[player.id] for player in [mock_player, mock_player_2, mock_player_3])
+
+    assert (obp_1 + obp_2) + obp_3 == obp_1 + (obp_2 + obp_3)
+    assert (obp_1 + obp_2 + obp_3).game_to_stat == player_to_obp[TEAM_PLAYER_ID].game_to_stat
+    assert player_to_obp[TEAM_PLAYER_ID].explanation == []
+    assert (obp_1 + obp_2 + obp_3).game_to_stat == {mock_game.id.raw: obp.OBP(hits=1, walks=1, at_bats=2)}
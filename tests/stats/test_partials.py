@@ -0,0 +1,127 @@
+from dataclasses import replace
+
+import pytest
+from pyretrosheet.models.play.description import BatterEvent
+from pyretrosheet.models.team import TeamLocation
+
+from cobp.stats import engine, partials
+from cobp.utils import TEAM_PLAYER_ID
+
+MODULE_PATH = "cobp.stats.partials"
+
+
+@pytest.fixture(autouse=True)
+def clear_load_team_partials_cache():
+    partials._load_team_partials.cache_clear()
+    yield
+    partials._load_team_partials.cache_clear()
+
+
+@pytest.fixture
+def get_season_checksum(mocker):
+    return mocker.patch(f"{MODULE_PATH}.get_season_checksum", return_value="checksum")
+
+
+@pytest.fixture
+def data_dir(mocker, tmp_path, get_season_checksum):
+    mocker.patch(f"{MODULE_PATH}.paths.DATA_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def game(mock_game, mock_player, mock_player_2, mock_batter_event_play_builder):
+    mock_game.chronological_events = [
+        mock_player,
+        mock_player_2,
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 1),
+        mock_batter_event_play_builder(BatterEvent.DOUBLE, mock_player_2, 1),
+        mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 2),
+        mock_batter_event_play_builder(BatterEvent.HOME_RUN_LEAVING_PARK, mock_player_2, 3),
+    ]
+    return mock_game
+
+
+def get_player_to_play_stats_from_partials(games, players, team, year):
+    return partials.get_player_to_play_stats_from_partials(
+        games, players, partials.get_game_id_to_partials(games, team, year)
+    )
+
+
+def test_get_player_to_play_stats_from_partials__matches_engine(data_dir, game, mock_team, mock_player, mock_player_2):
+    players = [mock_player, mock_player_2]
+
+    player_to_play_stats = get_player_to_play_stats_from_partials([game], players, mock_team, 2022)
+
+    expected_player_to_play_stats = engine.get_player_to_play_stats([game], players, explain=False)
+    for player_id in [mock_player.id, mock_player_2.id, TEAM_PLAYER_ID]:
+        play_stats = player_to_play_stats[player_id]
+        expected_play_stats = expected_player_to_play_stats[player_id]
+        assert play_stats.basic == expected_play_stats.basic
+        assert play_stats.ba.value == expected_play_stats.ba.value
+        assert play_stats.runs == expected_play_stats.runs
+        for stat_name in ["obp", "cobp", "sobp", "loop", "sp", "csp", "lsp", "ssp"]:
+            stat = getattr(play_stats, stat_name)
+            expected_stat = getattr(expected_play_stats, stat_name)
+            assert stat.value == expected_stat.value, stat_name
+            assert stat.game_counts == expected_stat.game_counts, stat_name
+
+
+def test_get_player_to_play_stats_from_partials__sums_stored_partials_of_basic_info_games(
+    mocker, data_dir, game, mock_team, mock_player, mock_player_2
+):
+    get_game_partials = mocker.spy(partials, "_get_game_partials")
+    load_team_games = mocker.patch(f"{MODULE_PATH}.load_team_games")
+    players = [mock_player, mock_player_2]
+
+    get_player_to_play_stats_from_partials([game], players, mock_team, 2022)
+    partials._load_team_partials.cache_clear()
+    basic_info_game = replace(game, chronological_events=[])
+    player_to_play_stats = get_player_to_play_stats_from_partials([basic_info_game], players, mock_team, 2022)
+
+    assert get_game_partials.call_count == 1
+    load_team_games.assert_not_called()
+    assert len(list((data_dir / "2022").glob("partials_*.pickle"))) == 1
+    assert player_to_play_stats[mock_player_2.id].basic.home_runs == 1
+    game_id_to_partials = partials.get_game_id_to_partials([basic_info_game], mock_team, 2022)
+    assert partials.get_team_players_from_partials([basic_info_game], game_id_to_partials) == players
+
+
+def test_get_player_to_play_stats_from_partials__recalculates_on_changed_data(
+    mocker, data_dir, get_season_checksum, game, mock_team, mock_player, mock_player_2
+):
+    get_game_partials = mocker.spy(partials, "_get_game_partials")
+    players = [mock_player, mock_player_2]
+
+    get_player_to_play_stats_from_partials([game], players, mock_team, 2022)
+    get_season_checksum.return_value = "changed_checksum"
+    get_player_to_play_stats_from_partials([game], players, mock_team, 2022)
+
+    assert get_game_partials.call_count == 2
+    [partials_path] = (data_dir / "2022").glob("partials_*.pickle")
+    assert "changed_checksum" in partials_path.name
+
+
+def test_get_player_to_play_stats_from_partials__stores_team_players_only(
+    data_dir, game, mock_team, mock_player, mock_player_builder, mock_batter_event_play_builder
+):
+    visiting_player = mock_player_builder(id="visiting_player", team_location=TeamLocation.VISITING)
+    visiting_play = mock_batter_event_play_builder(BatterEvent.SINGLE, visiting_player, 1)
+    visiting_play.team_location = TeamLocation.VISITING
+    game.chronological_events.extend([visiting_player, visiting_play])
+
+    get_player_to_play_stats_from_partials([game], [mock_player], mock_team, 2022)
+
+    game_partials = partials._load_team_partials(2022, mock_team.retrosheet_id, "checksum")[game.id.raw]
+    assert visiting_player.id not in game_partials.player_ids
+    assert visiting_player not in game_partials.players
+
+
+def test_get_game_id_to_partials__gets_a_copy_of_the_games_loaded_partials(data_dir, game, mock_team):
+    other_game = replace(game, id=replace(game.id, raw="other_game_id"))
+    partials.get_game_id_to_partials([game, other_game], mock_team, 2022)
+
+    game_id_to_partials = partials.get_game_id_to_partials([game], mock_team, 2022)
+    game_id_to_partials.clear()
+
+    loaded_game_id_to_partials = partials._load_team_partials(2022, mock_team.retrosheet_id, "checksum")
+    assert list(loaded_game_id_to_partials) == [game.id.raw, other_game.id.raw]
@@ -0,0 +1,42 @@
+from cobp.stats import stat
+
+
+def test_game_counts__add_same_games():
+    game_ordinals = stat.GameOrdinals.from_game_ids(["game_1", "game_2"])
+    game_counts = stat.GameCounts(game_ordinals, num_counters=2)
+    game_counts.increment("game_1", 0)
+    other_game_counts = stat.GameCounts(game_ordinals, num_counters=2)
+    other_game_counts.increment("game_1", 0)
+    other_game_counts.increment("game_2", 1)
+
+    added = game_counts + other_game_counts
+
+    assert dict(added.iter_game_counts()) == {"game_1": [2, 0], "game_2": [0, 1]}
+    assert dict(game_counts.iter_game_counts()) == {"game_1": [1, 0], "game_2": [0, 0]}
+
+
+def test_game_counts__add_different_games():
+    game_counts = stat.GameCounts(stat.GameOrdinals.from_game_ids(["game_1", "game_2"]), num_counters=1)
+    game_counts.increment("game_2", 0)
+    other_game_counts = stat.GameCounts(stat.GameOrdinals.from_game_ids(["game_2", "game_3"]), num_counters=1)
+    other_game_counts.increment("game_2", 0)
+    other_game_counts.increment("game_3", 0)
+
+    added = game_counts + other_game_counts
+
+    assert added.game_ordinals.game_ids == ("game_1", "game_2", "game_3")
+    assert dict(added.iter_game_counts()) == {"game_1": [0], "game_2": [2], "game_3": [1]}
+
+
+def test_game_counts__add_same_games_in_place():
+    game_ordinals = stat.GameOrdinals.from_game_ids(["game_1", "game_2"])
+    game_counts = stat.GameCounts(game_ordinals, num_counters=1)
+    counts = game_counts.counts
+    other_game_counts = stat.GameCounts(game_ordinals, num_counters=1)
+    other_game_counts.increment("game_2", 0)
+
+    game_counts += other_game_counts
+
+    assert game_counts.counts is counts
+    assert dict(game_counts.iter_game_counts()) == {"game_1": [0], "game_2": [1]}
+    assert dict(other_game_counts.iter_game_counts()) == {"game_1": [0], "game_2": [1]}
@@ -0,0 +1,103 @@
+import datetime as dt
+
+import pytest
+from pyretrosheet.models.game import Game
+from pyretrosheet.models.game_id import GameID
+from pyretrosheet.models.play import Play
+from pyretrosheet.models.player import Player
+
+from cobp.base_runners import GameRuns
+
+LINEUP = [f'start,bat{i},"Batter {i}",0,{i},{i}' for i in range(1, 10)]
+
+
+def _get_game(lines: list[str], year: int = 2022) -> Game:
+    """Build a game from Retrosheet start, sub and play lines, where plays are given as 'batter,event'."""
+    chronological_events: list[Player | Play] = []
+    for line in lines:
+        if line.startswith("start"):
+            chronological_events.append(Player.from_start_or_sub_line(line, is_sub=False))
+        elif line.startswith("sub"):
+            chronological_events.append(Player.from_start_or_sub_line(line, is_sub=True))
+        else:
+            inning, batter_id, event = line.split(",")
+            chronological_events.append(Play.from_play_line(f"play,{inning},0,{batter_id},00,,{event}", None))
+
+    return Game(
+        id=GameID(home_team_id="CHN", date=dt.date(year, 4, 7), game_number=0, raw=f"id,CHN{year}04070"),
+        info={"hometeam": "CHN", "visteam": "SLN"},
+        chronological_events=chronological_events,
+        earned_runs={},
+    )
+
+
+def _get_batter_to_rbis(game: Game, game_runs: GameRuns) -> dict[str, int]:
+    batter_to_rbis: dict[str, int] = {}
+    for event in game.chronological_events:
+        if isinstance(event, Play) and id(event) in game_runs.play_id_to_rbis:
+            batter_to_rbis[event.batter_id] = (
+                batter_to_rbis.get(event.batter_id, 0) + game_runs.play_id_to_rbis[id(event)]
+            )
+    return batter_to_rbis
+
+
+@pytest.mark.parametrize(
+    "plays, expected_runner_to_runs, expected_batter_to_rbis",
+    [
+        pytest.param(["1,bat1,S8", "1,bat2,D7.1-H"], {"bat1": 1}, {"bat2": 1}, id="hit"),
+        pytest.param(["1,bat1,W", "1,bat2,HR/F78.1-H"], {"bat1": 1, "bat2": 1}, {"bat2": 2}, id="home run"),
+        pytest.param(["1,bat1,T9", "1,bat2,WP.3-H"], {"bat1": 1}, {}, id="wild pitch"),
+        pytest.param(["1,bat1,T9", "1,bat2,K+WP.3-H"], {"bat1": 1}, {}, id="strikeout and wild pitch"),
+        pytest.param(["1,bat1,T9", "1,bat2,W+WP.3-H"], {"bat1": 1}, {}, id="walk and wild pitch"),
+        pytest.param(
+            ["1,bat1,W", "1,bat2,W.1-2", "1,bat3,W.2-3;1-2", "1,bat4,IW+PB.3-H;2-3;1-2"],
+            {"bat1": 1},
+            {"bat4": 1},
+            id="bases loaded walk and passed ball",
+        ),
+        pytest.param(["1,bat1,T9", "1,bat2,W+WP.3-H(RBI)"], {"bat1": 1}, {"bat2": 1}, id="walk and explicit rbi"),
+        pytest.param(["1,bat1,T9", "1,bat2,S8/E8.3-H(E8)"], {"bat1": 1}, {}, id="hit and error"),
+        pytest.param(["1,bat1,S8", "1,bat2,S8.1-3", "1,bat3,64(1)3/GDP.3-H"], {"bat1": 1}, {}, id="gdp"),
+        pytest.param(["1,bat1,S8", "1,bat2,54(1)/FO", "1,bat3,D7.1-H"], {"bat2": 1}, {"bat3": 1}, id="force out"),
+        pytest.param(
+            ["1,bat1,S8", "1,bat2,SB2", "1,bat2,SB3", "1,bat2,S7.3-H"], {"bat1": 1}, {"bat2": 1}, id="stolen bases"
+        ),
+        pytest.param(["1,bat1,S8", "1,bat2,CS2(24)", "1,bat2,HR"], {"bat2": 1}, {"bat2": 1}, id="caught stealing"),
+        pytest.param(["1,bat1,D8", "1,bat2,E6.2-H"], {"bat1": 1}, {}, id="error"),
+        pytest.param(["1,bat1,D8", "1,bat2,E6.2-H(RBI)"], {"bat1": 1}, {"bat2": 1}, id="explicit rbi"),
+        pytest.param(["1,bat1,D8", "1,bat2,S8.2-H(NR)"], {"bat1": 1}, {}, id="explicit no rbi"),
+        pytest.param(
+            ["1,bat1,W", "1,bat2,W.1-2", "1,bat3,W.2-3;1-2", "1,bat4,IW.3-H;2-3;1-2"],
+            {"bat1": 1},
+            {"bat4": 1},
+            id="bases loaded walk",
+        ),
+        pytest.param(["1,bat1,T9", "2,bat2,S8"], {}, {}, id="stranded runner"),
+    ],
+)
+def test_game_runs__attributes_runs_and_rbis(plays, expected_runner_to_runs, expected_batter_to_rbis):
+    game = _get_game([*LINEUP, *plays])
+
+    game_runs = GameRuns.from_game(game)
+
+    assert game_runs.runner_to_runs == expected_runner_to_runs
+    assert _get_batter_to_rbis(game, game_runs) == expected_batter_to_rbis
+
+
+def test_game_runs__credits_pinch_runners():
+    game = _get_game([*LINEUP, "1,bat1,S8", 'sub,pinch,"Pinch Runner",0,1,12', "1,bat2,D7.1-H"])
+
+    game_runs = GameRuns.from_game(game)
+
+    assert game_runs.runner_to_runs == {"pinch": 1}
+
+
+@pytest.mark.parametrize("year, expected_runner_to_runs", [(2022, {"bat4": 1}), (2019, {})])
+def test_game_runs__places_runners_on_second_in_extra_innings(year, expected_runner_to_runs):
+    game = _get_game([*LINEUP, "9,bat4,K", "10,bat5,S8.2-H"], year=year)
+
+    game_runs = GameRuns.from_game(game)
+
+    assert game_runs.runner_to_runs == expected_runner_to_runs
+    # the run is credited to the batter even when its runner is unknown
+    assert _get_batter_to_rbis(game, game_runs) == {"bat5": 1}
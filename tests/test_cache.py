@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Semaphore
+
+import pytest
+
+from cobp.cache import LRUCache, SingleFlight
+
+MODULE_PATH = "cobp.cache"
+
+
+@pytest.fixture
+def waiting(mocker):
+    """Released once for each computation that waits on an in-flight computation."""
+    waiting = Semaphore(0)
+
+    def log_info(message: str) -> None:
+        if "waiting on in-flight" in message:
+            waiting.release()
+
+    mocker.patch(f"{MODULE_PATH}.logger.info", side_effect=log_info)
+    return waiting
+
+
+def test_lru_cache__computes_on_miss_only(mocker):
+    compute = mocker.Mock(return_value="value")
+    cache: LRUCache[str, str] = LRUCache("test", max_entries=2)
+
+    assert cache.get_or_compute("key", compute) == "value"
+    assert cache.get_or_compute("key", compute) == "value"
+
+    compute.assert_called_once()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_cache__evicts_least_recently_used():
+    cache: LRUCache[str, str] = LRUCache("test", max_entries=2)
+    cache.get_or_compute("a", lambda: "a")
+    cache.get_or_compute("b", lambda: "b")
+    cache.get_or_compute("a", lambda: "a")
+
+    cache.get_or_compute("c", lambda: "c")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache__does_not_cache_errors():
+    cache: LRUCache[str, str] = LRUCache("test", max_entries=2)
+
+    def raise_error() -> str:
+        raise ValueError("error")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("key", raise_error)
+
+    assert "key" not in cache
+    assert cache.get_or_compute("key", lambda: "value") == "value"
+
+
+def test_lru_cache__requires_an_entry():
+    with pytest.raises(ValueError):
+        LRUCache("test", max_entries=0)
+
+
+def test_single_flight__coalesces_concurrent_computations(mocker, waiting):
+    computing = Event()
+    release = Event()
+
+    def compute() -> str:
+        computing.set()
+        release.wait(timeout=5)
+        return "value"
+
+    compute_spy = mocker.Mock(side_effect=compute)
+    single_flight: SingleFlight[str, str] = SingleFlight("test")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        first = executor.submit(single_flight.do, "key", compute_spy)
+        computing.wait(timeout=5)
+        waiters = [executor.submit(single_flight.do, "key", compute_spy) for _ in range(2)]
+        for _ in waiters:
+            waiting.acquire(timeout=5)
+        release.set()
+
+        assert [future.result() for future in [first, *waiters]] == ["value"] * 3
+
+    compute_spy.assert_called_once()
+
+
+def test_single_flight__shares_errors_with_waiters(waiting):
+    computing = Event()
+    release = Event()
+
+    def compute() -> str:
+        computing.set()
+        release.wait(timeout=5)
+        raise ValueError("error")
+
+    single_flight: SingleFlight[str, str] = SingleFlight("test")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(single_flight.do, "key", compute)
+        computing.wait(timeout=5)
+        waiter = executor.submit(single_flight.do, "key", lambda: "value")
+        waiting.acquire(timeout=5)
+        release.set()
+
+        with pytest.raises(ValueError):
+            first.result()
+        with pytest.raises(ValueError):
+            waiter.result()
+
+    assert single_flight.do("key", lambda: "value") == "value"
+
+
+def test_single_flight__waiters_compute_abandoned_computations(waiting):
+    computing = Event()
+    release = Event()
+
+    def compute() -> str:
+        computing.set()
+        release.wait(timeout=5)
+        raise KeyboardInterrupt
+
+    single_flight: SingleFlight[str, str] = SingleFlight("test")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(single_flight.do, "key", compute)
+        computing.wait(timeout=5)
+        waiter = executor.submit(single_flight.do, "key", lambda: "value")
+        waiting.acquire(timeout=5)
+        release.set()
+
+        with pytest.raises(KeyboardInterrupt):
+            first.result()
+        assert waiter.result() == "value"
@@ -0,0 +1,96 @@
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from cobp import disk_cache
+
+
+def _read_entry(path: Path) -> str:
+    return path.read_text()
+
+
+def _write_entry(path: Path, value: str) -> None:
+    path.write_text(value)
+
+
+def _create_slowly(creations_path: Path) -> str:
+    with creations_path.open("a") as f:
+        f.write("created\n")
+    time.sleep(0.2)
+    return "value"
+
+
+def _get_or_create_slowly(path: Path, creations_path: Path) -> str:
+    return disk_cache.get_or_create(
+        path, read_entry=_read_entry, create_entry=lambda: _create_slowly(creations_path), write_entry=_write_entry
+    )
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "entry.txt"
+
+
+def test_get_or_create__creates_on_miss_only(mocker, path):
+    create_entry = mocker.Mock(return_value="value")
+
+    assert disk_cache.get_or_create(path, _read_entry, create_entry, _write_entry) == "value"
+    assert disk_cache.get_or_create(path, _read_entry, create_entry, _write_entry) == "value"
+
+    create_entry.assert_called_once()
+    assert path.read_text() == "value"
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        pytest.param(lambda path: path.write_text("partial"), id="mismatched checksum"),
+        pytest.param(lambda path: disk_cache._get_checksum_path(path).unlink(), id="missing checksum"),
+    ],
+)
+def test_get_or_create__recreates_incomplete_entries(mocker, path, corrupt):
+    disk_cache.write(path, lambda tmp_path: _write_entry(tmp_path, "value"))
+    corrupt(path)
+    create_entry = mocker.Mock(return_value="recreated")
+
+    assert disk_cache.get_or_create(path, _read_entry, create_entry, _write_entry) == "recreated"
+    assert disk_cache.read(path, _read_entry) == "recreated"
+
+
+def test_get_or_create__recreates_unreadable_entries(mocker, path):
+    disk_cache.write(path, lambda tmp_path: _write_entry(tmp_path, "value"))
+    create_entry = mocker.Mock(return_value="recreated")
+
+    assert disk_cache.get_or_create(path, lambda _: None, create_entry, _write_entry) == "recreated"
+    create_entry.assert_called_once()
+
+
+def test_get_or_create__creates_once_across_processes(tmp_path, path):
+    creations_path = tmp_path / "creations.txt"
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        values = pool.starmap(_get_or_create_slowly, [(path, creations_path)] * 4)
+
+    assert values == ["value"] * 4
+    assert creations_path.read_text() == "created\n"
+
+
+def test_write__leaves_nothing_on_failure(tmp_path, path):
+    def write_entry(tmp_path: Path) -> None:
+        tmp_path.write_text("partial")
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        disk_cache.write(path, write_entry)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_remove__removes_entry_and_checksum(tmp_path, path):
+    disk_cache.write(path, lambda tmp_path: _write_entry(tmp_path, "value"))
+
+    disk_cache.remove(path)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,160 @@
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from cobp import export
+from cobp.game_store import GamesSelection
+
+MODULE_PATH = "cobp.export"
+
+
+@pytest.fixture
+def get_team_season_stats_df(mocker):
+    return mocker.patch(
+        f"{MODULE_PATH}.get_team_season_stats_df",
+        side_effect=lambda team_season: pd.DataFrame({"Year": [team_season.year]}),
+    )
+
+
+@pytest.fixture
+def process_pool_executor(mocker):
+    # threads stand in for processes so that mocks are shared with the workers
+    return mocker.patch(
+        f"{MODULE_PATH}.ProcessPoolExecutor",
+        side_effect=lambda max_workers, mp_context: ThreadPoolExecutor(max_workers=max_workers),
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_iter_team_season_stats_dfs__yields_in_team_season_order(
+    workers, mock_team, get_team_season_stats_df, process_pool_executor
+):
+    team_seasons = [export.TeamSeason(mock_team, year) for year in [2022, 2021, 2020, 2019]]
+
+    team_season_dfs = list(export.iter_team_season_stats_dfs(team_seasons, workers=workers))
+
+    assert [team_season for team_season, _ in team_season_dfs] == team_seasons
+    assert [df["Year"].iloc[0] for _, df in team_season_dfs] == [2022, 2021, 2020, 2019]
+    assert process_pool_executor.called is (workers > 1)
+
+
+def test_iter_team_season_stats_dfs__bounds_pending_team_seasons(
+    mocker, mock_team, get_team_season_stats_df, process_pool_executor
+):
+    executor = ThreadPoolExecutor(max_workers=2)
+    submit = mocker.spy(executor, "submit")
+    process_pool_executor.side_effect = None
+    process_pool_executor.return_value = executor
+    team_seasons = [export.TeamSeason(mock_team, year) for year in range(2010, 2020)]
+
+    team_season_dfs = export.iter_team_season_stats_dfs(team_seasons, workers=2)
+    next(team_season_dfs)
+
+    # the first team-season's result is consumed, so the next is submitted
+    assert submit.call_count == 2 * 2 + 1
+    assert len(list(team_season_dfs)) == len(team_seasons) - 1
+    assert submit.call_count == len(team_seasons)
+
+
+def test_write_team_seasons_stats__streams_team_seasons_to_files(tmp_path, mock_team, get_team_season_stats_df):
+    team_seasons = [export.TeamSeason(mock_team, year) for year in [2022, 2021]]
+    csv_path = tmp_path / "export.csv"
+
+    parquet_path = tmp_path / "export.parquet"
+    export_paths = {export.ExportFormat.CSV: csv_path, export.ExportFormat.PARQUET: parquet_path}
+
+    written_team_seasons = list(export.write_team_seasons_stats(team_seasons, export_paths, workers=1))
+
+    assert written_team_seasons == team_seasons
+    assert pd.read_csv(csv_path)["Year"].tolist() == [2022, 2021]
+    assert pd.read_parquet(parquet_path)["Year"].tolist() == [2022, 2021]
+    assert sorted(tmp_path.iterdir()) == [csv_path, parquet_path]
+
+
+def test_write_team_seasons_stats__removes_partial_file_on_error(tmp_path, mock_team, get_team_season_stats_df):
+    get_team_season_stats_df.side_effect = ValueError
+    csv_path = tmp_path / "export.csv"
+
+    with pytest.raises(ValueError):
+        team_seasons = [export.TeamSeason(mock_team, 2022)]
+        list(export.write_team_seasons_stats(team_seasons, {export.ExportFormat.CSV: csv_path}, workers=1))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_export_team_seasons_stats__resumes_from_written_team_seasons(tmp_path, mock_team, get_team_season_stats_df):
+    team_seasons = [export.TeamSeason(mock_team, year) for year in [2022, 2021]]
+    csv_path = tmp_path / "export.csv"
+    parts_dir = tmp_path / ".export.csv.parts"
+    parts_dir.mkdir()
+    pd.DataFrame({"Year": [2022]}).to_csv(parts_dir / "2022_retrosheet_id.csv", index=False)
+
+    export.export_team_seasons_stats(team_seasons, csv_path, workers=1, resume=True)
+
+    get_team_season_stats_df.assert_called_once_with(team_seasons[1])
+    assert pd.read_csv(csv_path)["Year"].tolist() == [2022, 2021]
+    assert not parts_dir.exists()
+
+
+def test_main__exports_team_seasons(mocker, tmp_path):
+    export_team_seasons_stats = mocker.patch(f"{MODULE_PATH}.export_team_seasons_stats")
+    path = tmp_path / "export.parquet"
+
+    export.main(
+        ["--year", "2022", "--team", "all", "--format", "parquet", "--output", str(path), "--workers", "2", "--resume"]
+    )
+
+    team_seasons = export_team_seasons_stats.call_args.args[0]
+    assert {team_season.year for team_season in team_seasons} == {2022}
+    assert len(team_seasons) == 30
+    export_team_seasons_stats.assert_called_once_with(
+        team_seasons, path, export_format=export.ExportFormat.PARQUET, workers=2, resume=True
+    )
+
+
+def test_main__rejects_unavailable_years():
+    with pytest.raises(SystemExit):
+        export.main(["--year", "1999", "--team", "ALL"])
+
+
+def test_export_team_seasons_stats__writes_typed_parquet(tmp_path, mock_team, get_team_season_stats_df):
+    get_team_season_stats_df.side_effect = lambda team_season: pd.DataFrame(
+        {"Team": ["Cubs"], "Year": [team_season.year], "Player": ["Player"], "ID": ["Player"], "AB": [1], "BA": [0.5]}
+    )
+    team_seasons = [export.TeamSeason(mock_team, year) for year in [2022, 2021]]
+    path = tmp_path / "export.parquet"
+
+    export.export_team_seasons_stats(team_seasons, path, export_format=export.ExportFormat.PARQUET, workers=1)
+
+    df = pd.read_parquet(path)
+    assert df["Year"].tolist() == [2022, 2021]
+    assert df["Team"].dtype == "category"
+    assert df["AB"].dtype == "int64"
+    assert df["BA"].dtype == "float64"
+
+
+def test_main__exports_selected_games(mocker, tmp_path):
+    export_team_seasons_stats = mocker.patch(f"{MODULE_PATH}.export_team_seasons_stats")
+    mocker.patch(f"{MODULE_PATH}.paths.EXPORTS_DIR", tmp_path)
+
+    export.main(["--year", "2022", "--team", "CHN", "--start-date", "2022-05-01", "--last-days", "30"])
+
+    team_seasons, path = export_team_seasons_stats.call_args.args
+    games_selection = GamesSelection(start_date=dt.date(2022, 5, 1), last_days=30)
+    assert [team_season.games_selection for team_season in team_seasons] == [games_selection]
+    assert path == tmp_path / "2022_Chicago Cubs_2022-05-01_to_end_last_30_days.csv"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--start-date", "05/01/2022"],
+        ["--start-date", "2022-06-01", "--end-date", "2022-05-01"],
+        ["--last-games", "10", "--last-days", "30"],
+    ],
+)
+def test_main__rejects_invalid_games_selections(args):
+    with pytest.raises(SystemExit):
+        export.main(["--year", "2022", "--team", "CHN", *args])
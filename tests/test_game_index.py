@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pyretrosheet.models.play.description import BatterEvent
+
+from cobp import game_index
+
+
+def test_get_game_index__maps_batters_to_their_plays(
+    mock_game, mock_player, mock_player_2, mock_batter_event_play_builder
+):
+    single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)
+    strikeout = mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player_2, 1)
+    walk = mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 2)
+    mock_game.chronological_events = [mock_player, mock_player_2, single, strikeout, walk]
+
+    index = game_index.get_game_index(mock_game)
+
+    assert index.plays == [single, strikeout, walk]
+    assert index.get_batter_plays(mock_player.id) == [single, walk]
+    assert index.get_batter_plays(mock_player_2.id) == [strikeout]
+    assert index.get_batter_plays("not_in_game") == []
+
+
+def test_get_game_index__is_reused(mock_game, mock_player, mock_batter_event_play_builder):
+    mock_game.chronological_events = [mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)]
+
+    assert game_index.get_game_index(mock_game) is game_index.get_game_index(mock_game)
+
+
+def test_get_game_index__is_rebuilt_when_game_events_change(mock_game, mock_player, mock_batter_event_play_builder):
+    mock_game.chronological_events = [mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)]
+    index = game_index.get_game_index(mock_game)
+
+    mock_game.chronological_events.append(mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 2))
+    rebuilt_index = game_index.get_game_index(mock_game)
+
+    assert rebuilt_index is not index
+    assert len(rebuilt_index.get_batter_plays(mock_player.id)) == 2
+
+
+def test_get_game_index__is_shared_across_threads(mock_game, mock_player, mock_batter_event_play_builder):
+    mock_game.chronological_events = [mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        indexes = list(executor.map(lambda _: game_index.get_game_index(mock_game), range(8)))
+
+    assert any(index is game_index.get_game_index(mock_game) for index in indexes)
+    assert game_index._GAME_ID_TO_INDEX[id(mock_game)] is game_index.get_game_index(mock_game)
+
+
+def test_get_play_context(mock_game, mock_player, mock_player_2, mock_batter_event_play_builder):
+    strikeout = mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player, 1)
+    single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player_2, 1)
+    walk = mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 1)
+    next_inning_strikeout = mock_batter_event_play_builder(BatterEvent.STRIKEOUT, mock_player_2, 2)
+    mock_game.chronological_events = [strikeout, single, walk, next_inning_strikeout]
+    index = game_index.get_game_index(mock_game)
+
+    assert index.get_play_context(strikeout) == game_index.PlayContext(
+        position=0, on_bases_before=0, on_bases_after=2, half_inning_on_bases=2
+    )
+    assert index.get_play_context(single) == game_index.PlayContext(
+        position=1, on_bases_before=0, on_bases_after=1, half_inning_on_bases=2
+    )
+    assert index.get_play_context(walk) == game_index.PlayContext(
+        position=2, on_bases_before=1, on_bases_after=0, half_inning_on_bases=2
+    )
+    assert index.get_play_context(next_inning_strikeout) == game_index.PlayContext(
+        position=0, on_bases_before=0, on_bases_after=0, half_inning_on_bases=0
+    )
+
+
+def test_get_play_context__identical_plays_share_a_context(mock_game, mock_player, mock_batter_event_play_builder):
+    single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)
+    identical_single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)
+    mock_game.chronological_events = [single, identical_single]
+    index = game_index.get_game_index(mock_game)
+
+    context = index.get_play_context(identical_single)
+
+    assert context == index.get_play_context(single)
+    assert context.is_first_batter is True
+    assert context.has_other_on_base is False
+
+
+def test_get_play_context__identical_plays_are_excluded_from_each_others_on_bases(
+    mock_game, mock_player, mock_player_2, mock_batter_event_play_builder
+):
+    single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)
+    walk = mock_batter_event_play_builder(BatterEvent.WALK, mock_player_2, 1)
+    identical_single = mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)
+    mock_game.chronological_events = [single, walk, identical_single]
+    index = game_index.get_game_index(mock_game)
+
+    assert index.get_play_context(identical_single) == game_index.PlayContext(
+        position=0, on_bases_before=0, on_bases_after=1, half_inning_on_bases=3
+    )
+    assert index.get_play_context(walk) == game_index.PlayContext(
+        position=1, on_bases_before=1, on_bases_after=1, half_inning_on_bases=3
+    )
+
+
+def test_get_play_context__play_not_in_game(mock_game, mock_player, mock_batter_event_play_builder):
+    mock_game.chronological_events = [mock_batter_event_play_builder(BatterEvent.SINGLE, mock_player, 1)]
+
+    play_context = game_index.get_game_index(mock_game).get_play_context(
+        mock_batter_event_play_builder(BatterEvent.WALK, mock_player, 1)
+    )
+
+    assert play_context is None
+
+
+def test_classify_play(mock_batter_event_play_builder):
+    single = mock_batter_event_play_builder(BatterEvent.SINGLE)
+    walk = mock_batter_event_play_builder(BatterEvent.WALK)
+    strikeout = mock_batter_event_play_builder(BatterEvent.STRIKEOUT)
+
+    assert game_index.classify_play(single) == (
+        game_index.AT_BAT | game_index.HIT | game_index.SINGLE | game_index.GETS_ON_BASE
+    )
+    assert game_index.classify_play(walk) == game_index.WALK | game_index.GETS_ON_BASE
+    assert game_index.classify_play(strikeout) == game_index.AT_BAT
+
+
+def test_get_play_mask(mock_game, mock_player, mock_batter_event_play_builder):
+    double = mock_batter_event_play_builder(BatterEvent.DOUBLE, mock_player, 1)
+    mock_game.chronological_events = [double]
+    index = game_index.get_game_index(mock_game)
+    hit_by_pitch_not_in_game = mock_batter_event_play_builder(BatterEvent.HIT_BY_PITCH, mock_player, 1)
+
+    assert index.get_play_mask(double) & game_index.DOUBLE
+    assert index.get_play_mask(hit_by_pitch_not_in_game) & game_index.HIT_BY_PITCH
@@ -0,0 +1,122 @@
+import datetime as dt
+
+import pytest
+from pyretrosheet.models.game import Game
+from pyretrosheet.models.game_id import GameID
+
+from cobp.game_store import GamesSelection, GameStore
+
+TEAM_ID = "CHN"
+
+
+def _get_game(date: dt.date, home_team_id: str = TEAM_ID, game_number: int = 0) -> Game:
+    raw = f"id,{home_team_id}{date.strftime('%Y%m%d')}{game_number}"
+    return Game(
+        id=GameID(home_team_id=home_team_id, date=date, game_number=game_number, raw=raw),
+        info={"hometeam": home_team_id, "visteam": TEAM_ID if home_team_id != TEAM_ID else "SLN"},
+        chronological_events=[],
+        earned_runs={},
+    )
+
+
+@pytest.fixture
+def games():
+    return [
+        _get_game(dt.date(2022, 4, 7)),
+        _get_game(dt.date(2022, 4, 30), home_team_id="SLN"),
+        _get_game(dt.date(2022, 5, 1), home_team_id="SLN", game_number=2),
+        _get_game(dt.date(2022, 5, 1), home_team_id="SLN", game_number=1),
+        _get_game(dt.date(2022, 5, 20)),
+        _get_game(dt.date(2022, 6, 2)),
+    ]
+
+
+@pytest.fixture
+def store(games):
+    # stored out of order, as games are loaded by home team
+    return GameStore.from_games(list(reversed(games)))
+
+
+def _get_dates(games: list[Game]) -> list[str]:
+    return [f"{game.id.date.isoformat()}/{game.id.game_number}" for game in games]
+
+
+def test_game_store__sorts_games_by_date_and_game_number(store):
+    assert _get_dates(store.games) == [
+        "2022-04-07/0",
+        "2022-04-30/0",
+        "2022-05-01/1",
+        "2022-05-01/2",
+        "2022-05-20/0",
+        "2022-06-02/0",
+    ]
+
+
+def test_game_store__get_games(store, games):
+    assert store.get_games([games[4].id.raw, "not_a_game_id", games[0].id.raw]) == [games[0], games[4]]
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, expected_dates",
+    [
+        (dt.date(2022, 4, 30), dt.date(2022, 5, 20), ["2022-04-30/0", "2022-05-01/1", "2022-05-01/2", "2022-05-20/0"]),
+        (dt.date(2022, 4, 8), dt.date(2022, 4, 29), []),
+        (None, dt.date(2022, 4, 30), ["2022-04-07/0", "2022-04-30/0"]),
+        (dt.date(2022, 5, 20), None, ["2022-05-20/0", "2022-06-02/0"]),
+    ],
+)
+def test_game_store__get_games_between(store, start_date, end_date, expected_dates):
+    assert _get_dates(store.get_games_between(start_date, end_date)) == expected_dates
+
+
+def test_game_store__get_last_games_and_days(store):
+    assert _get_dates(store.get_last_games(2)) == ["2022-05-20/0", "2022-06-02/0"]
+    assert _get_dates(store.get_last_days_games(14)) == ["2022-05-20/0", "2022-06-02/0"]
+    assert _get_dates(store.get_last_days_games(1)) == ["2022-06-02/0"]
+    assert GameStore.from_games([]).get_last_days_games(30) == []
+
+
+def test_game_store__get_month_games(store):
+    assert store.get_months() == [dt.date(2022, 4, 1), dt.date(2022, 5, 1), dt.date(2022, 6, 1)]
+    assert _get_dates(store.get_month_games(dt.date(2022, 5, 1))) == ["2022-05-01/1", "2022-05-01/2", "2022-05-20/0"]
+
+
+def test_game_store__get_stands(store):
+    stands = store.get_stands(TEAM_ID)
+
+    assert [(stand.is_home, len(stand.games)) for stand in stands] == [(True, 1), (False, 3), (True, 2)]
+    assert stands[1].pretty_name == "Road Trip 2022/04/30 - 2022/05/01 (3 games)"
+
+
+@pytest.mark.parametrize(
+    "games_selection, expected_dates",
+    [
+        (
+            GamesSelection(),
+            ["2022-04-07/0", "2022-04-30/0", "2022-05-01/1", "2022-05-01/2", "2022-05-20/0", "2022-06-02/0"],
+        ),
+        (GamesSelection(end_date=dt.date(2022, 5, 1), last_games=2), ["2022-05-01/1", "2022-05-01/2"]),
+        (GamesSelection(end_date=dt.date(2022, 5, 1), last_days=2), ["2022-04-30/0", "2022-05-01/1", "2022-05-01/2"]),
+    ],
+)
+def test_games_selection__select(store, games_selection, expected_dates):
+    assert _get_dates(games_selection.select(store)) == expected_dates
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"start_date": dt.date(2022, 5, 2), "end_date": dt.date(2022, 5, 1)},
+        {"last_games": 1, "last_days": 1},
+        {"last_games": 0},
+    ],
+)
+def test_games_selection__rejects_invalid_selections(kwargs):
+    with pytest.raises(ValueError):
+        GamesSelection(**kwargs)
+
+
+def test_games_selection__name():
+    games_selection = GamesSelection(start_date=dt.date(2022, 5, 1), last_days=30)
+
+    assert games_selection.name == "2022-05-01_to_end_last_30_days"